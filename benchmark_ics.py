@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark of ICS parsing with different number of worker processes.
+
+Usage: python benchmark_ics.py [number_of_events] [number_of_files] [max_workers]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+from cally.debug_logger import init_debug_logger
+from cally.loaders import EventLoaderICS
+
+
+TIMEZONES = ["Europe/Paris", "America/New_York", "W. Europe Standard Time", "Asia/Tokyo", "UTC"]
+
+# Exchange and Outlook feeds define their zones with VTIMEZONE components:
+VTIMEZONE = """BEGIN:VTIMEZONE
+TZID:W. Europe Standard Time
+BEGIN:STANDARD
+DTSTART:16010101T030000
+TZOFFSETFROM:+0200
+TZOFFSETTO:+0100
+RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=10
+END:STANDARD
+BEGIN:DAYLIGHT
+DTSTART:16010101T020000
+TZOFFSETFROM:+0100
+TZOFFSETTO:+0200
+RRULE:FREQ=YEARLY;BYDAY=-1SU;BYMONTH=3
+END:DAYLIGHT
+END:VTIMEZONE"""
+
+
+def generate_ics(path, number_of_events, seed=0):
+    """Write a synthetic calendar with timed, all-day, and recurring events"""
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//cally//benchmark//EN", VTIMEZONE]
+    for index in range(number_of_events):
+        year = 2015 + (index + seed) % 12
+        month = 1 + index % 12
+        day = 1 + index % 28
+        hour = index % 24
+        timezone = TIMEZONES[index % len(TIMEZONES)]
+        lines.append("BEGIN:VEVENT")
+        lines.append(f"UID:event-{seed}-{index}@benchmark")
+        lines.append(f"SUMMARY:Meeting number {index}")
+        if index % 10 == 0:
+            lines.append(f"DTSTART;VALUE=DATE:{year}{month:02}{day:02}")
+            lines.append(f"DTEND;VALUE=DATE:{year}{month:02}{day:02}")
+        else:
+            lines.append(f"DTSTART;TZID={timezone}:{year}{month:02}{day:02}T{hour:02}0000")
+            lines.append(f"DTEND;TZID={timezone}:{year}{month:02}{day:02}T{hour:02}3000")
+        if index % 25 == 0:
+            lines.append("RRULE:FREQ=WEEKLY;COUNT=10")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    Path(path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def make_config(files, workers):
+    """Minimal configuration needed by the ICS loader"""
+    return types.SimpleNamespace(ICS_EVENT_FILES=files, USE_PERSIAN_CALENDAR=False, ICS_PARSE_WORKERS=workers,
+                                 ICS_HORIZON_PAST=0, ICS_HORIZON_FUTURE=0, ICS_EVENT_PRIORITY=[])
+
+
+def run(files, workers, repeats=3):
+    """Return the best time out of several loads and the number of loaded events"""
+    loader = EventLoaderICS(make_config(files, workers))
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        events = loader.load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(events.items)
+
+
+def main():
+    number_of_events = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    number_of_files = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as folder:
+        init_debug_logger(os.path.join(folder, "debug.log"))
+        files = []
+        for file_number in range(number_of_files):
+            path = os.path.join(folder, f"calendar{file_number}.ics")
+            generate_ics(path, number_of_events // number_of_files, seed=file_number)
+            files.append(path)
+
+        print(f"{number_of_events} events in {number_of_files} files, {os.cpu_count()} cores available")
+        baseline, count = run(files, 0)
+        print(f"serial      {baseline:7.3f} s  {count} events")
+        workers = 1
+        while workers <= max_workers:
+            elapsed, count = run(files, workers) if workers > 1 else (baseline, count)
+            print(f"{workers:2} workers  {elapsed:7.3f} s  speedup {baseline / elapsed:4.2f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
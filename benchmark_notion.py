@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark of the Notion connector against the local stand-in of the API.
+
+Measures a first load into an empty config folder, a load with the mirror and caches of the first one,
+a load after some pages were edited, and delivery of status changes by the saver.
+
+Usage: python benchmark_notion.py [number_of_tasks] [latency_ms] [requests_per_second] [status_changes]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import types
+
+from cally.debug_logger import init_debug_logger
+from cally.http_client import get_rate_limiter
+from cally.loaders_live import NotionTaskLoader, NotionTaskSaver, REPLACE_TASKS
+from mock_notion import MockNotion
+
+
+def make_config(folder, requests_per_second):
+    """Minimal configuration needed by the Notion connector"""
+    return types.SimpleNamespace(config_folder=folder, NOTION_REFRESH_MINUTES=10, NOTION_LOOKUP_WORKERS=8,
+                                 NOTION_CACHE_HOURS=24, NOTION_FULL_SYNC_HOURS=6,
+                                 NOTION_REQUESTS_PER_SECOND=requests_per_second,
+                                 HTTP_POOL_SIZE=10, HTTP_CONNECT_TIMEOUT=5, HTTP_READ_TIMEOUT=30)
+
+
+def measure_load(server, cf):
+    """Return seconds until the first and the last page of tasks, the number of tasks, and requests by kind"""
+    server.counts.clear()
+    loader = NotionTaskLoader(cf)
+    start = time.perf_counter()
+    first_page = None
+    tasks = []
+    for page in loader.load_pages():
+        if first_page is None:
+            first_page = time.perf_counter() - start
+        tasks = [] if page is REPLACE_TASKS else tasks + page
+    elapsed = time.perf_counter() - start
+    return first_page or elapsed, elapsed, sum(not task.is_header for task in tasks), dict(server.counts)
+
+
+def measure_saver(server, cf, number_of_changes):
+    """Queue status changes at once, return seconds until all were delivered and the latency of each"""
+    server.counts.clear()
+    saver = NotionTaskSaver(cf)
+    task_ids = [page["id"] for page in server.pages[:number_of_changes]]
+    start = time.perf_counter()
+    for task_id in task_ids:
+        saver.update_status(task_id, "In progress")
+
+    # The outbox is polled, so latencies are accurate to about a millisecond:
+    latencies = {}
+    while len(latencies) < len(task_ids):
+        with saver.lock:
+            delivered = [task_id for task_id in task_ids if task_id not in saver.outbox and task_id not in latencies]
+        for task_id in delivered:
+            latencies[task_id] = time.perf_counter() - start
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    saver.stop()
+    return elapsed, sorted(latencies.values())
+
+
+def print_load(name, result):
+    first_page, elapsed, count, counts = result
+    requests = ", ".join(f"{kind} {number}" for kind, number in sorted(counts.items()))
+    print(f"{name:18} first page {first_page:7.3f} s  all {elapsed:7.3f} s  {count} tasks  requests: {requests}")
+
+
+def main():
+    number_of_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 50 / 1000
+    requests_per_second = float(sys.argv[3]) if len(sys.argv) > 3 else 3
+    number_of_changes = int(sys.argv[4]) if len(sys.argv) > 4 else 20
+
+    server = MockNotion(number_of_tasks, latency=latency, requests_per_second=requests_per_second).start()
+    os.environ.update(server.environment())
+    with tempfile.TemporaryDirectory() as folder:
+        init_debug_logger(os.path.join(folder, "debug.log"))
+        cf = make_config(folder, requests_per_second)
+        print(f"{number_of_tasks} tasks, {latency * 1000:.0f} ms latency, {requests_per_second} requests per second")
+        print_load("first load", measure_load(server, cf))
+        print_load("load with mirror", measure_load(server, cf))
+        server.edit(range(0, number_of_tasks, 100), status="Urgent")
+        print_load("load after edits", measure_load(server, cf))
+
+        elapsed, latencies = measure_saver(server, cf, number_of_changes)
+        median = latencies[len(latencies) // 2]
+        p95 = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        print(f"{'status changes':18} {number_of_changes} in {elapsed:7.3f} s  "
+              f"{number_of_changes / elapsed:6.1f} per second  latency median {median:.3f} s, p95 {p95:.3f} s")
+    print(f"throttled by the server: {server.throttled}")
+    print(f"waiting for the rate limiter: {get_rate_limiter('notion', requests_per_second).summary()}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,11 @@ from cally.weather import Weather
 from cally.importers import Importer
 from cally.dialogues import clear_line
 from cally.screen import Screen
+from cally.panes import ScreenPanes
+from cally.agenda import MonthLayout, events_between
+from cally.journal import JournalRows
+from cally.event_loop import EventLoop
+from cally.render_stats import RenderStats
 from cally.savers import TaskSaverCSV, EventSaverCSV
 from cally.colors import Color, initialize_colors
 from cally.loaders import *
@@ -29,6 +34,8 @@ from cally.data import *
 from cally.controls import *
 from cally.moon import get_moon_phase
 from cally.debug_logger import init_debug_logger, get_debug_logger
+from cally.state_store import get_state_store
+from cally.loaders_live import NotionTaskSaver, MSTodoTaskSaver, LiveScheduler, create_live_connectors, REPLACE_TASKS
 
 
 # Initialise config:
@@ -90,6 +97,103 @@ def read_items_from_user_arguments(screen, user_tasks, user_events, task_saver_c
         pass
 
 
+def add_live_tasks(live_scheduler, user_tasks, state_store):
+    """Add pages of tasks that arrived from live connectors since the last frame, return True if any did"""
+    was_changed = user_tasks.changed
+    deleted_notion_ids = None
+    has_arrived = False
+    for source, tasks in live_scheduler.receive():
+        if tasks is None:
+            debug_logger.log_data_load(source, len([t for t in user_tasks.items if t.source == source]))
+            continue
+        has_arrived = True
+        if tasks is REPLACE_TASKS:
+            user_tasks.items = [t for t in user_tasks.items if t.source != source]
+            user_tasks.changed = True
+            continue
+        if deleted_notion_ids is None:
+            deleted_notion_ids = state_store.deleted_ids("notion")
+        for task in tasks:
+            # Skip tasks that were deleted
+            if not task.is_header and task.notion_id in deleted_notion_ids:
+                continue
+            # Ensure unique ID for live tasks to avoid conflict with CSV tasks
+            task.item_id = user_tasks.generate_id()
+            user_tasks.add_item(task)
+
+    # Live tasks are not saved to the CSV file, so they do not count as a change:
+    user_tasks.changed = was_changed
+    return has_arrived
+
+
+def render(view, stats):
+    """Render the view, and measure how long it takes if render times are shown"""
+    if stats is None:
+        view.render()
+    else:
+        stats.measure(type(view).__name__, view.render)
+
+
+def draw_panes(stdscr, panes, calendar_view, journal_view, separator_view, footer_view, error_view,
+               weather, user_tasks, screen, version, stats=None):
+    """Draw panes whose content changed since the last frame and send them to the terminal at once.
+    Keys and data changes increase the version, so signatures add only what changes by itself"""
+    if stats is not None:
+        start = time.perf_counter()
+    if panes.arrange(screen):
+        stdscr.clear()
+        stdscr.noutrefresh()
+    if stats is not None:
+        lines = stats.lines()
+        place_render_times(stdscr, panes, lines)
+    clock = time.strftime("%H:%M", time.localtime())
+
+    if panes.header.is_visible:
+        screen.currently_drawn = AppState.CALENDAR
+        title = calendar_view.title
+        if panes.header.needs_drawing((title, screen.state, weather.forecast, clock)):
+            render(HeaderView(panes.header, 0, 0, title, weather, screen), stats)
+    if panes.calendar.needs_drawing((version, screen.today)):
+        layout = getattr(calendar_view, "layout", None)
+        render(calendar_view, stats)
+        if stats is not None and layout is not None:
+            stats.count("month layout", calendar_view.layout is layout)
+
+    # Without the split, the journal has its own header with time and weather:
+    timers = tuple(task.timer.passed_time for task in user_tasks.items if task.timer.is_counting)
+    header = None if screen.split else (weather.forecast, clock)
+    if panes.journal.needs_drawing((version, timers, header)):
+        if screen.split:
+            separator_view.render()
+        rows = journal_view.journal_rows
+        render(journal_view, stats)
+        if stats is not None and rows is not None:
+            stats.count("journal rows", journal_view.journal_rows is rows)
+
+    if panes.footer.needs_drawing((version, screen.is_reloading, error_view.error.has_occurred)):
+        render(footer_view, stats)
+        error_view.render()
+
+    if stats is not None:
+        for pane in panes.all:
+            if pane.is_visible:
+                stats.count("panes", not pane.window.is_wintouched())
+        if panes.overlay.is_visible:
+            panes.overlay.window.erase()
+            RenderTimesView(panes.overlay, *panes.overlay.geometry[:2], lines).render()
+    panes.update()
+    if stats is not None:
+        stats.frame_done(start)
+
+
+def place_render_times(stdscr, panes, lines):
+    """Place the overlay with render times at the top right, the panes under it are drawn again if it moved"""
+    y_max, x_max = stdscr.getmaxyx()
+    width = max(len(line) for line in lines) + 1
+    if panes.overlay.place(1, max(x_max - width, 0), min(len(lines), max(y_max - 2, 0)), min(width, x_max)):
+        panes.invalidate()
+
+
 class View:
     """Parent class of a view that displays things at certain coordinates"""
 
@@ -158,9 +262,9 @@ class TaskView(View):
         """Select the icon for the task"""
         icon = cf.TODO_ICON
         if cf.DISPLAY_ICONS:
-            for keyword in cf.ICONS:
-                if keyword in self.task.name.lower():
-                    icon = cf.ICONS[keyword]
+            keyword_icon = cf.ICON_MATCHER.icon_for(self.task.name)
+            if keyword_icon is not None:
+                icon = keyword_icon
         if self.task.status == Status.DONE:
             icon = cf.DONE_ICON
         if self.task.status == Status.IMPORTANT:
@@ -240,101 +344,36 @@ class TimerView(View):
 
 
 class JournalView(View):
-    """Displays a list of all tasks"""
+    """Displays the lines of the journal that fit into the pane from the scroll position"""
 
-    def __init__(self, stdscr, y, x, user_tasks, user_ics_tasks, screen):
+    def __init__(self, stdscr, y, x, journal_rows, user_tasks, user_ics_tasks, screen):
         super().__init__(stdscr, y, x)
+        self.journal_rows = journal_rows
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
 
     def render(self):
-        """Render the list of tasks with project grouping"""
+        """Render the visible part of the list of tasks with project grouping"""
         if not self.user_tasks.items and not self.user_ics_tasks.items and cf.SHOW_NOTHING_PLANNED:
             self.display_line(self.y, self.x, MSG_TS_NOTHING, Color.UNIMPORTANT)
             return
-        
-        # Separate local tasks from Notion tasks (always maintain separation)
-        local_tasks = []
-        notion_tasks = []
-        
-        for task in self.user_tasks.items:
-            # Skip header tasks in separation
-            if hasattr(task, 'is_header') and task.is_header:
-                # Headers belong to notion tasks section
-                notion_tasks.append(task)
-            elif hasattr(task, 'notion_id') and task.notion_id:
-                notion_tasks.append(task)
-            else:
-                local_tasks.append(task)
-        
-        current_project = None
-        task_index = 0
-        
-        # Always render local tasks section header (even if empty)
-        self.display_line(self.y, self.x, "━━━ Local Tasks ━━━", Color.TITLE, True)
-        self.y += 1
-        
-        if local_tasks:
-            for task in local_tasks:
-                task_view = TaskView(self.stdscr, self.y, self.x, task, self.screen)
-                task_view.render()
-                # Always show task numbers in journal view when in selection mode
-                if self.screen.selection_mode and (self.screen.state == AppState.JOURNAL or self.screen.selection_context == 'JOURNAL'):
-                    # Display number at the start of the line (x position)
-                    self.display_line(self.y, self.x, str(task_index + 1), Color.ACTIVE_PANE)
-                self.y += 1
-                task_index += 1
-        else:
-            # Show empty message for local tasks
-            self.display_line(self.y, self.x, "  (no local tasks)", Color.UNIMPORTANT)
-            self.y += 1
-        
-        # Add spacing between sections
-        self.y += 1
-        
-        # Always render Notion tasks section header
-        self.display_line(self.y, self.x, "━━━ Notion Tasks ━━━", Color.TITLE, True)
-        self.y += 1
-        
-        if notion_tasks:
-            for task in notion_tasks:
-                # Skip header tasks in selection count but display them
-                if hasattr(task, 'is_header') and task.is_header:
-                    # Display project header
-                    project_name = task.project_name if hasattr(task, 'project_name') and task.project_name else "No Project"
-                    header_text = f"  ━━ {project_name} ━━"
-                    self.display_line(self.y, self.x, header_text, Color.TITLE, True)
-                    self.y += 1
-                    current_project = task.project_name if hasattr(task, 'project_name') else None
-                    continue
-                
-                # Check if project changed (for non-header tasks)
-                if hasattr(task, 'project_name') and task.project_name != current_project:
-                    current_project = task.project_name if task.project_name else "No Project"
-                    project_name = task.project_name if task.project_name else "No Project"
-                    header_text = f"  ━━ {project_name} ━━"
-                    self.display_line(self.y, self.x, header_text, Color.TITLE, True)
-                    self.y += 1
-                
-                # Render Notion task
-                task_view = TaskView(self.stdscr, self.y, self.x, task, self.screen)
-                task_view.render()
-                # Always show task numbers in journal view when in selection mode
-                if self.screen.selection_mode and (self.screen.state == AppState.JOURNAL or self.screen.selection_context == 'JOURNAL'):
-                    # Display number at the start of the line (x position)
-                    self.display_line(self.y, self.x, str(task_index + 1), Color.ACTIVE_PANE)
-                self.y += 1
-                task_index += 1
-        else:
-            # Show empty message for Notion tasks
-            self.display_line(self.y, self.x, "  (no Notion tasks)", Color.UNIMPORTANT)
-            self.y += 1
 
-        self.y += 1
-        for index, task in enumerate(self.user_ics_tasks.items):
-            task_view = TaskView(self.stdscr, self.y, self.x, task, self.screen)
-            task_view.render()
+        height = self.stdscr.getmaxyx()[0] - self.y
+        self.screen.journal_height = max(height, 1)
+        self.screen.journal_offset, rows = self.journal_rows.visible(self.screen.journal_offset, height)
+        shows_numbers = self.screen.selection_mode and (self.screen.state == AppState.JOURNAL
+                                                        or self.screen.selection_context == 'JOURNAL')
+        for kind, content, number in rows:
+            if kind in ["task", "ics_task"]:
+                task_view = TaskView(self.stdscr, self.y, self.x, content, self.screen)
+                task_view.render()
+                if number is not None and shows_numbers:
+                    self.display_line(self.y, self.x, str(number), Color.ACTIVE_PANE)
+            elif kind in ["title", "project"]:
+                self.display_line(self.y, self.x, content, Color.TITLE, True)
+            elif kind == "message":
+                self.display_line(self.y, self.x, content, Color.UNIMPORTANT)
             self.y += 1
 
 
@@ -421,9 +460,9 @@ class UserEventView(EventView):
         """Select the right icon for the event"""
         icon = cf.EVENT_ICON
         if cf.DISPLAY_ICONS:
-            for keyword in cf.ICONS:
-                if keyword in self.event.name.lower():
-                    icon = cf.ICONS[keyword]
+            keyword_icon = cf.ICON_MATCHER.icon_for(self.event.name)
+            if keyword_icon is not None:
+                icon = keyword_icon
         if self.screen.privacy or self.event.privacy:
             icon = cf.PRIVACY_ICON
         return icon
@@ -503,191 +542,36 @@ class DeadlineView(EventView):
         self.display_line(self.y, self.x, self.info, Color.DEADLINES)
 
 
+# Views of each kind of entries in days of the calendar, with the color of the sign of hidden entries:
+ENTRY_VIEWS = {"event": (UserEventView, Color.EVENTS), "deadline": (DeadlineView, Color.DEADLINES),
+               "holiday": (HolidayView, Color.HOLIDAYS), "birthday": (BirthdayView, Color.BIRTHDAYS)}
+
+
 class DailyView(View):
     """Display all events occurring on this days"""
 
-    def __init__(self, stdscr, y, x, repeated_user_events, repeated_ics_events, user_events,
-                 user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen,
-                 index_offset, is_selection_day=True):
-
+    def __init__(self, stdscr, y, x, entries, user_events, screen, is_selection_day=True):
         super().__init__(stdscr, y, x)
-        self.repeated_user_events = repeated_user_events.filter_events_that_day(screen)
-        self.repeated_ics_events = repeated_ics_events.filter_events_that_day(screen)
-        self.user_events = user_events.filter_events_that_day(screen)
-        self.user_ics_events = user_ics_events.filter_events_that_day(screen)
-        
-        # Debug logging for ICS events filtering
-        try:
-            from cally.debug_logger import get_debug_logger
-            logger = get_debug_logger()
-            if len(user_ics_events.items) > 0:
-                logger.logger.debug(f"DailyView: Filtering ICS events for {screen.year}/{screen.month}/{screen.day}: {len(user_ics_events.items)} total ICS events, {len(self.user_ics_events.items)} match this day")
-                if len(self.user_ics_events.items) > 0:
-                    for ev in self.user_ics_events.items[:3]:  # Log first 3 matching events
-                        logger.logger.debug(f"  Matching ICS event: '{ev.name}' on {ev.year}/{ev.month}/{ev.day}")
-        except:
-            pass
-        
-        self.user_ics_events.items = sorted(self.user_ics_events.items, key=lambda x: (x.hour is None, x.hour))
-        self.holidays = holidays.filter_events_that_day(screen)
-        self.birthdays = birthdays.filter_events_that_day(screen)
-        self.deadlines = user_tasks.filter_events_that_day(screen)
-        self.deadlines_ics = user_ics_tasks.filter_events_that_day(screen)
+        self.entries = entries
+        self.user_events = user_events
         self.screen = screen
-        self.index_offset = index_offset
-        self.y_cell = (self.screen.y_max - 3) // 6
-        self.x_cell = self.screen.x_max // 7
-        self.hidden_events_sign = cf.HIDDEN_ICON + " "*(self.screen.x_max-self.x-len(cf.HIDDEN_ICON))
-        self.num_events_this_day = 0
         self.is_selection_day = is_selection_day
 
-    def render(self):
-        """Render this view on the screen"""
-        index = 0
-
-        # Show user events:
-        for event in self.user_events.items:
-            if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
-                self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
-            else:
-                user_event_view = UserEventView(self.stdscr, self.y + index, self.x, event, self.screen)
-                user_event_view.render()
-
-                # Only show numbers for events, not tasks (tasks are handled in JournalView)
-                if self.screen.selection_mode and self.is_selection_day and self.screen.state == AppState.CALENDAR and self.screen.selection_context != 'JOURNAL':
-                    # Only show numbers for user events (not ICS events which are read-only)
-                    if event in self.user_events.items:
-                        self.display_line(self.y + index, self.x, str(index + self.index_offset + 1), Color.ACTIVE_PANE)
-            index += 1
-
-        # Show repeated user events and events from ics:
-        for event_list in [self.repeated_user_events.items, self.user_ics_events.items, self.repeated_ics_events.items]:
-            for event in event_list:
-                if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
-                    self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.EVENTS)
-                else:
-                    user_event_view = UserEventView(self.stdscr, self.y + index, self.x, event, self.screen)
-                    user_event_view.render()
-                index += 1
-
-        # Show deadlines for tasks, both from csv and ics files:
-        for deadline_list in [self.deadlines.items, self.deadlines_ics.items]:
-            for event in deadline_list:
-                if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
-                    self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.DEADLINES)
-                else:
-                    deadline_view = DeadlineView(self.stdscr, self.y + index, self.x, event, self.screen)
-                    deadline_view.render()
-                index += 1
-
-        # Show holidays:
-        if cf.DISPLAY_HOLIDAYS:
-            for event in self.holidays.items:
-                if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
-                    self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.HOLIDAYS)
-                else:
-                    holiday_view = HolidayView(self.stdscr, self.y + index, self.x, event, self.screen)
-                    holiday_view.render()
-                index += 1
-
-        # Show birthdays:
-        if cf.BIRTHDAYS_FROM_ABOOK:
-            for event in self.birthdays.items:
-                if index >= self.y_cell - 1 and self.screen.calendar_state == CalState.MONTHLY:
-                    self.display_line(self.y + self.y_cell - 2, self.x, self.hidden_events_sign, Color.BIRTHDAYS)
-                else:
-                    birthday_view = BirthdayView(self.stdscr, self.y + index, self.x, event, self.screen)
-                    birthday_view.render()
-                index += 1
-
-        self.num_events_this_day = index
-
-
-class WeeklyScreenView(View):
-    """Weekly view showing next 7 days of events"""
-
-    def __init__(self, stdscr, y, x, weather, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks, screen):
-        super().__init__(stdscr, y, x)
-        self.weather = weather
-        self.user_events = user_events
-        self.user_ics_events = user_ics_events
-        self.holidays = holidays
-        self.birthdays = birthdays
-        self.user_tasks = user_tasks
-        self.user_ics_tasks = user_ics_tasks
-        self.screen = screen
+    @property
+    def num_events_this_day(self):
+        return len(self.entries)
 
     def render(self):
-        """Render weekly view showing next 7 days"""
-        self.screen.currently_drawn = AppState.CALENDAR
-        if self.screen.x_max < 6 or self.screen.y_max < 3:
-            return
-
-        calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
-
-        # Calculate current week start (Monday or Sunday based on START_WEEK_DAY)
-        current_date = self.screen.date
-        days_since_week_start = (current_date.weekday() - (cf.START_WEEK_DAY - 1)) % 7
-        week_start_date = current_date - datetime.timedelta(days=days_since_week_start)
-
-        # Calculate week number
-        week_num = calendar.week_number(week_start_date.year, week_start_date.month, week_start_date.day)
-
-        # Header with week number
-        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
-        week_string = f"Week {week_num} - {month_names[week_start_date.month-1]} {week_start_date.year}"
-
-        header_view = HeaderView(self.stdscr, 0, 0, week_string, self.weather, self.screen)
-        header_view.render()
-
-        # Display day names header
-        day_names = DAYS_PERSIAN if cf.USE_PERSIAN_CALENDAR else DAYS
-        shift = cf.START_WEEK_DAY - 1
-        x_cell = self.screen.x_max // 7
-        for i in range(7):
-            day_number = (i + shift) % 7
-            day_name = day_names[day_number][:3]
-            x_pos = i * x_cell
-            color = Color.WEEKEND_NAMES if (day_number + 1) in cf.WEEKEND_DAYS else Color.DAY_NAMES
-            self.display_line(1, x_pos, day_name, color, cf.BOLD_DAY_NAMES)
-
-        # Display 7 days
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-
-        y_start = 2
-
-        for day_idx in range(7):
-            x_pos = day_idx * x_cell
-
-            # Calculate date for this day
-            day_date = week_start_date + datetime.timedelta(days=day_idx)
-            day_color = Color.TODAY if day_date == self.screen.today else (Color.WEEKENDS if (day_date.weekday() + 1) in cf.WEEKEND_DAYS else Color.DAYS)
-
-            # Display date number with month/day format
-            date_str = f"{day_date.day}/{day_date.month}"
-            if day_date == self.screen.today:
-                date_str += cf.TODAY_ICON
-            self.display_line(y_start, x_pos, date_str, day_color, cf.BOLD_TODAY if day_date == self.screen.today else False)
-
-            # Temporarily set screen date for this day to render events correctly
-            temp_day = self.screen.day
-            temp_month = self.screen.month
-            temp_year = self.screen.year
-            self.screen.day = day_date.day
-            self.screen.month = day_date.month
-            self.screen.year = day_date.year
-
-            daily_view = DailyView(self.stdscr, y_start + 1, x_pos, repeated_user_events,
-                                   repeated_ics_events, self.user_events, self.user_ics_events,
-                                   self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks,
-                                   self.screen, 0, day_idx == 0)
-            daily_view.render()
+        """Render this view on the screen"""
+        shows_numbers = (self.screen.selection_mode and self.is_selection_day and self.screen.state == AppState.CALENDAR
+                         and self.screen.selection_context != 'JOURNAL')
+        for index, (kind, item, collection) in enumerate(self.entries):
+            entry_view, _ = ENTRY_VIEWS[kind]
+            entry_view(self.stdscr, self.y + index, self.x, item, self.screen).render()
 
-            # Restore original date
-            self.screen.day = temp_day
-            self.screen.month = temp_month
-            self.screen.year = temp_year
+            # Only user events can be selected, as ICS events are read-only and tasks are selected in the journal:
+            if shows_numbers and collection is self.user_events:
+                self.display_line(self.y + index, self.x, str(index + 1), Color.ACTIVE_PANE)
 
 
 class DayNumberView(View):
@@ -798,6 +682,19 @@ class FooterView(View):
         self.display_line(self.screen.y_max - 1, 0, hint, Color.HINTS)
 
 
+class RenderTimesView(View):
+    """Display render times of views and hit rates of caches over the other panes"""
+
+    def __init__(self, stdscr, y, x, lines):
+        super().__init__(stdscr, y, x)
+        self.lines = lines
+
+    def render(self):
+        """Render this view on the screen"""
+        for index, line in enumerate(self.lines):
+            self.display_line(self.y + index, self.x, line, Color.HINTS)
+
+
 class ErrorView(View):
     """Display the error messages"""
 
@@ -966,33 +863,31 @@ class DailyScreenView(View):
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
 
-    @property
-    def dates(self):
-        """Return dates that exist in this month"""
-        return Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR).monthdayscalendar(self.screen.year, self.screen.month)
-
-    @property
-    def week_day(self):
+    def week_day(self, date):
         """Number of the day in week, from 0 to 6"""
-        for week in self.dates:
-            if self.screen.day not in week:
-                continue
-            weekday = (week.index(self.screen.day) + (cf.START_WEEK_DAY - 1)) % 7
-        return weekday
+        dates = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR).monthdayscalendar(date.year, date.month)
+        for week in dates:
+            if date.day in week:
+                return (week.index(date.day) + (cf.START_WEEK_DAY - 1)) % 7
 
-    @property
-    def color(self):
+    def color(self, date):
         """Color of the date and dayname"""
-        if self.screen.date == self.screen.today:
+        if date == self.screen.today:
             return Color.TODAY
-        if self.week_day + 1 in cf.WEEKEND_DAYS:
+        if self.week_day(date) + 1 in cf.WEEKEND_DAYS:
             return Color.WEEKENDS
         return Color.DAYS
 
-    @property
-    def icon(self):
+    def icon(self, date):
         """Icon of today"""
-        return cf.TODAY_ICON if self.screen.date == self.screen.today else ''
+        return cf.TODAY_ICON if date == self.screen.today else ''
+
+    @property
+    def title(self):
+        """Month and year shown in the header"""
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        month_string = str(month_names[self.screen.month-1])
+        return f'{month_string} {self.screen.year}'
 
     def render(self):
         """Render this view on the screen"""
@@ -1000,44 +895,25 @@ class DailyScreenView(View):
         if self.screen.x_max < 6 or self.screen.y_max < 3:
             return
 
-        # Form a string with month, year, and day with today icon:
-        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
-        month_string = str(month_names[self.screen.month-1])
-        date_string = f'{month_string} {self.screen.year}'
-
-        # Display header and footer:
-        header_view = HeaderView(self.stdscr, 0, 0, date_string, self.weather, self.screen)
-        header_view.render()
-
         # Display the events from current day to as many as possible days:
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
         max_num_days = (self.screen.y_max - 5)//2
+        start = self.screen.date
+        days = events_between(cf, start, start + datetime.timedelta(days=max_num_days), self.user_events,
+                              self.user_ics_events, self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks)
         vertical_shift = 0
-
-        is_selection_day = True
-        for _ in range(max_num_days):
+        for date, entries in days:
 
             # Display day name:
-            day_string = f"{self.screen.day} {DAYS[self.week_day]} {self.icon}"
-            day_string += " " * (max([len(day_name) for day_name in DAYS]) + 3 + len(self.icon) - len(day_string))
-            self.display_line(self.y + 2 + vertical_shift, self.x, day_string, self.color)
+            icon = self.icon(date)
+            day_string = f"{date.day} {DAYS[self.week_day(date)]} {icon}"
+            day_string += " " * (max([len(day_name) for day_name in DAYS]) + 3 + len(icon) - len(day_string))
+            self.display_line(self.y + 2 + vertical_shift, self.x, day_string, self.color(date))
 
             # Display events of the day:
-            daily_view = DailyView(self.stdscr, self.y + 3 + vertical_shift, self.x, repeated_user_events,
-                                   repeated_ics_events, self.user_events, self.user_ics_events, self.holidays,
-                                   self.birthdays, self.user_tasks, self.user_ics_tasks, self.screen, 0,
-                                   is_selection_day)
+            daily_view = DailyView(self.stdscr, self.y + 3 + vertical_shift, self.x, entries, self.user_events,
+                                   self.screen, date == start)
             daily_view.render()
-
-            # Move to the next day:
             vertical_shift += daily_view.num_events_this_day + 2
-            self.screen.next_day()
-            is_selection_day = False
-
-        # Return screen day back to the original day:
-        for _ in range(max_num_days):
-            self.screen.previous_day()
 
 
 class MonthlyScreenView(View):
@@ -1053,60 +929,50 @@ class MonthlyScreenView(View):
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
+        self.layout = None
+
+    def month_layout(self):
+        """Layout of the month, built again only if the month, the size, or the data changed"""
+        collections = [self.user_events, self.user_ics_events, self.holidays, self.birthdays,
+                       self.user_tasks, self.user_ics_tasks]
+        if self.layout is None or self.layout.key != MonthLayout.make_key(self.screen, collections):
+            self.layout = MonthLayout(cf, self.screen, *collections)
+        return self.layout
+
+    @property
+    def title(self):
+        """Month and year shown in the header"""
+        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
+        return month_names[self.screen.month-1] + " " + str(self.screen.year)
 
     def render(self):
         """Render this view on the screen"""
         self.screen.currently_drawn = AppState.CALENDAR
         if self.screen.x_max < 6 or self.screen.y_max < 3: return
 
-        # Info about the month:
-        month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
-        month_year_string = month_names[self.screen.month-1] + " " + str(self.screen.year)
-        calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
-        dates = calendar.monthdayscalendar(self.screen.year, self.screen.month)
-
-        # Calculate week numbers and adjust layout if week numbers are enabled
-        if self.screen.show_week_numbers:
-            week_numbers = calendar.month_week_numbers(self.screen.year, self.screen.month)
-            week_column_width = 4  # Space for week numbers (2 digits + 2 spaces for better separation)
-            calendar_start_x = week_column_width
-        else:
-            week_numbers = []
-            week_column_width = 0
-            calendar_start_x = 0
-        
-        y_cell = (self.screen.y_max - 3) // 6
-        x_cell = (self.screen.x_max - week_column_width) // 7
-
-        header_view = HeaderView(self.stdscr, 0, 0, month_year_string, self.weather, self.screen)
-        days_name_view = DaysNameView(self.stdscr, 1, calendar_start_x, self.screen, x_cell)
-        header_view.render()
+        layout = self.month_layout()
+        days_name_view = DaysNameView(self.stdscr, 1, layout.calendar_start_x, self.screen, layout.x_cell)
         days_name_view.render()
 
         if self.screen.show_week_numbers:
-            week_number_view = WeekNumberView(self.stdscr, 0, 0, self.screen, week_numbers)
+            week_number_view = WeekNumberView(self.stdscr, 0, 0, self.screen, layout.week_numbers)
             week_number_view.render()
 
         # Displaying the dates and events:
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        num_events_this_month = 0
-        for row, week in enumerate(dates):
-            for col, day in enumerate(week):
-                if day != 0:
-                    # Display dates of the month with proper styles:
-                    day_in_week = col + (cf.START_WEEK_DAY - 1) - 7 * ((col + (cf.START_WEEK_DAY - 1)) > 6)
-                    day_number_view = DayNumberView(self.stdscr, 2 + row * y_cell, calendar_start_x + col * x_cell, self.screen, day, day_in_week, x_cell)
-                    day_number_view.render()
-
-                    # Display the events:
-                    self.screen.day = day
-                    daily_view = DailyView(self.stdscr, 3 + row * y_cell, calendar_start_x + col * x_cell, repeated_user_events,
-                                           repeated_ics_events, self.user_events, self.user_ics_events,
-                                           self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks,
-                                           self.screen, num_events_this_month)
-                    daily_view.render()
-                    num_events_this_month += len(self.user_events.filter_events_that_day(self.screen).items)
+        shows_numbers = (self.screen.selection_mode and self.screen.state == AppState.CALENDAR
+                         and self.screen.selection_context != 'JOURNAL')
+        for cell in layout.cells:
+            day_number_view = DayNumberView(self.stdscr, cell.y - 1, cell.x, self.screen, cell.day, cell.day_in_week, layout.x_cell)
+            day_number_view.render()
+            for index, (kind, item, number) in enumerate(cell.entries):
+                entry_view, _ = ENTRY_VIEWS[kind]
+                entry_view(self.stdscr, cell.y + index, cell.x, item, self.screen).render()
+                if number is not None and shows_numbers:
+                    self.display_line(cell.y + index, cell.x, str(number), Color.ACTIVE_PANE)
+            if cell.hidden_kind is not None:
+                hidden_events_sign = cf.HIDDEN_ICON + " "*(self.screen.x_max - cell.x - len(cf.HIDDEN_ICON))
+                _, color = ENTRY_VIEWS[cell.hidden_kind]
+                self.display_line(cell.y + layout.y_cell - 2, cell.x, hidden_events_sign, color)
 
         if cf.SHOW_CALENDAR_BORDERS:
             calendar_border_view = CalenarBorderView(self.stdscr, 0, 0, self.screen)
@@ -1127,28 +993,24 @@ class WeeklyScreenView(View):
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
 
-    def render(self):
-        """Render weekly view showing next 7 days"""
-        self.screen.currently_drawn = AppState.CALENDAR
-        if self.screen.x_max < 6 or self.screen.y_max < 3:
-            return
-
+    @property
+    def title(self):
+        """Week number, month, and year shown in the header"""
         calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
-        
+
         # Calculate current week start (Monday or Sunday based on START_WEEK_DAY)
         current_date = self.screen.date
         days_since_week_start = (current_date.weekday() - (cf.START_WEEK_DAY - 1)) % 7
         week_start_date = current_date - datetime.timedelta(days=days_since_week_start)
-        
-        # Calculate week number
         week_num = calendar.week_number(week_start_date.year, week_start_date.month, week_start_date.day)
-        
-        # Header with week number
         month_names = MONTHS_PERSIAN if cf.USE_PERSIAN_CALENDAR else MONTHS
-        week_string = f"Week {week_num} - {month_names[week_start_date.month-1]} {week_start_date.year}"
-        
-        header_view = HeaderView(self.stdscr, 0, 0, week_string, self.weather, self.screen)
-        header_view.render()
+        return f"Week {week_num} - {month_names[week_start_date.month-1]} {week_start_date.year}"
+
+    def render(self):
+        """Render weekly view showing next 7 days"""
+        self.screen.currently_drawn = AppState.CALENDAR
+        if self.screen.x_max < 6 or self.screen.y_max < 3:
+            return
 
         # Display day names header
         day_names = DAYS_PERSIAN if cf.USE_PERSIAN_CALENDAR else DAYS
@@ -1161,22 +1023,18 @@ class WeeklyScreenView(View):
             color = Color.WEEKEND_NAMES if (day_number + 1) in cf.WEEKEND_DAYS else Color.DAY_NAMES
             self.display_line(1, x_pos, day_name, color, cf.BOLD_DAY_NAMES)
 
-        # Display 7 days
-        repeated_user_events = RepeatedEvents(self.user_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        repeated_ics_events = RepeatedEvents(self.user_ics_events, cf.USE_PERSIAN_CALENDAR, self.screen.year)
-        
         # Calculate week start date based on current screen date (for navigation)
         current_screen_date = datetime.date(self.screen.year, self.screen.month, self.screen.day)
         days_since_week_start = (current_screen_date.weekday() - (cf.START_WEEK_DAY - 1)) % 7
         week_start_date = current_screen_date - datetime.timedelta(days=days_since_week_start)
         
+        days = events_between(cf, week_start_date, week_start_date + datetime.timedelta(days=7), self.user_events,
+                              self.user_ics_events, self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks)
         y_start = 2
-        
-        for day_idx in range(7):
+
+        # Display 7 days
+        for day_idx, (day_date, entries) in enumerate(days):
             x_pos = day_idx * x_cell
-            
-            # Calculate date for this day
-            day_date = week_start_date + datetime.timedelta(days=day_idx)
             day_color = Color.TODAY if day_date == self.screen.today else (Color.WEEKENDS if (day_date.weekday() + 1) in cf.WEEKEND_DAYS else Color.DAYS)
             
             # Display date number with month/day format
@@ -1185,25 +1043,10 @@ class WeeklyScreenView(View):
                 date_str += cf.TODAY_ICON
             self.display_line(y_start, x_pos, date_str, day_color, cf.BOLD_TODAY if day_date == self.screen.today else False)
             
-            # Temporarily set screen date for this day to render events correctly
-            temp_day = self.screen.day
-            temp_month = self.screen.month
-            temp_year = self.screen.year
-            self.screen.day = day_date.day
-            self.screen.month = day_date.month
-            self.screen.year = day_date.year
-            
             # Display events for this day
-            daily_view = DailyView(self.stdscr, y_start + 1, x_pos, repeated_user_events,
-                                   repeated_ics_events, self.user_events, self.user_ics_events,
-                                   self.holidays, self.birthdays, self.user_tasks, self.user_ics_tasks,
-                                   self.screen, 0, day_date == current_screen_date)
+            daily_view = DailyView(self.stdscr, y_start + 1, x_pos, entries, self.user_events, self.screen,
+                                   day_date == current_screen_date)
             daily_view.render()
-            
-            # Restore screen date
-            self.screen.day = temp_day
-            self.screen.month = temp_month
-            self.screen.year = temp_year
 
 
 class JournalScreenView(View):
@@ -1213,6 +1056,13 @@ class JournalScreenView(View):
         self.user_tasks = user_tasks
         self.user_ics_tasks = user_ics_tasks
         self.screen = screen
+        self.journal_rows = None
+
+    def rows(self):
+        """Lines of the journal, built again only if tasks changed"""
+        if self.journal_rows is None or self.journal_rows.key != JournalRows.make_key(self.user_tasks, self.user_ics_tasks):
+            self.journal_rows = JournalRows(self.user_tasks, self.user_ics_tasks)
+        return self.journal_rows
 
     def render(self):
         """Journal view showing all tasks"""
@@ -1225,7 +1075,8 @@ class JournalScreenView(View):
         header_view.render()
 
         # Display the tasks:
-        journal_view = JournalView(self.stdscr, 2, self.screen.x_min, self.user_tasks, self.user_ics_tasks, self.screen)
+        journal_view = JournalView(self.stdscr, 2, self.screen.x_min, self.rows(), self.user_tasks,
+                                   self.user_ics_tasks, self.screen)
         journal_view.render()
 
 
@@ -1334,10 +1185,17 @@ def main(stdscr) -> None:
     except:
         pass  # Debug logger might not be initialized yet
 
+    # Frames are drawn only when a key, a timer, or a background thread wakes the loop up:
+    event_loop = EventLoop()
+    render_stats = RenderStats() if cf.SHOW_RENDER_TIMES else None
+
     # Load the weather:
     weather = Weather(cf.WEATHER_CITY, cf.WEATHER_METRIC_UNITS)
     if cf.SHOW_WEATHER:
-        threading.Thread(target=weather.load_from_wttr).start()
+        def load_weather():
+            weather.load_from_wttr()
+            event_loop.wake()
+        threading.Thread(target=load_weather).start()
 
     screen = Screen(stdscr, cf)
 
@@ -1346,6 +1204,8 @@ def main(stdscr) -> None:
     task_loader_csv = TaskLoaderCSV(cf)
     event_loader_ics = EventLoaderICS(cf)
     task_loader_ics = TaskLoaderICS(cf)
+    for ics_loader in [event_loader_ics, task_loader_ics]:
+        ics_loader.extend_horizon(*screen.displayed_period)
     birthday_loader = BirthdayLoader(cf)
     holiday_loader = HolidayLoader(cf)
 
@@ -1399,19 +1259,10 @@ def main(stdscr) -> None:
         debug_logger.log_error("LOAD_ERROR", f"Failed to load birthdays: {e}", e)
         birthdays = Events()
 
-    # Load live data (Notion):
-    try:
-        from cally.loaders_live import NotionTaskLoader
-        notion_loader = NotionTaskLoader(cf)
-        live_tasks = notion_loader.load()
-        debug_logger.log_data_load("NotionTaskLoader", len(live_tasks))
-        for task in live_tasks:
-            # Ensure unique ID for live tasks to avoid conflict with CSV tasks
-            task.item_id = user_tasks.generate_id()
-            user_tasks.add_item(task)
-    except Exception as e:
-        debug_logger.log_error("LOAD_ERROR", f"Failed to load Notion tasks: {e}", e)
-        live_tasks = []
+    # Load live data (Notion, Microsoft To Do) in the background, each source on its own schedule:
+    live_scheduler = LiveScheduler(create_live_connectors(cf), event_loop.wake)
+    live_scheduler.start()
+    state_store = get_state_store(cf)
     
     debug_logger.log_event("LOAD_COMPLETE", 
                           f"Total events: {len(user_events.items)}, "
@@ -1424,8 +1275,8 @@ def main(stdscr) -> None:
     importer = Importer(user_tasks, user_events, cf)
     
     # Live Savers
-    from cally.loaders_live import NotionTaskSaver
-    notion_saver = NotionTaskSaver()
+    notion_saver = NotionTaskSaver(cf)
+    mstodo_saver = MSTodoTaskSaver(cf)
 
     read_items_from_user_arguments(screen, user_tasks, user_events, task_saver_csv, event_saver_csv)
 
@@ -1434,28 +1285,32 @@ def main(stdscr) -> None:
     curses.noecho()
     curses.curs_set(False)
     initialize_colors(cf)
+    event_loop.start()
 
-    # Initialise screen views:
-    app_view = View(stdscr, 0, 0)
-    monthly_screen_view = MonthlyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
+    # Initialise screen views, each part of the screen is drawn in its own pane:
+    panes = ScreenPanes()
+    monthly_screen_view = MonthlyScreenView(panes.calendar, 0, 0, weather, user_events, user_ics_events,
                                             holidays, birthdays, user_tasks, user_ics_tasks, screen)
-    daily_screen_view = DailyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
+    daily_screen_view = DailyScreenView(panes.calendar, 0, 0, weather, user_events, user_ics_events,
                                         holidays, birthdays, user_tasks, user_ics_tasks, screen)
-    weekly_screen_view = WeeklyScreenView(stdscr, 0, 0, weather, user_events, user_ics_events,
+    weekly_screen_view = WeeklyScreenView(panes.calendar, 0, 0, weather, user_events, user_ics_events,
                                           holidays, birthdays, user_tasks, user_ics_tasks, screen)
-    journal_screen_view = JournalScreenView(stdscr, 0, 0, weather, user_tasks, user_ics_tasks, screen)
+    journal_screen_view = JournalScreenView(panes.journal, 0, 0, weather, user_tasks, user_ics_tasks, screen)
     help_screen_view = HelpScreenView(stdscr, 0, 0, screen)
     welcome_screen_view = WelcomeScreenView(stdscr, 0, 0, screen)
-    footer_view = FooterView(stdscr, 0, 0, screen)
-    separator_view = SeparatorView(stdscr, 0, 0, screen)
-    error_view = ErrorView(stdscr, 0, 0, screen)
+    footer_view = FooterView(panes.footer, 0, 0, screen)
+    separator_view = SeparatorView(panes.journal, 0, 0, screen)
+    error_view = ErrorView(panes.footer, 0, 0, screen)
+    content_version = 0
 
     # Show welcome screen on the first run:
     if cf.is_first_run:
         screen.state = AppState.WELCOME
     while screen.state == AppState.WELCOME:
         welcome_screen_view.render()
-        control_welcome_screen(stdscr, screen)
+        screen.key = event_loop.wait_for_key(stdscr)
+        if screen.key is not None:
+            control_welcome_screen(stdscr, screen)
 
     # Running different screens depending on the state:
     try:
@@ -1466,54 +1321,96 @@ def main(stdscr) -> None:
             except:
                 pass
             
+            # If needed, reload the data:
+            if screen.is_time_to_reload or screen.reload_data:
+                screen.is_reloading = True  # Set reloading flag for visual indicator
+                screen.reload_data = False  # Clear manual reload flag
+                debug_logger.log_event("RELOAD_START", "Starting data reload")
+            
+                user_events = event_loader_csv.load()
+                # Remove old Notion tasks before reloading
+                user_tasks.items = [t for t in user_tasks.items if not (hasattr(t, 'notion_id') and t.notion_id)]
+                user_tasks = task_loader_csv.load()
+                user_ics_events = event_loader_ics.load()
+                user_ics_tasks = task_loader_ics.load()
+
+                # Reload live tasks in the background, deleted ones are skipped as they arrive
+                live_scheduler.reload()
+                content_version += 1
+                screen.last_data_reload_time = datetime.datetime.now()
+                screen.is_reloading = False  # Clear reloading flag
+                debug_logger.log_event("RELOAD_COMPLETE", "Data reload finished")
+
+            # Add live tasks that arrived since the last frame:
+            if add_live_tasks(live_scheduler, user_tasks, state_store):
+                content_version += 1
+            screen.is_reloading = live_scheduler.is_loading
+
+            # Load ICS data on demand if the user navigated outside of the horizon:
+            displayed_period = screen.displayed_period
+            for ics_loader in [event_loader_ics, task_loader_ics]:
+                if not ics_loader.covers(*displayed_period):
+                    debug_logger.log_event("ICS_HORIZON", f"Extending ICS horizon to {displayed_period[0]} - {displayed_period[1]}")
+                    ics_loader.extend_horizon(*displayed_period)
+                    ics_loader.load(reread_remote=False)
+                    content_version += 1
+
             # Ensure tasks are sorted by type (Local then Notion) to match display indexing
             user_tasks.sort_by_type()
-            
-            stdscr.clear()
-            app_view.fill_background()
 
-            # Calculate screen refresh rate:
-            curses.halfdelay(200)
-            if user_tasks.has_active_timer and screen.state == AppState.JOURNAL:
-                curses.halfdelay(cf.REFRESH_INTERVAL * 10)
+            # Wake up for the clock, for running timers in the journal, and for reloads:
+            now = time.time()
+            event_loop.set_timer("clock", now - now % 60 + 60)
+            if user_tasks.has_active_timer and (screen.split or screen.state == AppState.JOURNAL):
+                event_loop.set_timer("timers", now + cf.REFRESH_INTERVAL)
+            else:
+                event_loop.cancel_timer("timers")
+            if screen.reload_interval:
+                next_reload = screen.last_data_reload_time + datetime.timedelta(minutes=screen.reload_interval)
+                event_loop.set_timer("reload", next_reload.timestamp() + 1)
+            else:
+                event_loop.cancel_timer("reload")
 
-            # Calendar screens:
+            # Draw calendar and journal panes that changed:
             if screen.state == AppState.CALENDAR:
-                if screen.calendar_state == CalState.MONTHLY:
-                    monthly_screen_view.render()
-                elif screen.calendar_state == CalState.WEEKLY:
-                    weekly_screen_view.render()
-                else:
-                    daily_screen_view.render()
-
-                if screen.split:
-                    journal_screen_view.render()
-                    separator_view.render()
-                footer_view.render()
-                error_view.render()
+                calendar_views = {CalState.MONTHLY: monthly_screen_view, CalState.WEEKLY: weekly_screen_view}
+                calendar_view = calendar_views.get(screen.calendar_state, daily_screen_view)
+            else:
+                calendar_view = monthly_screen_view if screen.calendar_state == CalState.MONTHLY else daily_screen_view
+            if screen.state in [AppState.CALENDAR, AppState.JOURNAL]:
+                draw_panes(stdscr, panes, calendar_view, journal_screen_view, separator_view, footer_view,
+                           error_view, weather, user_tasks, screen, content_version, render_stats)
+                if render_stats is not None and render_stats.is_time_to_log:
+                    debug_logger.log_event("RENDER_TIMES", render_stats.summary())
+            elif screen.state == AppState.HELP:
+                help_screen_view.render()
+            else:
+                break
 
-                # Unified control: handles both calendar and journal actions
-                # Get key once and share between calendar and journal controls
+            # Get key once and share it between controls, the journal in selection mode still acts on its last key:
+            if not (screen.state == AppState.JOURNAL and screen.selection_mode):
                 try:
-                    screen.key = stdscr.getkey()
-                except curses.error as e:
-                    # Timeout or no input - continue loop
-                    # Only log input timeouts occasionally to reduce log spam (every 100th timeout)
-                    if not hasattr(screen, '_timeout_count'):
-                        screen._timeout_count = 0
-                    screen._timeout_count += 1
-                    if screen._timeout_count % 100 == 0:
-                        debug_logger.logger.debug(f"Input timeout/no input (logged every 100th): {e}")
-                    screen.key = None
-                    continue
+                    screen.key = event_loop.wait_for_key(stdscr)
                 except Exception as e:
                     # Catch any other input errors
                     debug_logger.log_error("INPUT_ERROR", f"Error getting input: {e}", e)
                     screen.key = None
                     continue
+
+                # A timer or a background thread woke the loop up, so only a new frame is needed:
+                if screen.key is None:
+                    continue
+                if render_stats is not None:
+                    render_stats.key_pressed()
+
+            # Calendar screens:
+            if screen.state == AppState.CALENDAR:
+                # Unified control: handles both calendar and journal actions
+                content_version += 1
                 
                 # Handle pending journal actions (2-step commands like 'd' -> number)
-                journal_keys = ['t', 'T', 'h', 'l', 'v', 'u', 'i', 's', 'S', 'd', 'x', 'e', 'r', 'c', 'm', '.', 'f', 'F']
+                journal_keys = ['t', 'T', 'h', 'l', 'v', 'u', 'i', 's', 'S', 'd', 'x', 'e', 'r', 'c', 'm', '.', 'f', 'F',
+                                'KEY_NPAGE', 'KEY_PPAGE']
                 
                 if screen.selection_mode and screen.pending_action in journal_keys:
                     # We are in the second step of a journal command
@@ -1525,7 +1422,7 @@ def main(stdscr) -> None:
                     screen.key = screen.pending_action
                     screen.selection_context = 'JOURNAL'
                     
-                    control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver)
+                    control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver, mstodo_saver)
                     
                     # Reset state after handling
                     screen.pending_action = None
@@ -1553,7 +1450,7 @@ def main(stdscr) -> None:
                     else:
                         # Not a selection key (like 't') or already in selection mode
                         screen.selection_context = 'JOURNAL'
-                        control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver)
+                        control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver, mstodo_saver)
                 else:
                     # Handle calendar keys
                     screen.selection_context = 'CALENDAR'
@@ -1566,88 +1463,21 @@ def main(stdscr) -> None:
 
             # Journal screen:
             elif screen.state == AppState.JOURNAL:
-                if screen.split:
-                    if screen.calendar_state == CalState.MONTHLY:
-                        monthly_screen_view.render()
-                    else:
-                        daily_screen_view.render()
-                    separator_view.render()
-                journal_screen_view.render()
-                footer_view.render()
-                error_view.render()
-                control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver)
-
-            # Help screen:
+                control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver, mstodo_saver)
+                content_version += 1
+
+            # Help screen covers all panes, so they are drawn again after it:
             elif screen.state == AppState.HELP:
-                help_screen_view.render()
                 control_help_screen(stdscr, screen)
+                panes.invalidate()
 
-            else:
-                break
-
-        # If something has been changed, save the data:
-        if user_events.changed:
-            event_saver_csv.save()
-            screen.refresh_now = True
-        if user_tasks.changed:
-            task_saver_csv.save()
-            # Also save deleted Notion task IDs to persist across restarts
-            deleted_notion_file = Path(cf.config_folder) / "deleted_notion_tasks.txt"
-            deleted_notion_ids = set()
-            for task in user_tasks.items:
-                if hasattr(task, 'notion_id') and task.notion_id and hasattr(task, '_deleted') and task._deleted:
-                    deleted_notion_ids.add(task.notion_id)
-            # Also check existing file for IDs that were deleted but task no longer in list
-            if deleted_notion_file.exists():
-                try:
-                    with open(deleted_notion_file, "r", encoding="utf-8") as f:
-                        existing_deleted = set(line.strip() for line in f if line.strip())
-                        deleted_notion_ids.update(existing_deleted)
-                except Exception:
-                    pass
-            # Write back all deleted IDs
-            try:
-                with open(deleted_notion_file, "w", encoding="utf-8") as f:
-                    for task_id in deleted_notion_ids:
-                        f.write(f"{task_id}\n")
-            except Exception:
-                pass
-            screen.refresh_now = True
-
-        # If needed, reload the data:
-        if screen.is_time_to_reload or screen.reload_data:
-            screen.is_reloading = True  # Set reloading flag for visual indicator
-            screen.reload_data = False  # Clear manual reload flag
-            debug_logger.log_event("RELOAD_START", "Starting data reload")
-            
-            user_events = event_loader_csv.load()
-            # Load deleted Notion task IDs from file
-            deleted_notion_file = Path(cf.config_folder) / "deleted_notion_tasks.txt"
-            deleted_notion_ids = set()
-            if deleted_notion_file.exists():
-                try:
-                    with open(deleted_notion_file, "r", encoding="utf-8") as f:
-                        deleted_notion_ids = set(line.strip() for line in f if line.strip())
-                except Exception:
-                    pass
-            
-            # Remove old Notion tasks before reloading
-            user_tasks.items = [t for t in user_tasks.items if not (hasattr(t, 'notion_id') and t.notion_id)]
-            user_tasks = task_loader_csv.load()
-            user_ics_events = event_loader_ics.load()
-            user_ics_tasks = task_loader_ics.load()
-            # Reload Notion tasks, but skip deleted ones
-            live_tasks = notion_loader.load()
-            for task in live_tasks:
-                if not task.is_header:
-                    # Skip tasks that were deleted
-                    if hasattr(task, 'notion_id') and task.notion_id in deleted_notion_ids:
-                        continue
-                    task.item_id = user_tasks.generate_id()
-                user_tasks.add_item(task)
-            screen.last_data_reload_time = datetime.datetime.now()
-            screen.is_reloading = False  # Clear reloading flag
-            debug_logger.log_event("RELOAD_COMPLETE", "Data reload finished")
+            # If something has been changed, save the data:
+            if user_events.changed:
+                event_saver_csv.save()
+                screen.refresh_now = True
+            if user_tasks.changed:
+                task_saver_csv.save()
+                screen.refresh_now = True
     
     except KeyboardInterrupt:
         debug_logger.log_event("EXIT", "User interrupted (Ctrl+C)")
@@ -1659,6 +1489,10 @@ def main(stdscr) -> None:
     
     # Cleaning up before quitting:
     debug_logger.log_event("EXIT", "Normal exit")
+    notion_saver.stop()
+    mstodo_saver.stop()
+    live_scheduler.stop()
+    debug_logger.log_event("NOTION_RATE_LIMIT", notion_saver.limiter.summary())
     curses.echo()
     curses.curs_set(True)
     curses.endwin()
@@ -0,0 +1,114 @@
+"""Entries shown on days of the calendar: events of any range of days and the cached layout of the month"""
+
+import datetime
+
+from cally.calendars import Calendar
+from cally.data import Collection, RepeatedEvents
+
+
+def events_between(cf, start, end, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks):
+    """Entries of every day from start to end, not including the end, for all sources at once.
+    Returns a list of dates with their entries, which are (kind, item, collection) in the order they are shown.
+    Each collection is scanned once for the whole range instead of once for every day"""
+    dates = []
+    date = start
+    while date < end:
+        dates.append(date)
+        date += datetime.timedelta(days=1)
+    days = {(date.year, date.month, date.day): [] for date in dates}
+    birthdays_days = {}
+    for key in days:
+        birthdays_days.setdefault(key[1:], []).append(key)
+
+    def add_entries(kind, collection, entries_by_day=days):
+        for item in collection.items:
+            entries = entries_by_day.get((item.year, item.month, item.day))
+            if entries is not None and Collection.is_valid_item(item):
+                entries.append((kind, item, collection))
+
+    add_entries("event", user_events)
+    add_entries("event", RepeatedEvents(user_events, cf.USE_PERSIAN_CALENDAR, start.year))
+    ics_events = {key: [] for key in days}
+    add_entries("event", user_ics_events, ics_events)
+    for key, entries in ics_events.items():
+        entries.sort(key=lambda entry: (entry[1].hour is None, entry[1].hour))
+        days[key].extend(entries)
+    add_entries("event", RepeatedEvents(user_ics_events, cf.USE_PERSIAN_CALENDAR, start.year))
+    add_entries("deadline", user_tasks)
+    add_entries("deadline", user_ics_tasks)
+    if cf.DISPLAY_HOLIDAYS:
+        add_entries("holiday", holidays)
+
+    # Birthdays happen every year:
+    if cf.BIRTHDAYS_FROM_ABOOK:
+        for item in birthdays.items:
+            for key in birthdays_days.get((item.month, item.day), []):
+                if Collection.is_valid_item(item):
+                    days[key].append(("birthday", item, birthdays))
+
+    return [(date, days[(date.year, date.month, date.day)]) for date in dates]
+
+
+class DayCell:
+    """Place of one day in the monthly calendar and the entries shown in it"""
+
+    def __init__(self, day, day_in_week, y, x):
+        self.day = day
+        self.day_in_week = day_in_week
+        self.y = y  # First line of entries, the day number is above it
+        self.x = x
+        self.entries = []  # (kind, item, selection number or None) in the order they are shown
+        self.hidden_kind = None  # Kind of the last entry that did not fit into the cell
+
+
+class MonthLayout:
+    """Cells of all days of the month with their events, repetitions, deadlines, holidays, and birthdays"""
+
+    def __init__(self, cf, screen, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks):
+        self.key = self.make_key(screen, [user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks])
+        calendar = Calendar(cf.START_WEEK_DAY - 1, cf.USE_PERSIAN_CALENDAR)
+        year, month = screen.year, screen.month
+
+        if screen.show_week_numbers:
+            self.week_numbers = calendar.month_week_numbers(year, month)
+            self.calendar_start_x = 4  # Space for week numbers (2 digits + 2 spaces for better separation)
+        else:
+            self.week_numbers = []
+            self.calendar_start_x = 0
+        self.y_cell = (screen.y_max - 3) // 6
+        self.x_cell = (screen.x_max - self.calendar_start_x) // 7
+
+        if cf.USE_PERSIAN_CALENDAR:
+            import jdatetime
+            first_day = jdatetime.date(year, month, 1)
+        else:
+            first_day = datetime.date(year, month, 1)
+        next_month = first_day + datetime.timedelta(days=calendar.last_day(year, month))
+        days = {date.day: entries for date, entries in events_between(
+            cf, first_day, next_month, user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks)}
+
+        # Place the days and number user events through the month, as selection counts them:
+        self.cells = []
+        number = 0
+        for row, week in enumerate(calendar.monthdayscalendar(year, month)):
+            for col, day in enumerate(week):
+                if day == 0:
+                    continue
+                day_in_week = col + (cf.START_WEEK_DAY - 1) - 7 * ((col + (cf.START_WEEK_DAY - 1)) > 6)
+                cell = DayCell(day, day_in_week, 3 + row * self.y_cell, self.calendar_start_x + col * self.x_cell)
+                for index, (kind, item, collection) in enumerate(days[day]):
+                    selection_number = None
+                    if collection is user_events:
+                        number += 1
+                        selection_number = number
+                    if index < self.y_cell - 1:
+                        cell.entries.append((kind, item, selection_number))
+                    else:
+                        cell.hidden_kind = kind
+                self.cells.append(cell)
+
+    @staticmethod
+    def make_key(screen, collections):
+        """Everything the layout depends on: the month, the size of the calendar, and versions of the data"""
+        return (screen.year, screen.month, screen.y_max, screen.x_max, screen.show_week_numbers,
+                tuple(collection.version for collection in collections))
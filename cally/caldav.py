@@ -0,0 +1,154 @@
+"""Incremental synchronization of CalDAV calendars with a local cache"""
+
+import hashlib
+import json
+import logging
+import urllib.parse
+from pathlib import Path
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+
+CALDAV_PREFIX = "caldav+"
+MULTIGET_BATCH = 100
+DAV = "{DAV:}"
+CALDAV = "{urn:ietf:params:xml:ns:caldav}"
+
+SYNC_COLLECTION = """<?xml version="1.0" encoding="utf-8"?>
+<d:sync-collection xmlns:d="DAV:">
+  <d:sync-token>{token}</d:sync-token>
+  <d:sync-level>1</d:sync-level>
+  <d:prop><d:getetag/></d:prop>
+</d:sync-collection>"""
+
+CALENDAR_MULTIGET = """<?xml version="1.0" encoding="utf-8"?>
+<c:calendar-multiget xmlns:d="DAV:" xmlns:c="urn:ietf:params:xml:ns:caldav">
+  <d:prop><d:getetag/><c:calendar-data/></d:prop>
+{hrefs}
+</c:calendar-multiget>"""
+
+
+def is_caldav_source(path):
+    """Check if the source from the config is a CalDAV collection like caldav+https://host/calendar/"""
+    return path.startswith(CALDAV_PREFIX)
+
+
+class CalDAVCollection:
+    """Calendar collection on a CalDAV server mirrored in a local cache.
+    After the first sync, only resources that sync-collection reports as changed are downloaded"""
+
+    def __init__(self, source, cache_folder, http):
+        parts = urllib.parse.urlsplit(source[len(CALDAV_PREFIX):])
+        self.auth = None
+        if parts.username:
+            self.auth = (urllib.parse.unquote(parts.username), urllib.parse.unquote(parts.password or ""))
+        netloc = parts.hostname + (f":{parts.port}" if parts.port else "")
+        self.url = urllib.parse.urlunsplit((parts.scheme, netloc, parts.path.rstrip("/") + "/", parts.query, ""))
+        self.http = http
+        self.cache_file = Path(cache_folder) / f"{hashlib.sha1(self.url.encode()).hexdigest()}.json"
+        self.sync_token = ""
+        self.resources = {}  # href: {"etag": ..., "data": ...}
+        self.downloaded = 0  # resources fetched by the last sync
+        self.read_cache()
+
+    def read_cache(self):
+        """Read resources and the sync token of the last sync"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get("url") == self.url:
+            self.sync_token = cache["sync_token"]
+            self.resources = cache["resources"]
+
+    def save_cache(self):
+        """Write the cache, so that calendars can be shown without connection"""
+        dummy_file = Path(f"{self.cache_file}.bak")
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(dummy_file, "w", encoding="utf-8") as f:
+                json.dump({"url": self.url, "sync_token": self.sync_token, "resources": self.resources}, f)
+            dummy_file.replace(self.cache_file)
+        except OSError as e_message:
+            logging.error("Failed to save %s. %s", self.cache_file, e_message)
+
+    def report(self, body, depth):
+        """Send a REPORT request to the collection"""
+        headers = {"Content-Type": "application/xml; charset=utf-8", "Depth": depth}
+        return self.http.request("REPORT", self.url, data=body.encode("utf-8"), headers=headers, auth=self.auth)
+
+    def sync_changes(self, sync_token):
+        """Ask which resources changed since the token.
+        Return the new token, ETags of changed resources, deleted hrefs, and if it was a full sync"""
+        response = self.report(SYNC_COLLECTION.format(token=escape(sync_token)), "0")
+
+        # The server forgot the token, so start over and compare ETags instead:
+        if response.status_code in [403, 409] and sync_token:
+            logging.warning("Sync token of %s is no longer valid, syncing fully.", self.url)
+            return self.sync_changes("")
+        if response.status_code != 207:
+            logging.error("Failed to sync %s, server answered %s.", self.url, response.status_code)
+            return None
+
+        root = ElementTree.fromstring(response.content)
+        changed = {}
+        deleted = []
+        for item in root.iter(f"{DAV}response"):
+            href = item.findtext(f"{DAV}href")
+            status = item.findtext(f"{DAV}status") or ""
+            if " 404 " in status:
+                deleted.append(href)
+                continue
+            etag = item.findtext(f".//{DAV}getetag")
+            if href != urllib.parse.urlsplit(self.url).path:
+                changed[href] = etag
+        return root.findtext(f"{DAV}sync-token") or "", changed, deleted, not sync_token
+
+    def fetch(self, hrefs):
+        """Download calendar data of the resources, return it with ETags by href"""
+        fetched = {}
+        for start in range(0, len(hrefs), MULTIGET_BATCH):
+            batch = hrefs[start:start + MULTIGET_BATCH]
+            body = CALENDAR_MULTIGET.format(hrefs="\n".join(f"  <d:href>{escape(href)}</d:href>" for href in batch))
+            response = self.report(body, "1")
+            if response.status_code != 207:
+                logging.error("Failed to fetch events of %s, server answered %s.", self.url, response.status_code)
+                return None
+            for item in ElementTree.fromstring(response.content).iter(f"{DAV}response"):
+                data = item.findtext(f".//{CALDAV}calendar-data")
+                if data is not None:
+                    fetched[item.findtext(f"{DAV}href")] = {"etag": item.findtext(f".//{DAV}getetag"), "data": data}
+        return fetched
+
+    def sync(self):
+        """Bring the cache up to date, return False if the server could not be reached"""
+        self.downloaded = 0
+        try:
+            changes = self.sync_changes(self.sync_token)
+            if changes is None:
+                return False
+            sync_token, changed, deleted, is_full_sync = changes
+            outdated = [href for href, etag in changed.items()
+                        if etag is None or self.resources.get(href, {}).get("etag") != etag]
+            fetched = self.fetch(outdated)
+            if fetched is None:
+                return False
+        except Exception as e_message:
+            logging.error("Failed to sync %s. %s", self.url, e_message)
+            return False
+
+        # A full sync lists every resource, so the rest were deleted:
+        if is_full_sync:
+            deleted = [href for href in self.resources if href not in changed]
+        for href in deleted:
+            self.resources.pop(href, None)
+        self.resources.update(fetched)
+        self.downloaded = len(fetched)
+        self.sync_token = sync_token
+        self.save_cache()
+        return True
+
+    def calendars(self):
+        """Calendar data of all resources, one ics text for each"""
+        return [resource["data"] for resource in self.resources.values()]
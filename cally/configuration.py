@@ -8,6 +8,7 @@ import datetime
 from pathlib import Path
 
 from cally.data import AppState
+from cally.icons import IconMatcher
 
 
 class Config:
@@ -82,6 +83,22 @@ class Config:
                 "weekend_days":              "6,7",
                 "refresh_interval":          "1",
                 "data_reload_interval":      "0",
+                "show_render_times":         "No",
+                "ics_parse_workers":         "0",
+                "ics_horizon_past":          "0",
+                "ics_horizon_future":        "0",
+                "ics_event_priority":        "",
+                "live_connectors":           "notion,mstodo",
+                "notion_refresh_minutes":    "10",
+                "notion_lookup_workers":     "8",
+                "notion_cache_hours":        "24",
+                "notion_full_sync_hours":    "6",
+                "notion_requests_per_second": "3",
+                "mstodo_refresh_minutes":    "5",
+                "mstodo_requests_per_second": "4",
+                "http_pool_size":            "10",
+                "http_connect_timeout":      "5",
+                "http_read_timeout":         "30",
                 "split_screen":              "Yes",
                 "right_pane_percentage":     "25",
                 "journal_header":            "JOURNAL",
@@ -256,6 +273,7 @@ class Config:
             self.IMPORTANT_ICON        = conf.get("Parameters", "important_icon", fallback="‣") if self.DISPLAY_ICONS else "!"
             self.REFRESH_INTERVAL      = int(conf.get("Parameters", "refresh_interval", fallback=1))
             self.DATA_RELOAD_INTERVAL  = int(conf.get("Parameters", "data_reload_interval", fallback=0))
+            self.SHOW_RENDER_TIMES     = conf.getboolean("Parameters", "show_render_times", fallback=False)
             self.RIGHT_PANE_PERCENTAGE = int(conf.get("Parameters", "right_pane_percentage", fallback=25))
             self.ONE_TIMER_AT_A_TIME   = conf.getboolean("Parameters", "one_timer_at_a_time", fallback=False)
 
@@ -268,6 +286,26 @@ class Config:
             if self.ICS_TASK_FILES is not None:
                 self.ICS_TASK_FILES = [str(i) for i in self.ICS_TASK_FILES.split(",")]
 
+            self.ICS_PARSE_WORKERS  = int(conf.get("Parameters", "ics_parse_workers", fallback=0))
+            self.ICS_HORIZON_PAST   = int(conf.get("Parameters", "ics_horizon_past", fallback=0))
+            self.ICS_HORIZON_FUTURE = int(conf.get("Parameters", "ics_horizon_future", fallback=0))
+            self.ICS_EVENT_PRIORITY = conf.get("Parameters", "ics_event_priority", fallback="")
+            self.ICS_EVENT_PRIORITY = [int(i) for i in self.ICS_EVENT_PRIORITY.split(",") if i.strip()]
+
+            # Live connectors:
+            self.LIVE_CONNECTORS = conf.get("Parameters", "live_connectors", fallback="notion,mstodo")
+            self.LIVE_CONNECTORS = [i.strip() for i in self.LIVE_CONNECTORS.split(",") if i.strip()]
+            self.NOTION_REFRESH_MINUTES     = float(conf.get("Parameters", "notion_refresh_minutes", fallback=10))
+            self.NOTION_LOOKUP_WORKERS      = int(conf.get("Parameters", "notion_lookup_workers", fallback=8))
+            self.NOTION_CACHE_HOURS         = float(conf.get("Parameters", "notion_cache_hours", fallback=24))
+            self.NOTION_FULL_SYNC_HOURS     = float(conf.get("Parameters", "notion_full_sync_hours", fallback=6))
+            self.NOTION_REQUESTS_PER_SECOND = float(conf.get("Parameters", "notion_requests_per_second", fallback=3))
+            self.MSTODO_REFRESH_MINUTES     = float(conf.get("Parameters", "mstodo_refresh_minutes", fallback=5))
+            self.MSTODO_REQUESTS_PER_SECOND = float(conf.get("Parameters", "mstodo_requests_per_second", fallback=4))
+            self.HTTP_POOL_SIZE             = int(conf.get("Parameters", "http_pool_size", fallback=10))
+            self.HTTP_CONNECT_TIMEOUT       = float(conf.get("Parameters", "http_connect_timeout", fallback=5))
+            self.HTTP_READ_TIMEOUT          = float(conf.get("Parameters", "http_read_timeout", fallback=30))
+
             # Calendar colors:
             self.COLOR_TODAY           = int(conf.get("Colors", "color_today", fallback=2))
             self.COLOR_EVENTS          = int(conf.get("Colors", "color_events", fallback=4))
@@ -330,6 +368,7 @@ class Config:
                 self.ICONS = {word: icon for (word, icon) in conf.items("Event icons")}
             except configparser.NoSectionError:
                 self.ICONS = {}
+            self.ICON_MATCHER = IconMatcher(self.ICONS)
 
             self.data_folder = conf.get("Parameters", "folder_with_datafiles", fallback=self.config_folder)
             self.data_folder = Path(self.data_folder).expanduser()
@@ -8,6 +8,7 @@ import logging
 from cally.data import *
 from cally.dialogues import *
 from cally.configuration import Config
+from cally.state_store import get_state_store
 
 cf = Config()
 
@@ -345,11 +346,8 @@ def control_daily_screen(stdscr, screen, user_events, importer):
                     if screen.is_valid_day(day):
                         user_events.change_day(event_id, day)
 
-    # Otherwise, we check for user input:
+    # Otherwise, we check the key that the main loop read:
     else:
-        # Wait for user to press a key:
-        screen.key = stdscr.getkey()
-
         # If we need to select an event, change to selection mode:
         selection_keys = ['h', 'l', 'u', 'i', 'd', 'x', 'e', 'r', 'c', 'm', 'M', '.']
         if screen.key in selection_keys and user_events.filter_events_that_day(screen).items:
@@ -621,7 +619,7 @@ def control_weekly_screen(stdscr, screen, user_events, importer):
 
 
 @safe_run
-def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=None):
+def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=None, mstodo_saver=None):
     """Process user input on the journal screen"""
     # If we previously selected a task, now we perform the action:
     if screen.selection_mode:
@@ -781,6 +779,10 @@ def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=No
                                 debug_logger.log_error("NOTION_SYNC_ERROR", f"Failed to sync Notion status to Done: {e}", e)
                             except:
                                 pass
+
+                # Sync to Microsoft To Do if applicable
+                if hasattr(task, 'remote_id') and task.remote_id and task.source == "mstodo" and mstodo_saver:
+                    mstodo_saver.update_status(task.remote_id, "completed" if new_status == Status.DONE else "notStarted")
                 
                 user_tasks.changed = True
                 screen.refresh_now = True
@@ -852,14 +854,12 @@ def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=No
                     pass
                 
                 # Ask for confirmation
-                from cally.dialogues import ask_confirmation
-                from cally.translations.en import MSG_TS_DEL_ALL
                 confirmed = ask_confirmation(stdscr, f"Really delete task '{task_name}'? (y/n) ", cf.ASK_CONFIRMATIONS)
                 
                 if confirmed:
                     # Mark Notion tasks as deleted so they don't reload
                     if hasattr(task, 'notion_id') and task.notion_id:
-                        task._deleted = True
+                        get_state_store(cf).add_deleted_ids("notion", [task.notion_id])
                         try:
                             from cally.debug_logger import debug_logger
                             debug_logger.log_event("TASK_DELETE_NOTION", f"Marking Notion task {task.notion_id} as deleted")
@@ -954,8 +954,15 @@ def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=No
                 except:
                     pass
             # Don't process this key further
+            screen.journal_offset = 0
             return
-        
+
+        # Scroll long lists of tasks by pages:
+        if screen.key == "KEY_NPAGE":
+            screen.journal_offset += screen.journal_height
+        if screen.key == "KEY_PPAGE":
+            screen.journal_offset = max(screen.journal_offset - screen.journal_height, 0)
+
         # If we need to select a task, change to selection mode:
         # Note: 't' removed from selection_keys since it's now for creating tasks
         # Also: Don't set selection_mode if we're already in selection_mode (to avoid double prompts)
@@ -1035,10 +1042,7 @@ def control_journal_screen(stdscr, screen, user_tasks, importer, notion_saver=No
 
 @safe_run
 def control_help_screen(stdscr, screen):
-    """Process user input on the help screen"""
-    # Getting user's input:
-    screen.key = stdscr.getkey()
-
+    """Process user input on the help screen, the key was read by the main loop"""
     # Handle vim-style exit on "ZZ" and "ZQ":
     if vim_style_exit(stdscr, screen):
         confirmed = ask_confirmation(stdscr, MSG_EXIT, cf.ASK_CONFIRMATION_TO_QUIT)
@@ -1051,10 +1055,7 @@ def control_help_screen(stdscr, screen):
 
 @safe_run
 def control_welcome_screen(stdscr, screen):
-    """Process user input on the welcome screen"""
-    # Getting user's input:
-    screen.key = stdscr.getkey()
-
+    """Process user input on the welcome screen, the key was read by the main loop"""
     # Handle key to call help screen:
     if screen.key in ["?"]:
         screen.state = AppState.HELP
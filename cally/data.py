@@ -1,6 +1,8 @@
 """Module provides datatypes used in the program"""
 
+import collections
 import datetime
+import itertools
 import logging
 import time
 import enum
@@ -9,6 +11,59 @@ from dateutil.rrule import rruleset, rrulestr
 from cally.calendars import Calendar
 
 
+_local_timezone_cache = {}
+
+
+def get_local_timezone():
+    """Return the local timezone, which is recomputed at most once an hour to follow DST changes"""
+    hour = int(time.time() // 3600)
+    if hour not in _local_timezone_cache:
+        _local_timezone_cache.clear()
+        _local_timezone_cache[hour] = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
+    return _local_timezone_cache[hour]
+
+
+class RecurrenceCache:
+    """Least recently used cache of expanded recurring rules.
+    Keys describe the rule completely, so entries stay valid across data reloads"""
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()
+
+    def occurrences(self, event, rule_string, dtstart):
+        """Return dates of all repetitions of the event except the first one, or None if the rule is invalid"""
+        key = (event.uid or event.name, rule_string, dtstart, tuple(event.exdate or ()))
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        dates = self.expand(event, rule_string, dtstart)
+        self.entries[key] = dates
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return dates
+
+    def expand(self, event, rule_string, dtstart):
+        """Parse the rule and list dates of its repetitions"""
+        try:
+            rule = rrulestr(rule_string, dtstart=dtstart)
+        except ValueError as e:
+            logging.error("Problem occurred with event: '%s'.", event.name)
+            return None
+        rset = rruleset()
+        rset.rrule(rule)
+
+        if event.exdate:
+            for exdate in event.exdate:
+                exdate_dt = datetime.datetime.combine(exdate, datetime.time.min, tzinfo=dtstart.tzinfo) if not isinstance(exdate, datetime.datetime) else exdate
+                rset.exdate(exdate_dt)
+        return tuple(date.date() for date in list(rset)[1:])
+
+
+recurrence_cache = RecurrenceCache()
+
+
 class AppState(enum.Enum):
     """Possible focus states of the application"""
     CALENDAR = 1
@@ -45,7 +100,7 @@ class Frequency(enum.Enum):
 class Task:
     """Tasks created by the user"""
 
-    def __init__(self, item_id, name, status, timer, privacy, year=0, month=0, day=0, calendar_number=None, notion_id=None, project_name=None, notion_status_options=None, current_notion_status=None, is_header=False):
+    def __init__(self, item_id, name, status, timer, privacy, year=0, month=0, day=0, calendar_number=None, notion_id=None, project_name=None, notion_status_options=None, current_notion_status=None, is_header=False, source=None, remote_id=None):
         self.item_id = item_id
         self.name = name
         self.status = status
@@ -57,9 +112,11 @@ class Task:
         self.calendar_number = calendar_number
         self.notion_id = notion_id
         self.project_name = project_name
-        self.notion_status_options = notion_status_options or []
+        self.notion_status_options = notion_status_options or ()
         self.current_notion_status = current_notion_status
         self.is_header = is_header
+        self.source = source
+        self.remote_id = remote_id
 
 
 class Event:
@@ -76,7 +133,7 @@ class UserEvent(Event):
     """Events created by the user"""
 
     def __init__(self, item_id, year, month, day, name, repetition, frequency, status, privacy,
-                                                    calendar_number=None, hour=None, minute=None, end_hour=None, end_minute=None, rrule=None, exdate=None):
+                                                    calendar_number=None, hour=None, minute=None, end_hour=None, end_minute=None, rrule=None, exdate=None, uid=None):
         super().__init__(year, month, day, name)
         self.item_id = item_id
         self.repetition = repetition
@@ -90,10 +147,10 @@ class UserEvent(Event):
         self.end_minute = end_minute
         self.rrule = rrule
         self.exdate = exdate
+        self.uid = uid
 
     def getDatetime(self):
-        local_timezone = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
-        return datetime.datetime(self.year, self.month, self.day, self.hour or 0, self.minute or 0, tzinfo=local_timezone)
+        return datetime.datetime(self.year, self.month, self.day, self.hour or 0, self.minute or 0, tzinfo=get_local_timezone())
 
 
 class UserRepeatedEvent(Event):
@@ -153,18 +210,42 @@ class Timer:
         return time_string
 
 
+# Versions of collections are unique across all of them, so a new collection never repeats a version:
+collection_versions = itertools.count()
+
+
 class Collection:
     """Parent class for collections of items like tasks or events"""
 
     def __init__(self):
         self.items = []
+        self.version = next(collection_versions)
         self.changed = False
 
+    @property
+    def changed(self):
+        """Whether the collection has changes that are not saved yet"""
+        return self._changed
+
+    @changed.setter
+    def changed(self, value):
+        # Every change gives a new version, which tells views that their cached layouts are outdated:
+        if value:
+            self.version = next(collection_versions)
+        self._changed = value
+
+    @staticmethod
+    def is_valid_item(item):
+        """Check if the item has a name that can be shown"""
+        return 1000 > len(item.name) > 0 and item.name != r"\["
+
     def add_item(self, item):
-        """Add an item to the collection"""
-        if 1000 > len(item.name) > 0 and item.name != r"\[":
-            self.items.append(item)
-            self.changed = True
+        """Add an item to the collection, return True if it was valid and added"""
+        if not self.is_valid_item(item):
+            return False
+        self.items.append(item)
+        self.changed = True
+        return True
 
     def delete_item(self, selected_task_id):
         """Delete an item with provided id from the collection"""
@@ -262,6 +343,10 @@ class Collection:
 class Tasks(Collection):
     """List of tasks created by the user"""
 
+    def __init__(self):
+        super().__init__()
+        self.sorted_version = None  # Version of the list when it was last sorted by type
+
     @property
     def has_active_timer(self):
         for item in self.items:
@@ -270,18 +355,24 @@ class Tasks(Collection):
         return False
 
     def sort_by_type(self):
-        """Sort tasks: Local tasks first (preserving order), then Notion tasks"""
+        """Sort tasks: Local tasks first (preserving order), then Notion and other live tasks grouped by source"""
+        # Sorting is done every frame, but only new versions of the list need it:
+        if self.sorted_version == self.version:
+            return
         local_tasks = []
-        notion_tasks = []
+        live_tasks = {}
         
         for task in self.items:
             if (hasattr(task, 'notion_id') and task.notion_id) or (hasattr(task, 'is_header') and task.is_header):
-                notion_tasks.append(task)
+                live_tasks.setdefault(getattr(task, 'source', None) or "notion", []).append(task)
+            elif hasattr(task, 'source') and task.source:
+                live_tasks.setdefault(task.source, []).append(task)
             else:
                 local_tasks.append(task)
         
         # Reconstruct items list
-        self.items = local_tasks + notion_tasks
+        self.items = local_tasks + [task for tasks in live_tasks.values() for task in tasks]
+        self.sorted_version = self.version
 
     def add_subtask(self, task, number):
         """Add a subtask for certain task in the journal"""
@@ -411,30 +502,17 @@ class RepeatedEvents(Events):
                 dtstart = event.getDatetime()
 
                 # For infinitely repeated events, we limit them by end of the next year:
-                if 'COUNT' not in event.rrule and 'UNTIL' not in event.rrule:
+                rule_string = event.rrule
+                if 'COUNT' not in rule_string and 'UNTIL' not in rule_string:
                     until_year = current_year + 1
                     until_month = 12
-                    event.rrule += ';UNTIL=' + datetime.datetime(until_year, until_month, 1).strftime('%Y%m%dT%H%M%SZ')
-
-                # Create a list of dates of repeated events:
-                try:
-                    rule = rrulestr(event.rrule, dtstart=dtstart)
-                except ValueError as e:
-                    logging.error("Problem occurred with event: '%s'.", event.name)
-                    continue
-                rset = rruleset()
-                rset.rrule(rule)
-
-                if event.exdate:
-                    exdates_list = [event.exdate] if not isinstance(event.exdate, list) else event.exdate
-
-                    for exdates in exdates_list:
-                        for exdate in exdates.dts:
-                            exdate_dt = datetime.datetime.combine(exdate.dt, datetime.time.min, tzinfo=dtstart.tzinfo) if not isinstance(exdate.dt, datetime.datetime) else exdate.dt
-                            rset.exdate(exdate_dt)
+                    rule_string += ';UNTIL=' + datetime.datetime(until_year, until_month, 1).strftime('%Y%m%dT%H%M%SZ')
 
                 # Create an event for each repetition and add to the list:
-                for date in list(rset)[1:]:
+                dates = recurrence_cache.occurrences(event, rule_string, dtstart)
+                if dates is None:
+                    continue
+                for date in dates:
                     self.add_item(UserRepeatedEvent(event.item_id, date.year, date.month, date.day, event.name,
                                                     event.status, event.privacy, event.calendar_number))
 
@@ -158,7 +158,6 @@ def ask_confirmation(stdscr, question, confirmations_enabled):
     if not confirmations_enabled:
         return True
     y_max, _ = stdscr.getmaxyx()
-    curses.halfdelay(255)
     display_question(stdscr, y_max - 2, 0, question, Color.CONFIRMATIONS)
     key = stdscr.getkey()
     confirmed = (key == "y")
@@ -0,0 +1,111 @@
+"""Module that waits for keys, timers, and background workers, so the program sleeps while nothing happens"""
+
+import curses
+import math
+import os
+import select
+import signal
+import sys
+import time
+
+
+class EventLoop:
+    """Wait until a key is pressed, one of the timers is due, or a background thread calls wake().
+    Timers are kept by name with the moment each of them is due.
+    Where stdin can not be selected, as on Windows, keys are waited for with curses.halfdelay until the nearest timer"""
+
+    def __init__(self, dialog_delay=255):
+        self.dialog_delay = dialog_delay  # Tenths of a second that dialogs wait for keys
+        self.timers = {}
+        self.resized = False
+        self.uses_select = sys.platform != "win32"
+        self.wakeup_read, self.wakeup_write = None, None
+        if self.uses_select:
+            self.wakeup_read, self.wakeup_write = os.pipe()
+            os.set_blocking(self.wakeup_read, False)
+            os.set_blocking(self.wakeup_write, False)
+
+    def start(self):
+        """Wake up on resizes of the terminal, which curses would otherwise notice only at the next key"""
+        if self.uses_select and hasattr(signal, "SIGWINCH"):
+            signal.signal(signal.SIGWINCH, self.on_resize)
+
+    def wake(self):
+        """Make the loop run a frame, can be called from any thread"""
+        if self.wakeup_write is not None:
+            try:
+                os.write(self.wakeup_write, b"\0")
+            except BlockingIOError:
+                pass  # The pipe is full, so the loop wakes up anyway
+
+    def on_resize(self, signal_number, frame):
+        self.resized = True
+        self.wake()
+
+    def set_timer(self, name, due):
+        """Wake up at the time, in seconds since the epoch"""
+        self.timers[name] = due
+
+    def cancel_timer(self, name):
+        self.timers.pop(name, None)
+
+    def timeout(self):
+        """Seconds until the nearest timer is due, None if there are no timers"""
+        if not self.timers:
+            return None
+        return max(min(self.timers.values()) - time.time(), 0)
+
+    def wait_for_key(self, stdscr):
+        """Return the next key, or None if a timer or a background thread woke the loop up first"""
+        timeout = self.timeout()
+        if not self.uses_select:
+            curses.halfdelay(255 if timeout is None else min(max(math.ceil(timeout * 10), 1), 255))
+            try:
+                return self.read_key(stdscr)
+            finally:
+                curses.halfdelay(self.dialog_delay)
+
+        curses.cbreak()
+        stdscr.nodelay(True)
+        try:
+            # Curses may hold keys that it already read from stdin:
+            key = self.read_key(stdscr)
+            if key is None:
+                ready, _, _ = select.select([sys.stdin, self.wakeup_read], [], [], timeout)
+                if self.wakeup_read in ready:
+                    self.drain()
+                if sys.stdin in ready:
+                    key = self.read_key(stdscr)
+            if self.resized:
+                self.resized = False
+                resize_key = self.resize_screen()
+                key = key or resize_key
+        finally:
+            stdscr.nodelay(False)
+            curses.halfdelay(self.dialog_delay)
+        return key
+
+    @staticmethod
+    def resize_screen():
+        """Tell curses the new size of the terminal and return the key that curses uses for resizes"""
+        try:
+            columns, lines = os.get_terminal_size(sys.__stdout__.fileno())
+        except OSError:
+            return None
+        curses.resizeterm(lines, columns)
+        return "KEY_RESIZE"
+
+    @staticmethod
+    def read_key(stdscr):
+        try:
+            return stdscr.getkey()
+        except curses.error:
+            return None
+
+    def drain(self):
+        """Empty the wakeup pipe, one wakeup is enough for all calls of wake() so far"""
+        try:
+            while os.read(self.wakeup_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
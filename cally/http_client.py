@@ -0,0 +1,171 @@
+"""HTTP client shared by live connectors"""
+
+import collections
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class RateLimiter:
+    """Token bucket shared by all requests to one service.
+    Waiting requests of higher priority (lower number) get tokens first.
+    The bucket holds at least one token, so rates below one request per second still let requests through"""
+
+    WRITE = 0
+    READ = 1
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = max(burst or rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+        self.waiting = [0, 0]
+        self.condition = threading.Condition()
+        self.wait_times = [collections.deque(maxlen=1000), collections.deque(maxlen=1000)]
+
+    def set_rate(self, rate, burst=None):
+        """Change the rate, tokens gathered at the old rate are kept up to the new capacity"""
+        with self.condition:
+            self.refill(time.monotonic())
+            self.rate = rate
+            self.capacity = max(burst or rate, 1)
+            self.tokens = min(self.tokens, self.capacity)
+            self.condition.notify_all()
+
+    def refill(self, now):
+        """Add tokens for the time passed since the last refill"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority=READ):
+        """Wait until a request of this priority may be sent"""
+        start = time.monotonic()
+        with self.condition:
+            self.waiting[priority] += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    self.refill(now)
+                    is_preceded = any(self.waiting[:priority])
+                    if now >= self.blocked_until and self.tokens >= 1 and not is_preceded:
+                        self.tokens -= 1
+                        break
+                    timeout = max(self.blocked_until - now, (1 - self.tokens) / self.rate, 0.01)
+                    self.condition.wait(timeout)
+            finally:
+                self.waiting[priority] -= 1
+                self.condition.notify_all()
+        self.wait_times[priority].append(time.monotonic() - start)
+
+    def pause(self, seconds):
+        """Stop all requests for some time, as the service asked in Retry-After"""
+        with self.condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self.condition.notify_all()
+
+    def summary(self):
+        """Text with the number of requests and their waiting times for each priority"""
+        parts = []
+        for name, times in zip(["writes", "reads"], self.wait_times):
+            if not times:
+                continue
+            ordered = sorted(times)
+            median = ordered[len(ordered) // 2]
+            p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+            parts.append(f"{name}: {len(ordered)} waited median {median:.3f} s, p95 {p95:.3f} s, max {ordered[-1]:.3f} s")
+        return "; ".join(parts) or "no requests"
+
+
+def retry_after(response, default=1):
+    """Seconds to wait from the Retry-After header of a response"""
+    try:
+        return max(float(response.headers.get("Retry-After", default)), 0)
+    except ValueError:
+        return default
+
+
+class HttpClient:
+    """Session that keeps connections alive between requests of all live connectors"""
+
+    def __init__(self, pool_size=10, connect_timeout=5, read_timeout=30):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_throttled_retries = 3
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, limiter=None, priority=RateLimiter.READ, **kwargs):
+        """Send a request with the default timeout unless another one is given.
+        With a rate limiter, wait for a free slot and repeat throttled requests after the time the service asks"""
+        kwargs.setdefault("timeout", self.timeout)
+        retries = 0
+        while True:
+            if limiter is not None:
+                limiter.acquire(priority)
+            response = self.session.request(method, url, **kwargs)
+            if limiter is None or response.status_code != 429 or retries >= self.max_throttled_retries:
+                return response
+            delay = retry_after(response)
+            logging.warning("Request to %s was throttled, retrying in %s s.", url, delay)
+            limiter.pause(delay)
+            retries += 1
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
+
+
+# Global client instance and rate limiters of each service
+http_client = None
+rate_limiters = {}
+rate_limiters_lock = threading.Lock()
+
+def init_http_client(cf):
+    """Initialize the global client with parameters from the config"""
+    global http_client
+    http_client = HttpClient(cf.HTTP_POOL_SIZE, cf.HTTP_CONNECT_TIMEOUT, cf.HTTP_READ_TIMEOUT)
+    return http_client
+
+def get_http_client(cf):
+    """Get the global client, creating it on the first call"""
+    global http_client
+    if http_client is None:
+        http_client = init_http_client(cf)
+    return http_client
+
+def get_rate_limiter(service, rate):
+    """Get the rate limiter shared by all connectors of the service.
+    The rate is the one asked for last, so a changed config applies to requests of every connector"""
+    if rate <= 0:
+        logging.error("Rate of requests to %s must be positive, not %s. Using 1 request per second.", service, rate)
+        rate = 1
+    with rate_limiters_lock:
+        if service not in rate_limiters:
+            rate_limiters[service] = RateLimiter(rate)
+        elif rate_limiters[service].rate != rate:
+            rate_limiters[service].set_rate(rate)
+        return rate_limiters[service]
+
+def reset():
+    """Close the global client and forget rate limiters, so that the next connectors start afresh"""
+    global http_client
+    with rate_limiters_lock:
+        if http_client is not None:
+            http_client.close()
+        http_client = None
+        rate_limiters.clear()
@@ -0,0 +1,55 @@
+"""Module that selects icons of events and tasks by keywords in their names"""
+
+
+class IconMatcher:
+    """Table of keyword icons compiled once into an Aho-Corasick automaton, which finds all keywords
+    in a name in one pass over it. As in the loop over the table, the last keyword of the table
+    that is in the name wins. Icons are remembered for each name"""
+
+    def __init__(self, icons, max_size=4096):
+        self.icons = list(icons.values())
+        self.max_size = max_size
+        self.names = {}
+
+        # Trie of keywords, each state knows the last keyword of the table that ends in it:
+        self.transitions = [{}]
+        self.last_keyword = [-1]
+        for index, keyword in enumerate(icons):
+            state = 0
+            for char in keyword:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.last_keyword.append(-1)
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.last_keyword[state] = index
+
+        # Link states to their longest suffixes, so that keywords ending inside other keywords are found too:
+        self.fallbacks = [0] * len(self.transitions)
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            for char, next_state in self.transitions[state].items():
+                fallback = self.fallbacks[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fallbacks[fallback]
+                self.fallbacks[next_state] = self.transitions[fallback].get(char, 0)
+                fallback_keyword = self.last_keyword[self.fallbacks[next_state]]
+                self.last_keyword[next_state] = max(self.last_keyword[next_state], fallback_keyword)
+                queue.append(next_state)
+
+    def icon_for(self, name):
+        """Icon of the keyword found in the name, None if there is no keyword in it"""
+        if name in self.names:
+            return self.names[name]
+        state = 0
+        found = self.last_keyword[0]
+        for char in name.lower():
+            while state and char not in self.transitions[state]:
+                state = self.fallbacks[state]
+            state = self.transitions[state].get(char, 0)
+            found = max(found, self.last_keyword[state])
+        icon = self.icons[found] if found >= 0 else None
+        if len(self.names) >= self.max_size:
+            self.names.clear()
+        self.names[name] = icon
+        return icon
@@ -0,0 +1,63 @@
+"""Lines of the journal, so that views draw only the part of a long list of tasks that fits on the screen"""
+
+# Names of live sources in the titles of their sections:
+SOURCE_TITLES = {"notion": "Notion", "mstodo": "Microsoft To Do"}
+
+
+class JournalRows:
+    """Lines of the journal in the order they are shown, with the number of each task in selection mode.
+    Each row is (kind, text or task, number or None), where kind is title, message, blank, project, task, or ics_task.
+    Rows are built again only when versions of the tasks change"""
+
+    def __init__(self, user_tasks, user_ics_tasks):
+        self.key = self.make_key(user_tasks, user_ics_tasks)
+        self.rows = []
+
+        # Headers of projects belong to the live source of their tasks, tasks without a source come from Notion:
+        local_tasks = []
+        live_tasks = {}
+        for task in user_tasks.items:
+            if getattr(task, 'is_header', False) or getattr(task, 'notion_id', None) or getattr(task, 'source', None):
+                live_tasks.setdefault(getattr(task, 'source', None) or "notion", []).append(task)
+            else:
+                local_tasks.append(task)
+
+        number = 0
+        self.rows.append(("title", "━━━ Local Tasks ━━━", None))
+        for task in local_tasks:
+            number += 1
+            self.rows.append(("task", task, number))
+        if not local_tasks:
+            self.rows.append(("message", "  (no local tasks)", None))
+        self.rows.append(("blank", "", None))
+
+        if not live_tasks:
+            self.rows.append(("title", "━━━ Notion Tasks ━━━", None))
+            self.rows.append(("message", "  (no Notion tasks)", None))
+            self.rows.append(("blank", "", None))
+        for source, tasks in live_tasks.items():
+            self.rows.append(("title", f"━━━ {SOURCE_TITLES.get(source, source)} Tasks ━━━", None))
+            current_project = None
+            for task in tasks:
+                if getattr(task, 'is_header', False):
+                    self.rows.append(("project", f"  ━━ {getattr(task, 'project_name', None) or 'No Project'} ━━", None))
+                    current_project = getattr(task, 'project_name', None)
+                    continue
+                if hasattr(task, 'project_name') and task.project_name != current_project:
+                    current_project = task.project_name or "No Project"
+                    self.rows.append(("project", f"  ━━ {current_project} ━━", None))
+                number += 1
+                self.rows.append(("task", task, number))
+            self.rows.append(("blank", "", None))
+
+        for task in user_ics_tasks.items:
+            self.rows.append(("ics_task", task, None))
+
+    @staticmethod
+    def make_key(user_tasks, user_ics_tasks):
+        return user_tasks.version, user_ics_tasks.version
+
+    def visible(self, offset, height):
+        """Offset moved inside the list if needed and the rows that fit into the height from it"""
+        offset = max(min(offset, len(self.rows) - height), 0)
+        return offset, self.rows[offset:offset + height]
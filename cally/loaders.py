@@ -1,18 +1,26 @@
 """Module that controls loading data from files and libraries"""
 
+import collections
+import concurrent.futures
 import configparser
 import csv
+import itertools
 import os
 import datetime
 import icalendar
 import urllib.request
 import io
 import logging
+import zoneinfo
 
 from pathlib import Path
 
 from cally.data import *
 from cally.calendars import convert_to_persian_date
+from cally.caldav import CalDAVCollection, is_caldav_source
+from cally.http_client import get_http_client
+
+ICS_PARSE_CHUNK_SIZE = 500  # Events in each part of a large ics file that worker processes parse separately
 
 
 class LoaderCSV:
@@ -295,6 +303,37 @@ class BirthdayLoader:
 class LoaderICS:
     """Load data from ICS files"""
 
+    def init_caldav(self, cf):
+        """Prepare for remote sources. CalDAV collections and texts of the last downloads are kept between loads"""
+        self.cf = cf
+        self.caldav_collections = {}
+        self.remote_texts = {}  # Source -> list of texts of its ics files
+
+    def init_horizon(self, cf):
+        """Set the period outside of which data is discarded while parsing, zero means no limit"""
+        today = datetime.date.today()
+        self.horizon_start = today - datetime.timedelta(days=cf.ICS_HORIZON_PAST) if cf.ICS_HORIZON_PAST > 0 else None
+        self.horizon_end = today + datetime.timedelta(days=cf.ICS_HORIZON_FUTURE) if cf.ICS_HORIZON_FUTURE > 0 else None
+
+    @property
+    def horizon(self):
+        """Return the first and the last dates of the horizon, or None if it is not limited"""
+        if self.horizon_start is None and self.horizon_end is None:
+            return None
+        return self.horizon_start, self.horizon_end
+
+    def covers(self, first_day, last_day):
+        """Check if the period between two dates is inside the horizon"""
+        return ((self.horizon_start is None or first_day >= self.horizon_start)
+                and (self.horizon_end is None or last_day <= self.horizon_end))
+
+    def extend_horizon(self, first_day, last_day):
+        """Extend the horizon so that it includes the period between two dates"""
+        if self.horizon_start is not None:
+            self.horizon_start = min(self.horizon_start, first_day)
+        if self.horizon_end is not None:
+            self.horizon_end = max(self.horizon_end, last_day)
+
     def read_lines(self, file):
         """Read the file line-by-line and remove multiple PRODID lines"""
         already_has_prodid = False
@@ -330,14 +369,30 @@ class LoaderICS:
             logging.error("Failed to load from %s. Probably no internet connection. %s", path, e_message)
             return ""
 
-    def read_resource(self, path):
-        """Determine type of the resource, parse it, and return list of strings for each file"""
+    def read_caldav(self, path):
+        """Sync a CalDAV collection and return its cached calendars, even if the server is unreachable"""
+        collection = self.caldav_collections.get(path)
+        if collection is None:
+            collection = CalDAVCollection(path, Path(self.cf.config_folder) / "caldav", get_http_client(self.cf))
+            self.caldav_collections[path] = collection
+        collection.sync()
+        return [self.read_lines(io.StringIO(data)) for data in collection.calendars()]
+
+    def read_resource(self, path, reread_remote=True):
+        """Determine type of the resource, parse it, and return list of strings for each file.
+        Without rereading, remote sources return the texts of their last download"""
         ics_files = []
+        if not reread_remote and path in self.remote_texts:
+            return self.remote_texts[path]
+        if is_caldav_source(path):
+            self.remote_texts[path] = self.read_caldav(path)
+            return self.remote_texts[path]
         path = os.path.expanduser(path)
 
         # If it's a URL, try to load it:
         if path.startswith('http'):
             ics_files.append(self.read_url(path))
+            self.remote_texts[path] = ics_files
             return ics_files
 
         # If it's a local file, read it:
@@ -366,6 +421,8 @@ class TaskLoaderICS(LoaderICS):
         self.user_ics_tasks = Tasks()
         self.ics_task_files = cf.ICS_TASK_FILES
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
+        self.init_horizon(cf)
+        self.init_caldav(cf)
 
     def parse_task(self, component, calendar_number):
         """Parse single task and add it to the user_ics_tasks"""
@@ -398,6 +455,10 @@ class TaskLoaderICS(LoaderICS):
         except AttributeError:
             year, month, day = 0, 0, 0
 
+        # Skip completed tasks that were due outside of the horizon:
+        if status == Status.DONE and due_dt is not None and not date_in_horizon(due_dt, self.horizon):
+            return
+
         timer = Timer([])
         is_private = False
 
@@ -407,8 +468,8 @@ class TaskLoaderICS(LoaderICS):
         self.user_ics_tasks.add_item(new_task)
 
 
-    def load(self):
-        """Load tasks from each of the ics files"""
+    def load(self, reread_remote=True):
+        """Load tasks from each of the ics files, without downloading remote sources again if asked"""
 
         # Quit if the files are not specified in config:
         if self.ics_task_files is None:
@@ -417,7 +478,7 @@ class TaskLoaderICS(LoaderICS):
         self.user_ics_tasks.delete_all_items()
         for calendar_number, filename in enumerate(self.ics_task_files):
             # For each resource from config, load a list that has one or more ics files:
-            ics_files = self.read_resource(filename)
+            ics_files = self.read_resource(filename, reread_remote)
             for ics_file in ics_files:
                 try:
                     cal = icalendar.Calendar.from_ical(ics_file)
@@ -430,6 +491,215 @@ class TaskLoaderICS(LoaderICS):
         return self.user_ics_tasks
 
 
+class TimezoneCache:
+    """Convert datetimes of one feed to the local timezone. Zones defined by VTIMEZONE
+    components are slow to query, so their UTC offsets are computed once per hour of wall time"""
+
+    fast_timezones = (zoneinfo.ZoneInfo, datetime.timezone)
+
+    def __init__(self, local_timezone):
+        self.local_timezone = local_timezone
+        self.local_offset = local_timezone.utcoffset(None)
+        self.zones = {}
+
+    def to_local(self, dt):
+        """Return the datetime in local timezone, dates are returned as they are"""
+        if not hasattr(dt, "tzinfo"):
+            return dt
+        zone = dt.tzinfo
+        if zone is None or self.local_offset is None or isinstance(zone, self.fast_timezones):
+            return dt.astimezone(self.local_timezone)
+
+        # Find the shift for this hour of this zone, computing it only once:
+        if id(zone) not in self.zones:
+            self.zones[id(zone)] = (zone, {})
+        _, shifts = self.zones[id(zone)]
+        key = (dt.year, dt.month, dt.day, dt.hour, dt.fold)
+        shift = shifts.get(key)
+        if shift is None:
+            utc_offset = dt.utcoffset()
+            if utc_offset is None:
+                return dt.astimezone(self.local_timezone)
+            shift = shifts[key] = self.local_offset - utc_offset
+        return (dt.replace(tzinfo=None) + shift).replace(tzinfo=self.local_timezone)
+
+
+def as_date(value):
+    """Return the date of a date or a datetime"""
+    return value.date() if isinstance(value, datetime.datetime) else value
+
+
+def date_in_horizon(value, horizon):
+    """Check if the date is inside the horizon"""
+    if horizon is None:
+        return True
+    horizon_start, horizon_end = horizon
+    day = as_date(value)
+    return ((horizon_start is None or day >= horizon_start)
+            and (horizon_end is None or day <= horizon_end))
+
+
+def event_in_horizon(component, start, repetition, horizon):
+    """Check if the event or any of its repetitions may happen inside the horizon"""
+    if horizon is None or start is None:
+        return True
+    horizon_start, horizon_end = horizon
+    first_day = as_date(start)
+    if horizon_end is not None and first_day > horizon_end:
+        return False
+    if horizon_start is None:
+        return True
+
+    # Recurring events are kept unless their rule ends before the horizon:
+    if 'rrule' in component:
+        until = component.get('rrule').get('UNTIL')
+        if not until:
+            return True
+        last_day = as_date(until[0])
+    else:
+        last_day = first_day + datetime.timedelta(days=max(repetition, 1) - 1)
+    return last_day >= horizon_start
+
+
+ParsedEvent = collections.namedtuple("ParsedEvent", ["event_id", "year", "month", "day", "name", "repetition",
+                                                     "frequency", "hour", "minute", "rrule", "exdate", "uid",
+                                                     "recurrence_id"])
+
+
+def parse_recurrence_id(component):
+    """Moment of the occurrence that the event overrides, in UTC if it has a timezone,
+    so that the same occurrence written in different timezones gives the same key"""
+    if 'recurrence-id' not in component:
+        return None
+    recurrence_id = component.get('recurrence-id')
+    try:
+        moment = recurrence_id.dt
+    except (AttributeError, ValueError):
+        return recurrence_id.to_ical().decode('utf-8')
+    if isinstance(moment, datetime.datetime) and moment.tzinfo is not None:
+        return moment.astimezone(datetime.timezone.utc)
+    return moment
+
+
+def parse_event_component(component, index, timezone_cache, use_persian_calendar, horizon=None):
+    """Parse single VEVENT component into a compact tuple of its fields.
+    Return None if the event happens entirely outside of the horizon"""
+
+    # Default parameters:
+    hour = None
+    minute = None
+    repetition = 1
+    frequency = Frequency.ONCE
+    rrule = None
+    exdate = None
+
+    # Parameters of the event from ics file, if they exist:
+    name = str(component.get('summary', ''))
+    uid = str(component.get('uid')) if 'uid' in component else None
+    recurrence_id = parse_recurrence_id(component)
+    dt = None
+    try:
+        dt = timezone_cache.to_local(component.get('dtstart').dt)
+
+        year, month, day = dt.year, dt.month, dt.day
+    except AttributeError:
+        year, month, day = 0, 1, 1
+
+    # See if this event takes multiple days:
+    try:
+        dt_end = timezone_cache.to_local(component.get('dtend').dt)
+
+        # For events with time:
+        try:
+            dt_difference = dt_end.date() - dt.date()
+            if dt_difference.days > 0:
+                repetition = dt_difference.days + 1
+                frequency = Frequency.DAILY
+
+        # For all day events, last day does not count:
+        except:
+            dt_difference = dt_end - dt
+            if dt_difference.days > 0:
+                repetition = dt_difference.days
+                frequency = Frequency.DAILY
+
+        # Parsing recurring rules:
+        if 'rrule' in component:
+            rrule = component.get('rrule').to_ical().decode('utf-8')
+            exdate = parse_exdates(component.get('exdate'))
+            repetition = 0
+
+    except AttributeError:
+        logging.error("Failed to parse event %s on %s.", name, dt)
+
+    if not event_in_horizon(component, dt, repetition, horizon):
+        return None
+
+    # Add start time to non-all-day events:
+    all_day = component.get('dtstart').params.get('VALUE') == 'DATE' if component.get('dtstart') else False
+    if not all_day:
+        hour = dt.hour if dt else 0
+        minute = dt.minute if dt else 0
+
+    # Convert to persian date if needed:
+    if use_persian_calendar:
+        year, month, day = convert_to_persian_date(year, month, day)
+
+    return ParsedEvent(index, year, month, day, name, repetition, frequency, hour, minute, rrule, exdate, uid,
+                       recurrence_id)
+
+
+def parse_exdates(exdate):
+    """Flatten EXDATE properties into a tuple of dates, so they are cheap to pass between processes"""
+    if exdate is None:
+        return None
+    exdates_list = exdate if isinstance(exdate, list) else [exdate]
+    return tuple(item.dt for exdates in exdates_list for item in exdates.dts)
+
+
+def parse_ics_chunk(ics_file, first_index, local_timezone, use_persian_calendar, horizon):
+    """Parse all events of an ics text. Runs in worker processes, so it returns plain tuples"""
+    try:
+        cal = icalendar.Calendar.from_ical(ics_file)
+        timezone_cache = TimezoneCache(local_timezone)
+        index = first_index
+        events = []
+        for component in cal.walk():
+            if component.name == 'VEVENT':
+                index += 1
+                parsed = parse_event_component(component, index, timezone_cache, use_persian_calendar, horizon)
+                if parsed is not None:
+                    events.append(parsed)
+        return events, None
+    except Exception as e_message:
+        return [], str(e_message)
+
+
+def split_ics_text(ics_file, chunk_size):
+    """Split the text of a large ics file into several valid calendars with at most chunk_size events each.
+    Every chunk keeps all other components (like VTIMEZONE) so it can be parsed on its own"""
+    shared_lines = []
+    events = []
+    current_event = None
+    for line in ics_file.splitlines(keepends=True):
+        if line.startswith("BEGIN:VEVENT"):
+            current_event = [line]
+        elif current_event is not None:
+            current_event.append(line)
+            if line.startswith("END:VEVENT"):
+                events.append("".join(current_event))
+                current_event = None
+        elif not line.startswith("END:VCALENDAR"):
+            shared_lines.append(line)
+
+    if len(events) <= chunk_size:
+        return [(ics_file, 0)]
+
+    shared_text = "".join(shared_lines)
+    return [(shared_text + "".join(events[start:start + chunk_size]) + "END:VCALENDAR\n", start)
+            for start in range(0, len(events), chunk_size)]
+
+
 class EventLoaderICS(LoaderICS):
     """Load events from ICS files"""
 
@@ -437,101 +707,122 @@ class EventLoaderICS(LoaderICS):
         self.user_ics_events = Events()
         self.ics_event_files = cf.ICS_EVENT_FILES
         self.use_persian_calendar = cf.USE_PERSIAN_CALENDAR
-        self.local_timezone = datetime.datetime.now(datetime.timezone.utc).astimezone().tzinfo
-
-    def parse_event(self, component, index, calendar_number):
-        """Parse single event and add it to user_ics_events"""
+        self.local_timezone = get_local_timezone()
+        self.parse_workers = cf.ICS_PARSE_WORKERS
+        self.chunk_size = ICS_PARSE_CHUNK_SIZE
+        self.init_horizon(cf)
+        self.init_caldav(cf)
+
+        # Sources listed in the priority option go first, the rest keep the order of the config:
+        priority = [number - 1 for number in cf.ICS_EVENT_PRIORITY]
+        self.source_ranks = {number: rank for rank, number in enumerate(priority)}
+        self.merged_events = {}
+        self.duplicate_count = 0
+
+    def source_rank(self, calendar_number):
+        """Position of the source in the priority list, lower rank wins"""
+        return self.source_ranks.get(calendar_number, len(self.source_ranks) + calendar_number)
+
+    def reset_merge(self):
+        """Forget events seen so far before a new load"""
+        self.user_ics_events.delete_all_items()
+        self.merged_events = {}
+        self.duplicate_count = 0
+
+    def add_parsed_event(self, parsed, calendar_number):
+        """Create an event from its parsed fields and add it to user_ics_events.
+        Copies of the same event from several sources are merged into one from the preferred source"""
+        if parsed.uid is not None:
+            key = (parsed.uid, parsed.recurrence_id)
+        else:
+            key = (parsed.name, parsed.year, parsed.month, parsed.day, parsed.hour, parsed.minute)
+        merged = self.merged_events.get(key)
+        if merged is not None:
+            self.duplicate_count += 1
+            position, merged_calendar_number = merged
+            if self.source_rank(calendar_number) >= self.source_rank(merged_calendar_number):
+                return
 
-        # Default parameters:
-        hour = None
-        minute = None
-        event_id = index
-        repetition = 1
-        frequency = Frequency.ONCE
         status = Status.NORMAL
         is_private = False
-        rrule = None
-        exdate = None
 
-        # Parameters of the event from ics file, if they exist:
-        name = str(component.get('summary', ''))
-        dt = None
-        try:
-            dt = component.get('dtstart').dt
-
-            # Convert to local timezone if it's provided:
-            if hasattr(dt, "tzinfo"):
-                dt = dt.astimezone(self.local_timezone)
-
-            year, month, day = dt.year, dt.month, dt.day
-        except AttributeError:
-            year, month, day = 0, 1, 1
-        
         # Log event details for debugging (INFO level so it shows up)
         try:
             from cally.debug_logger import get_debug_logger
             logger = get_debug_logger()
-            logger.logger.info(f"ICS Event {index}: '{name}' on {year}/{month}/{day} (calendar {calendar_number})")
+            logger.logger.info(f"ICS Event {parsed.event_id}: '{parsed.name}' on {parsed.year}/{parsed.month}/{parsed.day} (calendar {calendar_number})")
         except Exception as e:
             # Log to standard logging if debug_logger fails
-            logging.debug(f"ICS Event {index}: '{name}' on {year}/{month}/{day} (calendar {calendar_number})")
+            logging.debug(f"ICS Event {parsed.event_id}: '{parsed.name}' on {parsed.year}/{parsed.month}/{parsed.day} (calendar {calendar_number})")
             logging.debug(f"Debug logger import failed: {e}")
 
-        # See if this event takes multiple days:
-        try:
-            dt_end = component.get('dtend').dt
-
-            # Convert to local timezone if it's provided:
-            if hasattr(dt_end, "tzinfo"):
-                dt_end = dt_end.astimezone(self.local_timezone)
-
-            # For events with time:
-            try:
-                dt_difference = dt_end.date() - dt.date()
-                if dt_difference.days > 0:
-                    repetition = dt_difference.days + 1
-                    frequency = Frequency.DAILY
-
-            # For all day events, last day does not count:
-            except:
-                dt_difference = dt_end - dt
-                if dt_difference.days > 0:
-                    repetition = dt_difference.days
-                    frequency = Frequency.DAILY
-
-            # Parsing recurring rules:
-            if 'rrule' in component:
-                rrule = component.get('rrule').to_ical().decode('utf-8')
-                exdate = component.get('exdate')
-                repetition = 0
-
-        except AttributeError:
-            logging.error("Failed to parse event %s on %s.", name, dt)
-            pass
-
-        # Add start time to non-all-day events:
-        all_day = component.get('dtstart').params.get('VALUE') == 'DATE' if component.get('dtstart') else False
-        if not all_day:
-            hour = dt.hour if dt else 0
-            minute = dt.minute if dt else 0
-
-        # Convert to persian date if needed:
-        if self.use_persian_calendar:
-            year, month, day = convert_to_persian_date(year, month, day)
-
         # Add event:
-        new_event = UserEvent(event_id, year, month, day, name, repetition, frequency,
-                              status, is_private, calendar_number, hour, minute, rrule, exdate)
-        self.user_ics_events.add_item(new_event)
+        new_event = UserEvent(parsed.event_id, parsed.year, parsed.month, parsed.day, parsed.name,
+                              parsed.repetition, parsed.frequency, status, is_private, calendar_number,
+                              parsed.hour, parsed.minute, rrule=parsed.rrule, exdate=parsed.exdate, uid=parsed.uid)
+        if merged is not None:
+            self.user_ics_events.items[position] = new_event
+            self.merged_events[key] = (position, calendar_number)
+            return
+        if self.user_ics_events.add_item(new_event):
+            self.merged_events[key] = (len(self.user_ics_events.items) - 1, calendar_number)
 
-    def load(self):
-        """Load events from each of the ics files"""
+    def log_parse_error(self, filename, e_message):
+        """Report that one of the ics files failed to parse"""
+        logging.error("Failed to parse %s. %s", filename, e_message)
+        try:
+            from cally.debug_logger import get_debug_logger
+            logger = get_debug_logger()
+            logger.log_error("ICS_PARSE_ERROR", f"Failed to parse {filename}: {e_message}", e_message)
+        except Exception as e:
+            logging.error(f"[ICS_PARSE_ERROR] Failed to parse {filename}: {e_message}")
+            logging.debug(f"Debug logger import failed: {e}")
+
+    def parse_files(self, ics_files):
+        """Parse ics files of one resource in this process, return parsed events and the error of each file"""
+        return [parse_ics_chunk(ics_file, 0, self.local_timezone, self.use_persian_calendar, self.horizon)
+                for ics_file in ics_files]
+
+    def parse_files_in_parallel(self, resources):
+        """Parse ics files of all resources in a pool of processes, splitting large files into chunks.
+        Return parsed events and the first error of each file of each resource, as parse_files does"""
+        jobs = []
+        for resource_number, (_, _, ics_files) in enumerate(resources):
+            for file_number, ics_file in enumerate(ics_files):
+                for chunk, first_index in split_ics_text(ics_file, self.chunk_size):
+                    jobs.append((resource_number, file_number, chunk, first_index))
+
+        events = [[[] for _ in ics_files] for _, _, ics_files in resources]
+        errors = [[None for _ in ics_files] for _, _, ics_files in resources]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+            results = executor.map(parse_ics_chunk,
+                                   [job[2] for job in jobs],
+                                   [job[3] for job in jobs],
+                                   itertools.repeat(self.local_timezone),
+                                   itertools.repeat(self.use_persian_calendar),
+                                   itertools.repeat(self.horizon))
+            for (resource_number, file_number, _, _), (parsed_events, error) in zip(jobs, results):
+                events[resource_number][file_number].extend(parsed_events)
+                errors[resource_number][file_number] = errors[resource_number][file_number] or error
+        return [list(zip(file_events, file_errors)) for file_events, file_errors in zip(events, errors)]
+
+    def add_parsed_files(self, parsed_files, filename, calendar_number):
+        """Add events of the parsed ics files of one resource, a file with an error is skipped as a whole"""
+        for parsed_events, error in parsed_files:
+            if error is not None:
+                self.log_parse_error(filename, error)
+                continue
+            for parsed in parsed_events:
+                self.add_parsed_event(parsed, calendar_number)
+
+    def load(self, reread_remote=True):
+        """Load events from each of the ics files, without downloading remote sources again if asked"""
 
         # Quit if the files are not specified in config:
         if self.ics_event_files is None:
             return self.user_ics_events
 
-        self.user_ics_events.delete_all_items()
+        self.reset_merge()
         try:
             from cally.debug_logger import get_debug_logger
             logger = get_debug_logger()
@@ -539,7 +830,9 @@ class EventLoaderICS(LoaderICS):
         except Exception as e:
             logging.info(f"[ICS_LOAD_START] Loading ICS events from {len(self.ics_event_files)} source(s)")
             logging.debug(f"Debug logger import failed: {e}")
-        
+
+        # For each resource from config, load a list that has one or more ics files:
+        resources = []
         for calendar_number, filename in enumerate(self.ics_event_files):
             try:
                 from cally.debug_logger import get_debug_logger
@@ -548,29 +841,23 @@ class EventLoaderICS(LoaderICS):
             except Exception as e:
                 logging.info(f"[ICS_SOURCE] Loading from source {calendar_number+1}: {filename}")
                 logging.debug(f"Debug logger import failed: {e}")
+            resources.append((calendar_number, filename, self.read_resource(filename, reread_remote)))
 
-            # For each resource from config, load a list that has one or more ics files:
-            ics_files = self.read_resource(filename)
-            event_count_before = len(self.user_ics_events.items)
-            for ics_file in ics_files:
-                try:
-                    cal = icalendar.Calendar.from_ical(ics_file)
-                    index = 0
-                    for component in cal.walk():
-                        if component.name == 'VEVENT':
-                            index += 1
-                            self.parse_event(component, index, calendar_number)
+        # Spread parsing over several processes if the user enabled it:
+        parsed_resources = None
+        if self.parse_workers > 1:
+            try:
+                parsed_resources = self.parse_files_in_parallel(resources)
+            except (OSError, concurrent.futures.process.BrokenProcessPool) as e_message:
+                logging.warning("Parallel parsing of ics files failed, parsing them one by one. %s", e_message)
 
-                except Exception as e_message:
-                    logging.error("Failed to parse %s. %s", filename, e_message)
-                    try:
-                        from cally.debug_logger import get_debug_logger
-                        logger = get_debug_logger()
-                        logger.log_error("ICS_PARSE_ERROR", f"Failed to parse {filename}: {e_message}", e_message)
-                    except Exception as e:
-                        logging.error(f"[ICS_PARSE_ERROR] Failed to parse {filename}: {e_message}")
-                        logging.debug(f"Debug logger import failed: {e}")
-            
+        for resource_number, (calendar_number, filename, ics_files) in enumerate(resources):
+            if parsed_resources is not None:
+                parsed_files = parsed_resources[resource_number]
+            else:
+                parsed_files = self.parse_files(ics_files)
+            event_count_before = len(self.user_ics_events.items)
+            self.add_parsed_files(parsed_files, filename, calendar_number)
             event_count_after = len(self.user_ics_events.items)
             events_added = event_count_after - event_count_before
             try:
@@ -580,12 +867,12 @@ class EventLoaderICS(LoaderICS):
             except Exception as e:
                 logging.info(f"[ICS_SOURCE_COMPLETE] Source {calendar_number+1} ({filename}): Added {events_added} events")
                 logging.debug(f"Debug logger import failed: {e}")
-        
+
         try:
             from cally.debug_logger import get_debug_logger
             logger = get_debug_logger()
-            logger.log_event("ICS_LOAD_COMPLETE", f"Total ICS events loaded: {len(self.user_ics_events.items)}")
+            logger.log_event("ICS_LOAD_COMPLETE", f"Total ICS events loaded: {len(self.user_ics_events.items)}, duplicates merged: {self.duplicate_count}")
         except Exception as e:
-            logging.info(f"[ICS_LOAD_COMPLETE] Total ICS events loaded: {len(self.user_ics_events.items)}")
+            logging.info(f"[ICS_LOAD_COMPLETE] Total ICS events loaded: {len(self.user_ics_events.items)}, duplicates merged: {self.duplicate_count}")
             logging.debug(f"Debug logger import failed: {e}")
         return self.user_ics_events
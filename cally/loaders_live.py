@@ -1,109 +1,408 @@
+import concurrent.futures
+import datetime
+import logging
 import os
-import requests
+import queue
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
 from cally.data import Task, Status, Timer
+from cally.http_client import get_http_client, get_rate_limiter, RateLimiter
+from cally.state_store import get_state_store
+
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_PAGE_SIZE = 100
+MSTODO_API_URL = "https://graph.microsoft.com/v1.0"
+MSTODO_PAGE_SIZE = 100
+
+# Marks that tasks loaded before are outdated and should be replaced by the following ones:
+REPLACE_TASKS = "REPLACE_TASKS"
+
+class PersistentCache:
+    """Dictionary kept in the state store, whose entries expire after ttl seconds"""
+
+    def __init__(self, store, namespace, ttl):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.entries = {}
+        self.changed = {}
+        self.removed = set()
+        self.load()
+
+    def load(self):
+        """Read entries that did not expire yet"""
+        if self.ttl > 0:
+            self.entries = self.store.cached(self.namespace, self.ttl)
+
+    def get(self, key, default=None):
+        """Return the value if it is cached and fresh"""
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            return default
+        return entry[0]
+
+    def set(self, key, value):
+        """Remember the value with the current time"""
+        self.entries[key] = [value, time.time()]
+        self.changed[key] = value
+        self.removed.discard(key)
+
+    def delete(self, key):
+        """Forget the entry if there is one"""
+        self.entries.pop(key, None)
+        self.changed.pop(key, None)
+        self.removed.add(key)
+
+    def prune(self, keep):
+        """Forget all entries except the ones to keep"""
+        self.entries = {key: entry for key, entry in self.entries.items() if key in keep}
+        self.changed = {key: value for key, value in self.changed.items() if key in keep}
+        self.store.prune_cached(self.namespace, keep)
+
+    def save(self):
+        """Write entries that changed since the last save"""
+        if self.ttl > 0:
+            self.store.set_cached(self.namespace, self.changed)
+            self.store.delete_cached(self.namespace, self.removed)
+        self.changed = {}
+        self.removed = set()
+
+
+def notion_timestamp(seconds):
+    """Time in the format of last_edited_time of Notion pages"""
+    moment = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def freeze_status_options(options):
+    """Read-only status options shared by all tasks of the database"""
+    return tuple(MappingProxyType(dict(option)) for option in options)
+
+
+def notion_headers(token):
+    """Headers sent with every request to Notion"""
+    return {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Notion-Version": "2022-06-28"
+    }
+
+
+def graph_headers(token):
+    """Headers sent with every request to Microsoft Graph"""
+    return {
+        "Authorization": f"Bearer {token}",
+        "Prefer": f"odata.maxpagesize={MSTODO_PAGE_SIZE}"
+    }
+
 
 class LiveLoader:
-    """Base class for live data connectors"""
+    """Base class for live data connectors.
+    Each connector declares how often it is refreshed, how many threads it may use, and if it syncs incrementally"""
+    name = None
+    refresh_interval = 0  # seconds between background refreshes, 0 to refresh only on demand
+    max_workers = 1
+    supports_incremental = False
+
+    def is_configured(self):
+        """Check if the connector has everything it needs to connect"""
+        return False
+
+    def load_pages(self):
+        """Yield lists of tasks as they arrive, REPLACE_TASKS means that tasks yielded before are outdated"""
+        yield self.load()
+
     def load(self):
         raise NotImplementedError
 
 class NotionTaskLoader(LiveLoader):
     """Load tasks from Notion Database"""
+    name = "notion"
+    supports_incremental = True
+
     def __init__(self, cf):
         self.token = os.environ.get("NOTION_TOKEN")
         self.database_id = os.environ.get("NOTION_DATABASE_ID")
+        self.api_url = os.environ.get("NOTION_API_URL", NOTION_API_URL)
+        self.http = get_http_client(cf)
+        self.limiter = get_rate_limiter("notion", cf.NOTION_REQUESTS_PER_SECOND)
+        self.headers = notion_headers(self.token)
         self.target_person_id = None
         self.user_name_query = "Ethan Hitchcock" # User to filter by
-        self.status_options = []
+        self.status_options = ()
+        self.property_ids = {}
+        self.property_types = {}
+        self.store = get_state_store(cf)
+        self.schemas = PersistentCache(self.store, "notion_schema", cf.NOTION_CACHE_HOURS * 3600)
         self.project_cache = {}  # Cache project IDs to names
+        self.project_names = PersistentCache(self.store, "notion_projects", cf.NOTION_CACHE_HOURS * 3600)
+        self.user_ids = PersistentCache(self.store, "notion_users", cf.NOTION_CACHE_HOURS * 3600)
+        self.lookup_workers = max(cf.NOTION_LOOKUP_WORKERS, 1)
+        self.max_workers = self.lookup_workers
+        self.refresh_interval = cf.NOTION_REFRESH_MINUTES * 60
+        self.full_sync_interval = cf.NOTION_FULL_SYNC_HOURS * 3600
+        self.saved_records = {}
+        self.mirror = self.read_mirror()
+        self.query_failed = False
+
+    def is_configured(self):
+        return bool(self.token and self.database_id)
 
-    def fetch_status_options(self, headers):
-        """Fetch available status options from the database schema"""
-        url = f"https://api.notion.com/v1/databases/{self.database_id}"
+    def fetch_schema(self):
+        """Get property IDs, types, and status options of the database, from the cache if it is fresh"""
+        schema = self.schemas.get(self.database_id)
+        if schema is None:
+            schema = self.request_schema()
+            if schema is None:
+                return
+            self.schemas.set(self.database_id, schema)
+            self.schemas.save()
+        self.property_ids = {name: prop["id"] for name, prop in schema["properties"].items()}
+        self.property_types = {name: prop["type"] for name, prop in schema["properties"].items()}
+        self.status_options = freeze_status_options(schema["status_options"])
+
+    def request_schema(self):
+        """Fetch the database schema from Notion, return None if it failed"""
+        url = f"{self.api_url}/databases/{self.database_id}"
         try:
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
+            response = self.http.get(url, headers=self.headers, limiter=self.limiter)
+            if response.status_code != 200:
+                return None
+            properties = response.json().get("properties", {})
+        except Exception:
+            return None
+        options = []
+        status_prop = properties.get("Status", {})
+        # Handle 'status' type property, or 'select' type property if used for status
+        if status_prop.get("type") in ["status", "select"]:
+            options = status_prop.get(status_prop["type"], {}).get("options", [])
+        return {
+            "properties": {name: {"id": prop.get("id"), "type": prop.get("type")} for name, prop in properties.items()},
+            "status_options": [{"name": opt.get("name"), "id": opt.get("id")} for opt in options],
+        }
+
+    def forget_schema(self):
+        """Drop the cached schema, so that it is fetched again after the database was changed"""
+        self.schemas.delete(self.database_id)
+        self.schemas.save()
+
+    def fetch_target_person_id(self):
+        """Find the ID of the user to filter by, remembering it between launches"""
+        person_id = self.user_ids.get(self.user_name_query)
+        if person_id is not None:
+            return person_id
+
+        url = f"{self.api_url}/users"
+        params = {"page_size": NOTION_PAGE_SIZE}
+        try:
+            while True:
+                response = self.http.get(url, headers=self.headers, params=params, limiter=self.limiter)
+                if response.status_code != 200:
+                    return None
                 data = response.json()
-                status_prop = data.get("properties", {}).get("Status", {})
-                # Handle 'status' type property
-                if status_prop.get("type") == "status":
-                    status_config = status_prop.get("status", {})
-                    options = status_config.get("options", [])
-                    # Extract option names
-                    self.status_options = [{"name": opt.get("name"), "id": opt.get("id")} for opt in options]
-                # Handle 'select' type property if used for status
-                elif status_prop.get("type") == "select":
-                    select_config = status_prop.get("select", {})
-                    options = select_config.get("options", [])
-                    self.status_options = [{"name": opt.get("name"), "id": opt.get("id")} for opt in options]
+                for user in data.get("results", []):
+                    if user.get("name") == self.user_name_query:
+                        self.user_ids.set(self.user_name_query, user.get("id"))
+                        self.user_ids.save()
+                        return user.get("id")
+                if not data.get("has_more") or not data.get("next_cursor"):
+                    return None
+                params["start_cursor"] = data["next_cursor"]
         except Exception:
-            pass
+            return None
 
-    def fetch_project_name(self, project_id, headers):
-        """Fetch project name from Notion page"""
-        if project_id == "No Project":
-            return "No Project"
-        
-        # Check cache first
-        if project_id in self.project_cache:
-            return self.project_cache[project_id]
-        
+    def request_project_name(self, project_id):
+        """Fetch project name from Notion page, return None if it failed"""
         try:
-            url = f"https://api.notion.com/v1/pages/{project_id}"
-            response = requests.get(url, headers=headers)
+            url = f"{self.api_url}/pages/{project_id}"
+            response = self.http.get(url, headers=self.headers, limiter=self.limiter)
             if response.status_code == 200:
                 data = response.json()
                 # Get title from properties - try common title property names
                 props = data.get("properties", {})
                 
-                # Try "Name" first (most common)
-                if "Name" in props:
-                    title_prop = props["Name"].get("title", [])
+                # Try "Name" first (most common), then "Title", then any property with "title" type
+                title_props = [props[name] for name in ["Name", "Title"] if name in props]
+                title_props += [prop for prop in props.values() if prop.get("type") == "title"]
+                for prop_data in title_props:
+                    title_prop = prop_data.get("title", [])
                     if title_prop:
-                        project_name = title_prop[0].get("plain_text", project_id)
-                        self.project_cache[project_id] = project_name
-                        return project_name
-                
-                # Try "Title"
-                if "Title" in props:
-                    title_prop = props["Title"].get("title", [])
-                    if title_prop:
-                        project_name = title_prop[0].get("plain_text", project_id)
-                        self.project_cache[project_id] = project_name
-                        return project_name
-                
-                # Try any property with "title" type
-                for prop_name, prop_data in props.items():
-                    if prop_data.get("type") == "title":
-                        title_prop = prop_data.get("title", [])
-                        if title_prop:
-                            project_name = title_prop[0].get("plain_text", project_id)
-                            self.project_cache[project_id] = project_name
-                            return project_name
+                        return title_prop[0].get("plain_text", project_id)
                 
                 # Fallback: use page ID if no title found
-                self.project_cache[project_id] = project_id
                 return project_id
         except Exception:
             pass
+        return None
+
+    def fetch_project_name(self, project_id):
+        """Return project name from the cache or from Notion"""
+        if project_id == "No Project":
+            return "No Project"
         
-        # Fallback to ID if fetch fails
-        self.project_cache[project_id] = project_id
-        return project_id
+        # Check cache first
+        if project_id not in self.project_cache:
+            self.resolve_project_names([project_id])
+        return self.project_cache[project_id]
 
-    def load(self):
-        if not self.token or not self.database_id:
-            return []
-            
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
+    def resolve_project_names(self, project_ids):
+        """Fetch names of all projects missing from the caches concurrently"""
+        missing = []
+        for project_id in project_ids:
+            if project_id == "No Project" or project_id in self.project_cache or project_id in missing:
+                continue
+            cached_name = self.project_names.get(project_id)
+            if cached_name is not None:
+                self.project_cache[project_id] = cached_name
+            else:
+                missing.append(project_id)
+        if not missing:
+            return
+
+        workers = min(self.lookup_workers, len(missing))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            names = executor.map(self.request_project_name, missing)
+            for project_id, project_name in zip(missing, names):
+                # Fallback to ID if fetch fails, but only remember it until restart
+                self.project_cache[project_id] = project_name or project_id
+                if project_name is not None:
+                    self.project_names.set(project_id, project_name)
+        self.project_names.save()
+
+    def is_responsible(self, result):
+        """Check if the user is among responsible people of the page"""
+        responsible_list = result.get("properties", {}).get("Responsible", {}).get("people", [])
+        return any(person.get("name") == self.user_name_query or
+                   (self.target_person_id and person.get("id") == self.target_person_id)
+                   for person in responsible_list)
+
+    def project_id(self, result):
+        """ID of the first project related to the page"""
+        project_rels = result.get("properties", {}).get("Project", {}).get("relation", [])
+        return project_rels[0].get("id") if project_rels else "No Project"
+
+    def query_pages(self, payload):
+        """Query the database and yield its results page by page following next_cursor"""
+        url = f"{self.api_url}/databases/{self.database_id}/query"
+        payload = dict(payload, page_size=NOTION_PAGE_SIZE)
+
+        # Ask only for properties that are shown, if their IDs are known from the schema:
+        needed_properties = ["Task name", "Responsible", "Project", "Status"]
+        params = [("filter_properties", self.property_ids[name]) for name in needed_properties
+                  if self.property_ids.get(name)]
+        while True:
+            try:
+                response = self.http.post(url, headers=self.headers, params=params, json=payload,
+                                          limiter=self.limiter)
+            except Exception:
+                self.query_failed = True
+                return
+            if response.status_code != 200:
+                # Properties may have been renamed or removed, so the cached schema may be the cause:
+                logging.error("Notion query failed with status %s.", response.status_code)
+                self.query_failed = True
+                self.forget_schema()
+                return
+            data = response.json()
+            yield data.get("results", [])
+            if not data.get("has_more") or not data.get("next_cursor"):
+                return
+            payload["start_cursor"] = data["next_cursor"]
+
+    def make_record(self, result):
+        """Compact copy of the page fields shown in the journal, as stored in the mirror"""
+        props = result.get("properties", {})
+        task_name = "Untitled Task"
+        title_prop = props.get("Task name", {}).get("title", [])
+        if title_prop:
+            task_name = title_prop[0].get("plain_text", "Untitled Task")
+        project_id = self.project_id(result)
+        return {
+            "id": result.get("id"),
+            "name": task_name,
+            "project_id": project_id,
+            "project_name": self.fetch_project_name(project_id),
+            "status": (props.get("Status", {}).get("status") or {}).get("name"),
+            "last_edited_time": result.get("last_edited_time", ""),
         }
-        
-        # Fetch status options first
-        self.fetch_status_options(headers)
 
+    def is_open(self, result):
+        """Check if the page is a task that is still to be done"""
+        if result.get("archived") or result.get("in_trash"):
+            return False
+        status_name = (result.get("properties", {}).get("Status", {}).get("status") or {}).get("name")
+        return status_name not in ["Done", "Completed"]
+
+    def make_tasks(self, records, current_project_id=None):
+        """Create tasks with a header before each project, return them and the last project"""
+        tasks = []
+        for record in records:
+            project_name = record["project_name"]
+
+            # Insert Header if project changed
+            if record["project_id"] != current_project_id:
+                current_project_id = record["project_id"]
+                # Create a Header Task with actual project name
+                header_task = Task(0, project_name, Status.NORMAL, Timer([]), False, 
+                                 project_name=project_name, is_header=True, source=self.name)
+                tasks.append(header_task)
+
+            # Status
+            cally_status = Status.NORMAL
+            if record["status"] in ["High", "Urgent"]:
+                cally_status = Status.IMPORTANT
+
+            task = Task(0, record["name"], cally_status, Timer([]), False, 
+                        notion_id=record["id"], 
+                        project_name=project_name, 
+                        notion_status_options=self.status_options,
+                        current_notion_status=record["status"],
+                        source=self.name)
+            tasks.append(task)
+        return tasks, current_project_id
+
+    def mirror_tasks(self):
+        """Tasks of the mirror, grouped by project in the order the projects first appear"""
+        records = list(self.mirror["records"].values())
+        project_order = {project_id: position for position, project_id in enumerate(self.mirror["project_order"])}
+        for record in records:
+            project_order.setdefault(record["project_id"], len(project_order))
+        records.sort(key=lambda record: project_order[record["project_id"]])
+        return self.make_tasks(records)[0]
+
+    def read_mirror(self):
+        """Read tasks of the last sync, if they come from the same database and user"""
+        mirror = self.store.cursor(self.name)
+        if mirror is None or mirror.get("database_id") != self.database_id or mirror.get("user") != self.user_name_query:
+            return None
+        self.saved_records = self.store.records(self.name)
+        mirror["records"] = dict(self.saved_records)
+        return mirror
+
+    def save_mirror(self):
+        """Save the sync position and the records that changed, so that next launch can show tasks right away"""
+        records = self.mirror["records"]
+        changed = {page_id: record for page_id, record in records.items() if self.saved_records.get(page_id) != record}
+        removed = [page_id for page_id in self.saved_records if page_id not in records]
+        cursor = {key: value for key, value in self.mirror.items() if key != "records"}
+        try:
+            self.store.save_sync(self.name, cursor, changed, removed)
+        except sqlite3.Error as e_message:
+            logging.error("Failed to save Notion tasks. %s", e_message)
+            return
+        self.saved_records = dict(records)
+
+    def prune_state(self):
+        """Forget deleted tasks and projects that are no longer among the tasks of the user"""
+        records = self.mirror["records"]
+        self.store.prune_deleted_ids(self.name, set(records))
+        self.project_names.prune({record["project_id"] for record in records.values()})
+
+    def query_payload(self):
+        """Query of open tasks of the user sorted by project"""
         payload = {
             "filter": {
                 "and": [
@@ -129,87 +428,208 @@ class NotionTaskLoader(LiveLoader):
             ]
         }
 
-        url = f"https://api.notion.com/v1/databases/{self.database_id}/query"
-        
-        try:
-            response = requests.post(url, headers=headers, json=payload)
-        except Exception:
-            return []
-        
-        tasks = []
-        if response.status_code == 200:
-            data = response.json()
-            
-            current_project_id = None
+        # Let Notion drop tasks of other people, pages are still checked below in case the user was not found:
+        if self.target_person_id is not None:
+            payload["filter"]["and"].append({
+                "property": "Responsible",
+                "people": {
+                    "contains": self.target_person_id
+                }
+            })
+        return payload
+
+    def delta_payload(self):
+        """Query of all pages edited since the last sync.
+        People and status are checked locally, so tasks that were reassigned or finished are noticed too.
+        A full sync that found no tasks leaves no edit time, so then changes are asked for since it started"""
+        since = self.mirror["high_water_mark"] or notion_timestamp(self.mirror["full_sync_time"])
+        return {
+            "filter": {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {
+                    "on_or_after": since
+                }
+            }
+        }
+
+    def sync_changes(self):
+        """Merge pages edited since the last sync into the mirror, return True if anything changed"""
+        records = self.mirror["records"]
+        changed = False
+        for results in self.query_pages(self.delta_payload()):
+            self.resolve_project_names([self.project_id(r) for r in results
+                                        if self.is_responsible(r) and self.is_open(r)])
+            for result in results:
+                page_id = result.get("id")
+                if self.is_responsible(result) and self.is_open(result):
+                    record = self.make_record(result)
+                    changed = changed or records.get(page_id) != record
+                    records[page_id] = record
+                elif page_id in records:
+                    del records[page_id]
+                    changed = True
+                self.mirror["high_water_mark"] = max(self.mirror["high_water_mark"],
+                                                     result.get("last_edited_time", ""))
+        return changed
+
+    def load_pages(self):
+        """Yield lists of tasks page by page, so the first tasks can be shown before the whole database arrives.
+        REPLACE_TASKS means that tasks yielded before are outdated and the following ones replace them"""
+        if not self.token or not self.database_id:
+            return
             
-            for result in data.get("results", []):
-                props = result.get("properties", {})
-                
-                # 1. Filter by Responsible Person
-                responsible_list = props.get("Responsible", {}).get("people", [])
-                is_responsible = False
-                for person in responsible_list:
-                    if person.get("name") == self.user_name_query:
-                        is_responsible = True
-                        break
-                
-                if not is_responsible:
+        # Show tasks of the last sync right away:
+        if self.mirror is not None:
+            self.status_options = freeze_status_options(self.mirror["status_options"])
+            yield self.mirror_tasks()
+
+        # Get status options and the user to filter by first
+        self.fetch_schema()
+        if self.target_person_id is None:
+            self.target_person_id = self.fetch_target_person_id()
+        self.query_failed = False
+
+        # Ask only for pages edited since the last sync, but resync fully from time to time to notice deleted pages:
+        is_full_sync_due = self.mirror is None or time.time() - self.mirror["full_sync_time"] > self.full_sync_interval
+        if not is_full_sync_due:
+            if self.status_options:
+                self.mirror["status_options"] = [dict(option) for option in self.status_options]
+            if self.sync_changes():
+                yield REPLACE_TASKS
+                yield self.mirror_tasks()
+            if not self.query_failed:
+                self.save_mirror()
+            return
+
+        mirror = {"database_id": self.database_id, "user": self.user_name_query,
+                  "status_options": [dict(option) for option in self.status_options],
+                  "full_sync_time": time.time(), "high_water_mark": "", "project_order": [], "records": {}}
+
+        # Projects are sorted, so a project continues on the next page without a new header:
+        current_project_id = None
+        for results in self.query_pages(self.query_payload()):
+            self.resolve_project_names([self.project_id(r) for r in results if self.is_responsible(r)])
+            records = []
+            for result in results:
+                # Filter by Responsible Person
+                if not self.is_responsible(result):
                     continue
+                record = self.make_record(result)
+                records.append(record)
+                mirror["records"][record["id"]] = record
+                if record["project_id"] not in mirror["project_order"]:
+                    mirror["project_order"].append(record["project_id"])
+                mirror["high_water_mark"] = max(mirror["high_water_mark"], record["last_edited_time"])
 
-                # 2. Get Task Info
-                task_name = "Untitled Task"
-                title_prop = props.get("Task name", {}).get("title", [])
-                if title_prop:
-                    task_name = title_prop[0].get("plain_text", "Untitled Task")
+            # Stream pages only if there was nothing to show before:
+            if self.mirror is None:
+                tasks, current_project_id = self.make_tasks(records, current_project_id)
+                yield tasks
 
-                notion_id = result.get("id")
-                
-                # 3. Project Grouping - fetch project name
-                project_rels = props.get("Project", {}).get("relation", [])
-                project_id = project_rels[0].get("id") if project_rels else "No Project"
-                project_name = self.fetch_project_name(project_id, headers)
-                
-                # Insert Header if project changed
-                if project_id != current_project_id:
-                    current_project_id = project_id
-                    # Create a Header Task with actual project name
-                    header_task = Task(0, project_name, Status.NORMAL, Timer([]), False, 
-                                     project_name=project_name, is_header=True)
-                    tasks.append(header_task)
-
-                # Status
-                status_obj = props.get("Status", {}).get("status", {})
-                status_name = status_obj.get("name")
-                cally_status = Status.NORMAL
-                if status_name in ["High", "Urgent"]:
-                    cally_status = Status.IMPORTANT
-                
-                task = Task(0, task_name, cally_status, Timer([]), False, 
-                            notion_id=notion_id, 
-                            project_name=project_name, 
-                            notion_status_options=self.status_options,
-                            current_notion_status=status_name)
-                tasks.append(task)
-                
+        if self.query_failed:
+            return
+        had_mirror = self.mirror is not None
+        self.mirror = mirror
+        self.save_mirror()
+        self.prune_state()
+        if had_mirror:
+            yield REPLACE_TASKS
+            yield self.mirror_tasks()
+
+    def load(self):
+        """Load all tasks from the database"""
+        tasks = []
+        for page in self.load_pages():
+            tasks = [] if page is REPLACE_TASKS else tasks + page
         return tasks
 
-class NotionTaskSaver:
-    """Save updates back to Notion"""
-    def __init__(self):
-        self.token = os.environ.get("NOTION_TOKEN")
+class LiveSaver:
+    """Save updates back to a live source.
+    Changes wait in an outbox on disk and are sent by a background thread, so the interface never waits for them"""
+    def __init__(self, token, source, store):
+        self.token = token
+        self.source = source
+        self.store = store
+        self.retry_delay = 2  # seconds, doubled after each failure
+        self.max_retry_delay = 300
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopped = False
+        self.outbox = self.read_outbox()
+        self.worker = None
+        if self.token:
+            self.worker = threading.Thread(target=self.deliver_changes, daemon=True)
+            self.worker.start()
+
+    def read_outbox(self):
+        """Read changes that were not delivered before, they are due right away"""
+        outbox = self.store.outbox(self.source)
+        for entry in outbox.values():
+            entry["next_try"] = 0
+        return outbox
 
     def update_status(self, task_id, new_status_name):
-        """Update the status of a task in Notion"""
+        """Queue the new status of a task, replacing the one that was not sent yet"""
         if not self.token or not task_id:
             return
+        with self.lock:
+            self.outbox[task_id] = {"status": new_status_name, "attempts": 0, "next_try": time.time()}
+            self.store.put_outbox(self.source, task_id, self.outbox[task_id])
+        self.wakeup.set()
 
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Content-Type": "application/json",
-            "Notion-Version": "2022-06-28"
-        }
-        
-        url = f"https://api.notion.com/v1/pages/{task_id}"
+    def send_status(self, task_id, new_status_name):
+        """Update the status of a task in the source, return False if it should be tried again later"""
+        raise NotImplementedError
+
+    def deliver_changes(self):
+        """Send due changes from the outbox until stopped, retrying failures with growing delays"""
+        while not self.stopped:
+            self.wakeup.clear()
+            with self.lock:
+                now = time.time()
+                due = [(task_id, entry["status"]) for task_id, entry in self.outbox.items() if entry["next_try"] <= now]
+                next_try = min((entry["next_try"] for entry in self.outbox.values()), default=None)
+            if not due:
+                self.wakeup.wait(None if next_try is None else next_try - now)
+                continue
+
+            for task_id, status_name in due:
+                is_done = self.send_status(task_id, status_name)
+                with self.lock:
+                    entry = self.outbox.get(task_id)
+
+                    # Status changed while it was being sent, the new one goes next:
+                    if entry is None or entry["status"] != status_name:
+                        continue
+                    if is_done:
+                        del self.outbox[task_id]
+                        self.store.remove_outbox(self.source, task_id)
+                    else:
+                        entry["attempts"] += 1
+                        delay = min(self.retry_delay * 2 ** (entry["attempts"] - 1), self.max_retry_delay)
+                        entry["next_try"] = time.time() + delay
+                        self.store.put_outbox(self.source, task_id, entry)
+
+    def stop(self):
+        """Stop the background thread, undelivered changes stay in the store"""
+        self.stopped = True
+        self.wakeup.set()
+        if self.worker is not None:
+            self.worker.join(timeout=5)
+
+class NotionTaskSaver(LiveSaver):
+    """Save updates back to Notion"""
+    def __init__(self, cf):
+        self.api_url = os.environ.get("NOTION_API_URL", NOTION_API_URL)
+        self.http = get_http_client(cf)
+        self.limiter = get_rate_limiter("notion", cf.NOTION_REQUESTS_PER_SECOND)
+        token = os.environ.get("NOTION_TOKEN")
+        self.headers = notion_headers(token)
+        super().__init__(token, "notion", get_state_store(cf))
+
+    def send_status(self, task_id, new_status_name):
+        """Update the status of a task in Notion, return False if it should be tried again later"""
+        url = f"{self.api_url}/pages/{task_id}"
         
         payload = {
             "properties": {
@@ -222,11 +642,304 @@ class NotionTaskSaver:
         }
         
         try:
-            requests.patch(url, headers=headers, json=payload)
-        except Exception:
-            pass
+            response = self.http.patch(url, headers=self.headers, json=payload,
+                                       limiter=self.limiter, priority=RateLimiter.WRITE)
+        except Exception as e_message:
+            logging.warning("Failed to send status of Notion task %s, will retry. %s", task_id, e_message)
+            return False
+        if response.status_code == 429 or response.status_code >= 500:
+            logging.warning("Notion is unavailable (%s), will retry status of task %s.", response.status_code, task_id)
+            return False
+        if response.status_code != 200:
+            logging.error("Notion rejected status '%s' of task %s. %s", new_status_name, task_id, response.text[:200])
+        return True
+
 
 class MSTodoLoader(LiveLoader):
-    """Load tasks from Microsoft To Do"""
+    """Load tasks from Microsoft To Do.
+    The first sync pulls every list, later syncs follow Graph delta links and fetch only changed tasks"""
+    name = "mstodo"
+    supports_incremental = True
+
     def __init__(self, cf):
-        pass
+        self.token = os.environ.get("MSTODO_TOKEN")
+        self.api_url = os.environ.get("MSTODO_API_URL", MSTODO_API_URL)
+        self.http = get_http_client(cf)
+        self.limiter = get_rate_limiter("mstodo", cf.MSTODO_REQUESTS_PER_SECOND)
+        self.headers = graph_headers(self.token)
+        self.refresh_interval = cf.MSTODO_REFRESH_MINUTES * 60
+        self.store = get_state_store(cf)
+        self.saved_records = {}
+        self.mirror = self.read_mirror()
+        self.query_failed = False
+
+    def is_configured(self):
+        return bool(self.token)
+
+    def read_mirror(self):
+        """Read lists and delta links of the last sync with tasks of each list"""
+        cursor = self.store.cursor(self.name)
+        if cursor is None:
+            return None
+        lists = {list_id: dict(task_list, tasks={}) for list_id, task_list in cursor["lists"].items()}
+        self.saved_records = self.store.records(self.name)
+        for record in self.saved_records.values():
+            if record["list_id"] in lists:
+                lists[record["list_id"]]["tasks"][record["task_id"]] = {"name": record["name"],
+                                                                      "importance": record["importance"]}
+        return {"lists": lists}
+
+    def save_mirror(self):
+        """Save delta links and the tasks that changed, so that next sync asks only for changes"""
+        records = {f"{list_id}/{task_id}": dict(task, list_id=list_id, task_id=task_id)
+                   for list_id, task_list in self.mirror["lists"].items()
+                   for task_id, task in task_list["tasks"].items()}
+        changed = {record_id: record for record_id, record in records.items()
+                   if self.saved_records.get(record_id) != record}
+        removed = [record_id for record_id in self.saved_records if record_id not in records]
+        cursor = {"lists": {list_id: {"name": task_list["name"], "delta_link": task_list["delta_link"]}
+                            for list_id, task_list in self.mirror["lists"].items()}}
+        try:
+            self.store.save_sync(self.name, cursor, changed, removed)
+        except sqlite3.Error as e_message:
+            logging.error("Failed to save To Do tasks. %s", e_message)
+            return
+        self.saved_records = records
+
+    def get_pages(self, url):
+        """Yield responses following @odata.nextLink, set query_failed on error"""
+        while url:
+            try:
+                response = self.http.get(url, headers=self.headers, limiter=self.limiter)
+            except Exception:
+                self.query_failed = True
+                return
+            if response.status_code != 200:
+                self.query_failed = True
+                yield response
+                return
+            yield response
+            url = response.json().get("@odata.nextLink")
+
+    def fetch_lists(self):
+        """Names of all task lists by their IDs, None if they could not be fetched"""
+        lists = {}
+        for response in self.get_pages(f"{self.api_url}/me/todo/lists"):
+            if response.status_code != 200:
+                return None
+            for task_list in response.json().get("value", []):
+                lists[task_list["id"]] = task_list.get("displayName", "Untitled List")
+        return None if self.query_failed else lists
+
+    def sync_list(self, list_id, task_list):
+        """Apply changes of one list since its delta link, or pull it fully if there is none.
+        Return True if tasks changed, the list stays untouched if the sync failed"""
+        full_url = f"{self.api_url}/me/todo/lists/{list_id}/tasks/delta"
+        url = task_list.get("delta_link") or full_url
+        tasks = dict(task_list["tasks"]) if task_list.get("delta_link") else {}
+        delta_link = None
+        self.query_failed = False
+        for response in self.get_pages(url):
+            # Graph forgets delta links after a while, then the list is pulled again:
+            if response.status_code == 410 and url != full_url:
+                logging.warning("Delta link of To Do list %s expired, syncing it fully.", list_id)
+                task_list["delta_link"] = None
+                return self.sync_list(list_id, task_list)
+            if response.status_code != 200:
+                logging.error("To Do query failed with status %s.", response.status_code)
+                return False
+            data = response.json()
+            for item in data.get("value", []):
+                if "@removed" in item or item.get("status") == "completed":
+                    tasks.pop(item["id"], None)
+                else:
+                    tasks[item["id"]] = {"name": item.get("title") or "Untitled Task",
+                                         "importance": item.get("importance", "normal")}
+            delta_link = data.get("@odata.deltaLink", delta_link)
+        if self.query_failed:
+            return False
+        changed = tasks != task_list["tasks"]
+        task_list["tasks"] = tasks
+        task_list["delta_link"] = delta_link
+        return changed
+
+    def make_tasks(self, list_id, task_list):
+        """Create tasks of one list with its name as the header"""
+        list_name = task_list["name"]
+        tasks = [Task(0, list_name, Status.NORMAL, Timer([]), False,
+                      project_name=list_name, is_header=True, source=self.name)]
+        for task_id, record in task_list["tasks"].items():
+            cally_status = Status.IMPORTANT if record["importance"] == "high" else Status.NORMAL
+            tasks.append(Task(0, record["name"], cally_status, Timer([]), False, project_name=list_name,
+                              remote_id=f"lists/{list_id}/tasks/{task_id}", source=self.name))
+        return tasks
+
+    def mirror_tasks(self):
+        """Tasks of all lists in the mirror"""
+        tasks = []
+        for list_id, task_list in self.mirror["lists"].items():
+            if task_list["tasks"]:
+                tasks.extend(self.make_tasks(list_id, task_list))
+        return tasks
+
+    def load_pages(self):
+        """Yield tasks of the last sync first, then the current ones if anything changed.
+        Without a previous sync, tasks are yielded list by list as they arrive"""
+        if not self.token:
+            return
+        had_mirror = self.mirror is not None
+        if had_mirror:
+            yield self.mirror_tasks()
+        else:
+            self.mirror = {"lists": {}}
+
+        self.query_failed = False
+        list_names = self.fetch_lists()
+        if list_names is None:
+            return
+        old_lists = self.mirror["lists"]
+        changed = list(old_lists) != list(list_names)
+        lists = {}
+        for list_id, list_name in list_names.items():
+            task_list = old_lists.get(list_id) or {"delta_link": None, "tasks": {}}
+            changed = changed or task_list.get("name") != list_name
+            task_list["name"] = list_name
+            changed = self.sync_list(list_id, task_list) or changed
+            lists[list_id] = task_list
+            if not had_mirror and task_list["tasks"]:
+                yield self.make_tasks(list_id, task_list)
+
+        self.mirror["lists"] = lists
+        self.save_mirror()
+        if had_mirror and changed:
+            yield REPLACE_TASKS
+            yield self.mirror_tasks()
+
+    def load(self):
+        """Load all tasks from all lists"""
+        tasks = []
+        for page in self.load_pages():
+            tasks = [] if page is REPLACE_TASKS else tasks + page
+        return tasks
+
+
+class MSTodoTaskSaver(LiveSaver):
+    """Save updates back to Microsoft To Do"""
+    def __init__(self, cf):
+        self.api_url = os.environ.get("MSTODO_API_URL", MSTODO_API_URL)
+        self.http = get_http_client(cf)
+        self.limiter = get_rate_limiter("mstodo", cf.MSTODO_REQUESTS_PER_SECOND)
+        token = os.environ.get("MSTODO_TOKEN")
+        self.headers = graph_headers(token)
+        super().__init__(token, "mstodo", get_state_store(cf))
+
+    def send_status(self, task_id, new_status_name):
+        """Update the status of a task, whose ID is its path like lists/{list}/tasks/{task}"""
+        url = f"{self.api_url}/me/todo/{task_id}"
+        try:
+            response = self.http.patch(url, headers=self.headers, json={"status": new_status_name},
+                                       limiter=self.limiter, priority=RateLimiter.WRITE)
+        except Exception as e_message:
+            logging.warning("Failed to send status of To Do task %s, will retry. %s", task_id, e_message)
+            return False
+        if response.status_code == 429 or response.status_code >= 500:
+            logging.warning("To Do is unavailable (%s), will retry status of task %s.", response.status_code, task_id)
+            return False
+        if response.status_code != 200:
+            logging.error("To Do rejected status '%s' of task %s. %s", new_status_name, task_id, response.text[:200])
+        return True
+
+
+# Connectors that can be enabled with the live_connectors option:
+LIVE_CONNECTORS = {
+    NotionTaskLoader.name: NotionTaskLoader,
+    MSTodoLoader.name: MSTodoLoader,
+}
+
+
+def create_live_connectors(cf):
+    """Connectors enabled in the config that have what they need to connect"""
+    connectors = []
+    for name in cf.LIVE_CONNECTORS:
+        if name not in LIVE_CONNECTORS:
+            logging.error("Unknown live connector %s.", name)
+            continue
+        connector = LIVE_CONNECTORS[name](cf)
+        if connector.is_configured():
+            connectors.append(connector)
+    return connectors
+
+
+class LiveScheduler:
+    """Run each live connector in its own thread on its own cadence, so a slow source does not delay the others.
+    Tasks arrive in one queue as (connector name, tasks), every run starts with REPLACE_TASKS and ends with None"""
+    def __init__(self, connectors, wake=None):
+        self.connectors = connectors
+        self.wake = wake  # Called when tasks arrive, so the main loop does not have to poll the queue
+        self.pages_queue = queue.Queue()
+        self.stopped = False
+        self.wakeups = {connector.name: threading.Event() for connector in connectors}
+        self.pending_runs = 0  # runs requested whose end was not received yet
+        self.lock = threading.Lock()
+
+    @property
+    def is_loading(self):
+        return self.pending_runs > 0
+
+    def start(self):
+        """Start a thread for each connector, which loads its tasks right away"""
+        self.pending_runs = len(self.connectors)
+        for connector in self.connectors:
+            thread = threading.Thread(target=self.run_connector, args=(connector,), daemon=True,
+                                      name=f"live-{connector.name}")
+            thread.start()
+
+    def run_connector(self, connector):
+        """Load tasks of the connector each time it is due or a reload is requested"""
+        wakeup = self.wakeups[connector.name]
+        while not self.stopped:
+            self.put(connector.name, REPLACE_TASKS)
+            try:
+                for tasks in connector.load_pages():
+                    self.put(connector.name, tasks)
+            except Exception as e_message:
+                logging.error("Failed to load tasks from %s. %s", connector.name, e_message)
+            finally:
+                self.put(connector.name, None)
+            wakeup.wait(connector.refresh_interval or None)
+            with self.lock:
+                # Runs requested by reload are counted already:
+                if not wakeup.is_set():
+                    self.pending_runs += 1
+                wakeup.clear()
+
+    def put(self, name, tasks):
+        self.pages_queue.put((name, tasks))
+        if self.wake is not None:
+            self.wake()
+
+    def receive(self):
+        """Yield (connector name, tasks) that arrived so far, None as tasks marks the end of a run"""
+        while True:
+            try:
+                name, tasks = self.pages_queue.get_nowait()
+            except queue.Empty:
+                return
+            if tasks is None:
+                with self.lock:
+                    self.pending_runs -= 1
+            yield name, tasks
+
+    def reload(self):
+        """Refresh all connectors now"""
+        with self.lock:
+            for wakeup in self.wakeups.values():
+                if not wakeup.is_set():
+                    self.pending_runs += 1
+                    wakeup.set()
+
+    def stop(self):
+        """Let the threads finish after their current run"""
+        self.stopped = True
+        for wakeup in self.wakeups.values():
+            wakeup.set()
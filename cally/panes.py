@@ -0,0 +1,100 @@
+"""Module with curses windows of the parts of the screen, each drawn again only when what it shows changes"""
+
+import curses
+
+from cally.colors import Color
+from cally.data import AppState
+
+
+class Pane:
+    """Window covering a part of the screen.
+    Views draw on it with coordinates of the whole screen, the same way as on stdscr"""
+
+    def __init__(self):
+        self.window = None
+        self.geometry = None  # y, x, height, width
+        self.signature = None
+
+    @property
+    def is_visible(self):
+        return self.window is not None
+
+    def place(self, y, x, height, width):
+        """Move the pane or hide it if it has no size, return True if its place changed"""
+        geometry = (y, x, height, width) if height > 0 and width > 0 else None
+        if geometry == self.geometry:
+            return False
+        self.geometry = geometry
+        self.signature = None
+        self.window = None
+        if geometry is not None:
+            self.window = curses.newwin(height, width, y, x)
+            self.window.bkgd(" ", curses.color_pair(Color.EMPTY.value))
+        return True
+
+    def getmaxyx(self):
+        """Bottom right corner of the pane on the screen"""
+        y, x, height, width = self.geometry
+        return y + height, x + width
+
+    def addstr(self, y, x, text, attributes=0):
+        self.window.addstr(y - self.geometry[0], x - self.geometry[1], text, attributes)
+
+    def needs_drawing(self, signature):
+        """Check if the pane should show something else than it shows, and if so, clear it for drawing.
+        Signature is anything comparable that describes what the pane shows"""
+        if self.window is None or signature == self.signature:
+            return False
+        self.signature = signature
+        self.window.erase()
+        return True
+
+    def invalidate(self):
+        """Draw the pane next time, for example after another screen covered it"""
+        self.signature = None
+
+
+class ScreenPanes:
+    """Header and calendar on the left, journal on the right, and the footer with hints at the bottom"""
+
+    def __init__(self):
+        self.header = Pane()
+        self.calendar = Pane()
+        self.journal = Pane()
+        self.footer = Pane()
+        self.overlay = Pane()  # Render times, drawn over the other panes when they are shown
+
+    @property
+    def all(self):
+        return [self.header, self.calendar, self.journal, self.footer]
+
+    def arrange(self, screen):
+        """Place panes according to the size of the terminal and the split, return True if anything moved"""
+        y_max, x_max = screen.stdscr.getmaxyx()
+        if x_max < 40:
+            screen.split = False
+        shows_calendar = screen.split or screen.state == AppState.CALENDAR
+        shows_journal = screen.split or screen.state == AppState.JOURNAL
+        calendar_width = x_max - screen.journal_pane_width if screen.split else x_max
+        journal_x = calendar_width if screen.split else 0
+        body_height = max(y_max - 2, 0)
+        moved = [
+            self.header.place(0, 0, 1 if shows_calendar else 0, calendar_width),
+            self.calendar.place(1, 0, body_height - 1 if shows_calendar else 0, calendar_width),
+            self.journal.place(0, journal_x, body_height if shows_journal else 0, x_max - journal_x),
+            self.footer.place(body_height, 0, y_max - body_height, x_max),
+        ]
+        return any(moved)
+
+    def invalidate(self):
+        for pane in self.all:
+            pane.invalidate()
+
+    def update(self):
+        """Send changes of all panes to the terminal at once"""
+        for pane in self.all:
+            if pane.is_visible:
+                pane.window.noutrefresh()
+        if self.overlay.is_visible:
+            self.overlay.window.noutrefresh()
+        curses.doupdate()
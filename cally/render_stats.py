@@ -0,0 +1,69 @@
+"""Module that measures how long views take to draw, for the overlay and the log of render times"""
+
+import time
+from collections import deque
+
+
+class RenderStats:
+    """Render times of views and frames, and time from keys to the frame that shows their result.
+    Caches record whether each frame used them or built them again. Only the last frames are kept"""
+
+    def __init__(self, frames=100):
+        self.frames = frames
+        self.times = {}  # Name of a view or a frame measure -> seconds
+        self.caches = {}  # Name of a cache -> True where it was used
+        self.frame_count = 0
+        self.key_time = None
+
+    def measure(self, name, function):
+        """Call the function and record how long it took"""
+        start = time.perf_counter()
+        function()
+        self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.times.setdefault(name, deque(maxlen=self.frames)).append(seconds)
+
+    def count(self, cache, is_hit):
+        self.caches.setdefault(cache, deque(maxlen=self.frames)).append(is_hit)
+
+    def key_pressed(self):
+        """Start to measure the latency from this key to the frame that shows its result"""
+        self.key_time = time.perf_counter()
+
+    def frame_done(self, start):
+        """Record the time of the frame that started at the moment, and the latency of the key it answers"""
+        end = time.perf_counter()
+        self.add("frame", end - start)
+        if self.key_time is not None:
+            self.add("input", end - self.key_time)
+            self.key_time = None
+        self.frame_count += 1
+
+    @property
+    def is_time_to_log(self):
+        return self.frame_count % self.frames == 0
+
+    @staticmethod
+    def percentile(values, share):
+        """Value that the share of values does not exceed, by the nearest rank"""
+        ordered = sorted(values)
+        return ordered[min(int(share * len(ordered)), len(ordered) - 1)]
+
+    def lines(self):
+        """Lines with percentiles of times in milliseconds and hit rates of caches"""
+        lines = [f"{'':18} {'p50':>6} {'p95':>6} {'max':>6} ms"]
+        for name, values in self.times.items():
+            p50, p95 = self.percentile(values, 0.5) * 1000, self.percentile(values, 0.95) * 1000
+            lines.append(f"{name[:18]:18} {p50:6.1f} {p95:6.1f} {max(values) * 1000:6.1f}")
+        for cache, hits in self.caches.items():
+            lines.append(f"{cache[:18]:18} {100 * sum(hits) / len(hits):6.0f}% hits")
+        return lines
+
+    def summary(self):
+        """One line of all measures for the log"""
+        times = ", ".join(f"{name} p50 {self.percentile(values, 0.5) * 1000:.1f} "
+                          f"p95 {self.percentile(values, 0.95) * 1000:.1f} ms"
+                          for name, values in self.times.items())
+        caches = ", ".join(f"{cache} {100 * sum(hits) / len(hits):.0f}%" for cache, hits in self.caches.items())
+        return f"Last {self.frames} frames: {times}. Cache hits: {caches}"
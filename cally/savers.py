@@ -28,9 +28,11 @@ class TaskSaverCSV:
         try:
             with open(dummy_file, "w", encoding="utf-8") as f:
                 for task in self.user_tasks.items:
-                    # Skip Notion tasks and header tasks - only save local tasks
+                    # Skip live tasks and header tasks - only save local tasks
                     if hasattr(task, 'notion_id') and task.notion_id:
                         continue
+                    if hasattr(task, 'source') and task.source:
+                        continue
                     if hasattr(task, 'is_header') and task.is_header:
                         continue
 
@@ -4,7 +4,7 @@ import datetime
 import logging
 
 from cally.data import Events, AppState, CalState
-from cally.calendars import Calendar
+from cally.calendars import Calendar, convert_to_gregorian_date
 
 
 class Screen:
@@ -26,6 +26,8 @@ class Screen:
         self.key = None
         self.pending_action = None  # Store pending action (e.g. 'd') for two-step commands
         self.selection_context = None # 'JOURNAL' or 'CALENDAR' to restrict selection numbers
+        self.journal_offset = 0  # First line of the journal shown in its pane
+        self.journal_height = 1  # Number of lines of the journal that its pane showed last time
         self.timeout_counter = 0
         self.day = self.today.day
         self.month = self.today.month
@@ -95,6 +97,20 @@ class Screen:
         """Calculate how many weeks are in this month"""
         return len(Calendar(0, self.use_persian_calendar).monthdayscalendar(self.year, self.month))
 
+    @property
+    def displayed_period(self):
+        """Gregorian dates of the first and the last day that views of this month may show"""
+        last_day = Calendar(0, self.use_persian_calendar).last_day(self.year, self.month)
+        first_date = (self.year, self.month, 1)
+        last_date = (self.year, self.month, last_day)
+        if self.use_persian_calendar:
+            first_date = convert_to_gregorian_date(*first_date)
+            last_date = convert_to_gregorian_date(*last_date)
+
+        # Weekly and daily views can show days of the neighbouring months:
+        margin = datetime.timedelta(days=31)
+        return datetime.date(*first_date) - margin, datetime.date(*last_date) + margin
+
     @property
     def is_time_to_reload(self):
         """Check if enough time passed since last data reload or it was requested"""
@@ -0,0 +1,156 @@
+"""Local store of the state of live connectors, kept in one SQLite file in the config folder"""
+
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, updated REAL NOT NULL,
+    PRIMARY KEY (namespace, key));
+CREATE TABLE IF NOT EXISTS cursors (
+    source TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS records (
+    source TEXT NOT NULL, id TEXT NOT NULL, value TEXT NOT NULL,
+    PRIMARY KEY (source, id));
+CREATE TABLE IF NOT EXISTS deleted (
+    source TEXT NOT NULL, id TEXT NOT NULL,
+    PRIMARY KEY (source, id));
+CREATE TABLE IF NOT EXISTS outbox (
+    source TEXT NOT NULL, id TEXT NOT NULL, status TEXT NOT NULL, attempts INTEGER NOT NULL, next_try REAL NOT NULL,
+    PRIMARY KEY (source, id));
+"""
+
+
+class StateStore:
+    """Caches, sync cursors, mirrored records, deleted IDs, and outboxes of live connectors.
+    Every change is a transaction that touches only the rows that changed"""
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.filename, check_same_thread=False)
+        with self.transaction() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Run statements from any thread and commit them together, or roll them back on error"""
+        with self.lock, self.connection:
+            yield self.connection
+
+    # Cached values that expire:
+
+    def cached(self, namespace, ttl):
+        """Fresh values of the namespace with the time they were saved, by their keys"""
+        with self.transaction() as db:
+            rows = db.execute("SELECT key, value, updated FROM cache WHERE namespace = ? AND updated > ?",
+                              (namespace, time.time() - ttl)).fetchall()
+        return {key: [json.loads(value), updated] for key, value, updated in rows}
+
+    def set_cached(self, namespace, values):
+        """Remember values by their keys with the current time"""
+        now = time.time()
+        with self.transaction() as db:
+            db.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                           [(namespace, key, json.dumps(value), now) for key, value in values.items()])
+
+    def delete_cached(self, namespace, keys):
+        with self.transaction() as db:
+            db.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?", [(namespace, key) for key in keys])
+
+    def prune_cached(self, namespace, keep):
+        """Delete values of the namespace except the ones to keep"""
+        with self.transaction() as db:
+            keys = [key for key, in db.execute("SELECT key FROM cache WHERE namespace = ?", (namespace,))]
+            db.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?",
+                           [(namespace, key) for key in keys if key not in keep])
+
+    # Sync cursors and mirrored records:
+
+    def cursor(self, source):
+        """Sync position of the source, None if it never synced"""
+        with self.transaction() as db:
+            row = db.execute("SELECT value FROM cursors WHERE source = ?", (source,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def records(self, source):
+        """Mirrored records of the source by their IDs"""
+        with self.transaction() as db:
+            rows = db.execute("SELECT id, value FROM records WHERE source = ? ORDER BY rowid", (source,)).fetchall()
+        return {record_id: json.loads(value) for record_id, value in rows}
+
+    def save_sync(self, source, cursor, changed_records, removed_ids):
+        """Save the new sync position together with the records that changed since the last save.
+        Records keep the order in which they were first saved"""
+        with self.transaction() as db:
+            db.execute("INSERT OR REPLACE INTO cursors VALUES (?, ?)", (source, json.dumps(cursor)))
+            db.executemany("INSERT INTO records VALUES (?, ?, ?) ON CONFLICT (source, id) DO UPDATE SET value = excluded.value",
+                           [(source, record_id, json.dumps(record)) for record_id, record in changed_records.items()])
+            db.executemany("DELETE FROM records WHERE source = ? AND id = ?",
+                           [(source, record_id) for record_id in removed_ids])
+
+    # Items deleted by the user:
+
+    def deleted_ids(self, source):
+        with self.transaction() as db:
+            return {item_id for item_id, in db.execute("SELECT id FROM deleted WHERE source = ?", (source,))}
+
+    def add_deleted_ids(self, source, item_ids):
+        with self.transaction() as db:
+            db.executemany("INSERT OR IGNORE INTO deleted VALUES (?, ?)", [(source, item_id) for item_id in item_ids])
+
+    def prune_deleted_ids(self, source, seen_ids):
+        """Forget deleted items that the source no longer has"""
+        with self.transaction() as db:
+            item_ids = [item_id for item_id, in db.execute("SELECT id FROM deleted WHERE source = ?", (source,))]
+            db.executemany("DELETE FROM deleted WHERE source = ? AND id = ?",
+                           [(source, item_id) for item_id in item_ids if item_id not in seen_ids])
+
+    # Changes waiting to be sent:
+
+    def outbox(self, source):
+        """Undelivered changes of the source by item IDs"""
+        with self.transaction() as db:
+            rows = db.execute("SELECT id, status, attempts, next_try FROM outbox WHERE source = ?", (source,))
+            return {item_id: {"status": status, "attempts": attempts, "next_try": next_try}
+                    for item_id, status, attempts, next_try in rows}
+
+    def put_outbox(self, source, item_id, entry):
+        with self.transaction() as db:
+            db.execute("INSERT OR REPLACE INTO outbox VALUES (?, ?, ?, ?, ?)",
+                       (source, item_id, entry["status"], entry["attempts"], entry["next_try"]))
+
+    def remove_outbox(self, source, item_id):
+        with self.transaction() as db:
+            db.execute("DELETE FROM outbox WHERE source = ? AND id = ?", (source, item_id))
+
+    def import_old_files(self, folder):
+        """Move deleted Notion tasks from the file of earlier versions into the store"""
+        deleted_file = Path(folder) / "deleted_notion_tasks.txt"
+        try:
+            if deleted_file.exists():
+                with open(deleted_file, "r", encoding="utf-8") as f:
+                    self.add_deleted_ids("notion", [line.strip() for line in f if line.strip()])
+                deleted_file.unlink()
+        except OSError as e_message:
+            logging.error("Failed to import %s. %s", deleted_file, e_message)
+
+
+# Stores of each config folder:
+state_stores = {}
+state_stores_lock = threading.Lock()
+
+def get_state_store(cf):
+    """Get the store of the config folder, opening it on the first call"""
+    filename = Path(cf.config_folder) / "state.db"
+    with state_stores_lock:
+        if filename not in state_stores:
+            state_stores[filename] = StateStore(filename)
+            state_stores[filename].import_old_files(cf.config_folder)
+        return state_stores[filename]
@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Mudar (remover) data limite da tarefa",
         "   m   ": "Mover tarefa",
         "   C   ": "Importar tarefas do calcurse",
+        "PgUp/Dn": "Rolar uma lista longa de tarefas",
         }
 
 MSG_NAME          = "CALLY"
@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Aufgaben-Deadline ändern (entfernen)",
         "   m   ": "Aufgabe verschieben",
         "   C   ": "Aufgaben aus calcurse importieren",
+        "PgUp/Dn": "Durch eine lange Aufgabenliste blättern",
         }
 
 MSG_NAME          = "CALLY"
@@ -52,6 +52,7 @@ KEYS_TODO = {
         "   m   ": "Move a task",
         "   c   ": "Change Notion task status",
         "   C   ": "Import tasks from calcurse",
+        "PgUp/Dn": "Scroll a long list of tasks",
         }
 
 MSG_NAME          = "CALLY"
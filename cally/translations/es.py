@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Cambiar (remover) la fecha límite de la tarea",
         "   m   ": "Mover una tarea",
         "   C   ": "Importar tareas desde calcurse",
+        "PgUp/Dn": "Desplazar una lista larga de tareas",
         }
 
 MSG_NAME          = "CALLY"
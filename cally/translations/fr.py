@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Modifier (supprimer) l'échéance de la tâche",
         "   m   ": "Déplacer une tâche",
         "   C   ": "Importer des tâches de calcurse",
+        "PgUp/Dn": "Faire défiler une longue liste de tâches",
         }
 
 MSG_NAME          = "CALLY"
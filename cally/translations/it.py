@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Cambia (o rimuovi) la scadenza per una attività",
         "   m   ": "Sposta una attività",
         "   C   ": "Importa le attività da calcurse",
+        "PgUp/Dn": "Scorrere un lungo elenco di attività",
         }
 
 MSG_NAME          = "CALLY"
@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Изменить (удалить) дедлайн задачи",
         "   m   ": "Переместить задачу",
         "   C   ": "Импортировать задачи из calcurse",
+        "PgUp/Dn": "Прокрутить длинный список задач",
         }
 
 MSG_NAME          = "CALLY"
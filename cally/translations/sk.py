@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Zmeniť (odstrániť) hraničný termín úlohy",
         "   m   ": "Odstrániť úlohu",
         "   C   ": "Importovať úlohy z calcurse",
+        "PgUp/Dn": "Posúvať dlhý zoznam úloh",
         }
 
 MSG_NAME          = "CALLY"
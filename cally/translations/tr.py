@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "Görev son tarihini değiştir (kaldır)",
         "   m   ": "Görev taşıma",
         "   C   ": "Calcurse'den görevleri içe aktarma",
+        "PgUp/Dn": "Uzun bir görev listesini kaydırma",
         }
 
 MSG_NAME          = "CALLY"
@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "修改（移除）任務期限",
         "   m   ": "移動任務",
         "   C   ": "從 Calcurse 匯入任務",
+        "PgUp/Dn": "捲動較長的任務清單",
         }
 
 MSG_NAME          = "CALLY"
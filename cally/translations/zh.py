@@ -50,6 +50,7 @@ KEYS_TODO = {
         "  f(F) ": "更改（删除）任务截止日期",
         "   m   ": "移动任务",
         "   C   ": "从 Calcurse 导入任务",
+        "PgUp/Dn": "滚动较长的任务列表",
         }
 
 MSG_NAME          = "CALLY"
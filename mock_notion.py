@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Local stand-in of the Notion API serving a synthetic task database.
+
+It answers the requests made by the Notion connector: the database schema, paged user lists,
+database queries with people, status, and last edited time filters, project pages of relations,
+and status updates. Latency and rate limiting with 429 answers can be set to resemble the real API.
+Tests give it their own pages, read the requests it received, and make it fail some of them.
+
+Usage: python mock_notion.py [number_of_tasks] [latency_ms] [requests_per_second]
+"""
+
+import datetime
+import http.server
+import json
+import sys
+import threading
+import time
+import urllib.parse
+
+
+USER_NAME = "Ethan Hitchcock"
+DATABASE_ID = "mock-database"
+PROPERTY_IDS = {"Task name": "title", "Responsible": "resp", "Project": "proj", "Status": "stat",
+                "Due date": "due", "Notes": "note"}
+STATUSES = ["Not started", "In progress", "Urgent", "Done"]
+MAX_PAGE_SIZE = 100
+
+
+def timestamp(seconds):
+    """Time in the format of last_edited_time"""
+    moment = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03}Z"
+
+
+def make_users(number_of_users):
+    """Workspace members with the user of the connector somewhere in the middle"""
+    users = [{"object": "user", "id": f"user-{number}", "name": f"Colleague {number}"}
+             for number in range(number_of_users)]
+    users.insert(number_of_users // 2, {"object": "user", "id": "user-me", "name": USER_NAME})
+    return users
+
+
+def make_page(number, project_number, is_of_user=True, edited="2026-01-01T10:00:00.000Z", status="Not started"):
+    """Task page with relations and a long text property, like pages of real databases"""
+    person = {"id": "user-me", "name": USER_NAME} if is_of_user else \
+             {"id": f"user-{number % 7}", "name": f"Colleague {number % 7}"}
+    return {
+        "object": "page",
+        "id": f"task-{number}",
+        "last_edited_time": edited,
+        "archived": False,
+        "properties": {
+            "Task name": {"id": "title", "type": "title", "title": [{"plain_text": f"Task {number}"}]},
+            "Responsible": {"id": "resp", "type": "people", "people": [person]},
+            "Project": {"id": "proj", "type": "relation", "relation": [{"id": f"project-{project_number}"}]},
+            "Status": {"id": "stat", "type": "status", "status": {"name": status}},
+            "Due date": {"id": "due", "type": "date", "date": {"start": f"2026-{1 + number % 12:02}-{1 + number % 28:02}"}},
+            "Notes": {"id": "note", "type": "rich_text",
+                      "rich_text": [{"plain_text": "Long description of the task. " * 20}]},
+        },
+    }
+
+
+def paginate(items, start_cursor, page_size):
+    """Response with a page of items and the cursor of the next one, like the real API"""
+    start = int(start_cursor or 0)
+    end = start + min(int(page_size or MAX_PAGE_SIZE), MAX_PAGE_SIZE)
+    has_more = end < len(items)
+    return {"object": "list", "results": items[start:end], "has_more": has_more,
+            "next_cursor": str(end) if has_more else None}
+
+
+class MockNotion(http.server.ThreadingHTTPServer):
+    """Notion API with a synthetic database of tasks, or with the pages that are given.
+    Every share_of_user-th task is assigned to the user, latency is added to each answer,
+    and requests beyond requests_per_second or every throttle_every-th request are answered with 429"""
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self, number_of_tasks=1000, number_of_projects=20, number_of_users=150, share_of_user=3,
+                 latency=0, requests_per_second=0, throttle_every=0, port=0, pages=None):
+        super().__init__(("127.0.0.1", port), MockNotionHandler)
+        self.latency = latency
+        self.delays = {}  # Extra latency of requests by kind
+        self.requests_per_second = requests_per_second
+        self.throttle_every = throttle_every
+        self.lock = threading.Lock()
+        self.tokens = requests_per_second
+        self.last_refill = time.monotonic()
+        self.users = make_users(number_of_users)
+        now = time.time()
+        if pages is None:
+            pages = [make_page(number, number % number_of_projects, number % share_of_user == 0,
+                               timestamp(now - 86400 - 60 * number), STATUSES[number % len(STATUSES)])
+                     for number in range(number_of_tasks)]
+        self.pages = pages
+        self.counts = {}  # requests by kind
+        self.requests = []  # method, path, and payload of each request
+        self.connections = set()
+        self.throttled = 0
+        self.sent_bytes = 0
+        self.thread = None
+
+        # Failures that tests ask for, each answers one request:
+        self.throttled_queries = 0
+        self.failing_queries = 0
+        self.failing_patches = 0
+        self.patch_gate = threading.Event()  # Status updates wait until it is set
+        self.patch_gate.set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/v1"
+
+    def start(self):
+        """Serve requests in a background thread"""
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def environment(self):
+        """Variables that point the connector to this server"""
+        return {"NOTION_TOKEN": "mock-token", "NOTION_DATABASE_ID": DATABASE_ID, "NOTION_API_URL": self.url}
+
+    def page(self, page_id):
+        with self.lock:
+            return next((page for page in self.pages if page["id"] == page_id), None)
+
+    def take_failure(self, name):
+        """Use up one of the failures that tests asked for, return True if there was one"""
+        with self.lock:
+            if getattr(self, name) <= 0:
+                return False
+            setattr(self, name, getattr(self, name) - 1)
+            return True
+
+    def edit(self, numbers, status=None):
+        """Touch pages as if someone edited them in Notion, optionally changing their status"""
+        edited = timestamp(time.time())
+        with self.lock:
+            for number in numbers:
+                page = self.pages[number]
+                page["last_edited_time"] = edited
+                if status is not None:
+                    page["properties"]["Status"]["status"] = {"name": status}
+
+    def is_throttled(self):
+        """Count the request and decide if it is over the rate limit, return seconds to wait if so"""
+        with self.lock:
+            number = sum(self.counts.values())
+            if self.throttle_every and number % self.throttle_every == 0:
+                self.throttled += 1
+                return 0.1
+            if not self.requests_per_second:
+                return None
+            now = time.monotonic()
+            self.tokens = min(self.requests_per_second,
+                              self.tokens + (now - self.last_refill) * self.requests_per_second)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return None
+            self.throttled += 1
+            return (1 - self.tokens) / self.requests_per_second
+
+    def query(self, payload, filter_properties):
+        """Pages of the database that match the filter of the query, in the requested order"""
+        with self.lock:
+            pages = list(self.pages)
+        conditions = payload.get("filter", {}).get("and", [payload.get("filter", {})])
+        for condition in conditions:
+            if "timestamp" in condition:
+                edited_after = condition["last_edited_time"]["on_or_after"]
+                pages = [page for page in pages if page["last_edited_time"] >= edited_after]
+            elif "status" in condition:
+                excluded = condition["status"]["does_not_equal"]
+                pages = [page for page in pages if page["properties"]["Status"]["status"]["name"] != excluded]
+            elif "people" in condition:
+                person_id = condition["people"]["contains"]
+                pages = [page for page in pages if any(person["id"] == person_id for person in
+                                                       page["properties"]["Responsible"]["people"])]
+        for sort in reversed(payload.get("sorts", [])):
+            if sort.get("property") == "Project":
+                pages.sort(key=lambda page: int(page["properties"]["Project"]["relation"][0]["id"].split("-")[1]),
+                           reverse=sort.get("direction") == "descending")
+        if filter_properties:
+            names = [name for name, property_id in PROPERTY_IDS.items() if property_id in filter_properties]
+            pages = [dict(page, properties={name: page["properties"][name] for name in names}) for page in pages]
+        return paginate(pages, payload.get("start_cursor"), payload.get("page_size"))
+
+
+class MockNotionHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.client_address)
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, data, status=200, headers=None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.sent_bytes += len(body)
+
+    def send_error_json(self, status, code):
+        self.send_json({"object": "error", "status": status, "code": code}, status)
+
+    def handle_request(self, kind, answer):
+        """Count the request, wait for the latency, and answer unless it is throttled"""
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length)) if length else {}
+        with server.lock:
+            server.counts[kind] = server.counts.get(kind, 0) + 1
+            server.requests.append((self.command, self.path, payload if length else None))
+        time.sleep(server.latency + server.delays.get(kind, 0))
+        wait = server.is_throttled()
+        if wait is not None:
+            self.send_json({"object": "error", "status": 429, "code": "rate_limited"}, 429,
+                           {"Retry-After": f"{wait:.2f}"})
+            return
+        if self.headers.get("Authorization") != "Bearer mock-token":
+            self.send_error_json(401, "unauthorized")
+            return
+        answer(payload)
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        query = dict(urllib.parse.parse_qsl(query))
+        if path == "/v1/users":
+            users = self.server.users
+            self.handle_request("users", lambda _: self.send_json(
+                paginate(users, query.get("start_cursor"), query.get("page_size"))))
+        elif path == f"/v1/databases/{DATABASE_ID}":
+            self.handle_request("schema", lambda _: self.send_json(self.schema()))
+        elif path.startswith("/v1/pages/"):
+            self.handle_request("page", lambda _: self.send_page(path.rsplit("/", 1)[1]))
+        else:
+            self.handle_request("unknown", lambda _: self.send_error_json(404, "object_not_found"))
+
+    def do_POST(self):
+        path, _, query = self.path.partition("?")
+        filter_properties = urllib.parse.parse_qs(query).get("filter_properties", [])
+        if path == f"/v1/databases/{DATABASE_ID}/query":
+            self.handle_request("query", lambda payload: self.send_query(payload, filter_properties))
+        else:
+            self.handle_request("unknown", lambda _: self.send_error_json(404, "object_not_found"))
+
+    def do_PATCH(self):
+        page_id = self.path.partition("?")[0].rsplit("/", 1)[1]
+        self.handle_request("update", lambda payload: self.update_page(page_id, payload))
+
+    def send_query(self, payload, filter_properties):
+        server = self.server
+        edited_after = payload.get("filter", {}).get("last_edited_time", {}).get("on_or_after")
+        if server.take_failure("failing_queries") or edited_after == "":
+            self.send_error_json(400, "validation_error")
+        elif server.take_failure("throttled_queries"):
+            self.send_json({"object": "error", "status": 429, "code": "rate_limited"}, 429, {"Retry-After": "0.3"})
+        else:
+            self.send_json(server.query(payload, filter_properties))
+
+    def schema(self):
+        properties = {name: {"id": property_id, "name": name} for name, property_id in PROPERTY_IDS.items()}
+        for name, page_property in self.server.pages[0]["properties"].items() if self.server.pages else []:
+            properties[name]["type"] = page_property["type"]
+        options = [{"id": str(number), "name": name} for number, name in enumerate(STATUSES)]
+        properties["Status"].update({"type": "status", "status": {"options": options}})
+        return {"object": "database", "id": DATABASE_ID, "properties": properties}
+
+    def send_page(self, page_id):
+        """Project pages have a title with their number, task pages are returned as they are"""
+        server = self.server
+        page = server.page(page_id)
+        if page_id.startswith("project-"):
+            name = "Project " + page_id.split("-", 1)[1]
+            title = {"id": "title", "type": "title", "title": [{"plain_text": name}]}
+            self.send_json({"object": "page", "id": page_id, "properties": {"Name": title}})
+        elif page is not None:
+            self.send_json(page)
+        else:
+            self.send_error_json(404, "object_not_found")
+
+    def update_page(self, page_id, payload):
+        """Change the status of a task and mark it as edited"""
+        server = self.server
+        server.patch_gate.wait()
+        page = server.page(page_id)
+        if server.take_failure("failing_patches"):
+            self.send_error_json(503, "service_unavailable")
+            return
+        if page is None:
+            self.send_error_json(404, "object_not_found")
+            return
+        status = payload.get("properties", {}).get("Status", {}).get("status", {}).get("name")
+        if status not in STATUSES:
+            self.send_error_json(400, "validation_error")
+            return
+        with server.lock:
+            page["properties"]["Status"]["status"] = {"name": status}
+            page["last_edited_time"] = timestamp(time.time())
+        self.send_json(page)
+
+
+def main():
+    number_of_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0
+    requests_per_second = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    server = MockNotion(number_of_tasks, latency=latency, requests_per_second=requests_per_second, port=8765)
+    for name, value in server.environment().items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
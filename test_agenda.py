@@ -0,0 +1,98 @@
+"""Tests of entries of days and the layout of the monthly calendar"""
+
+import datetime
+import types
+
+from cally.data import Birthdays, Event, Events, Frequency, Status, Task, Tasks, Timer, UserEvent
+from cally.agenda import MonthLayout, events_between
+
+
+def make_config():
+    return types.SimpleNamespace(START_WEEK_DAY=1, USE_PERSIAN_CALENDAR=False, DISPLAY_HOLIDAYS=True,
+                                 BIRTHDAYS_FROM_ABOOK=True)
+
+
+def make_screen(y_max=40, x_max=140):
+    return types.SimpleNamespace(year=2026, month=10, y_max=y_max, x_max=x_max, show_week_numbers=False)
+
+
+def make_event(item_id, day, name, repetition=1, frequency=Frequency.DAILY, year=2026, month=10, hour=None):
+    return UserEvent(item_id, year, month, day, name, repetition, frequency, Status.NORMAL, False, hour=hour,
+                     minute=0 if hour is not None else None)
+
+
+def make_collections():
+    user_events, user_ics_events, holidays, birthdays = Events(), Events(), Events(), Birthdays()
+    user_tasks, user_ics_tasks = Tasks(), Tasks()
+    for item_id, day in enumerate([3, 3, 12, 20]):
+        user_events.add_item(make_event(item_id, day, f"Meeting {item_id + 1}"))
+    user_events.add_item(make_event(9, 5, "Gym", 4, Frequency.WEEKLY))
+    user_events.add_item(make_event(10, 3, "Last year", year=2025))
+    user_ics_events.add_item(make_event(20, 12, "Late call", hour=18))
+    user_ics_events.add_item(make_event(21, 12, "All day"))
+    user_ics_events.add_item(make_event(22, 12, "Standup", hour=9))
+    holidays.add_item(Event(2026, 10, 12, "Columbus Day"))
+    birthdays.add_item(Event(1990, 10, 20, "Alice"))
+    user_tasks.add_item(Task(1, "Report due", Status.NORMAL, Timer([]), False, 2026, 10, 3))
+    return user_events, user_ics_events, holidays, birthdays, user_tasks, user_ics_tasks
+
+
+def names(cell):
+    return [item.name for kind, item, number in cell.entries]
+
+
+def test_entries_are_placed_in_their_days_in_the_order_of_kinds():
+    collections = make_collections()
+    layout = MonthLayout(make_config(), make_screen(y_max=60), *collections)
+    cells = {cell.day: cell for cell in layout.cells}
+    assert len(cells) == 31
+    assert (cells[1].y, cells[1].x, cells[1].day_in_week) == (3, 3 * 20, 3)
+    assert names(cells[3]) == ["Meeting 1", "Meeting 2", "Report due"]
+    assert names(cells[12]) == ["Meeting 3", "Gym", "Standup", "Late call", "All day", "Columbus Day"]
+    assert names(cells[20]) == ["Meeting 4", "Alice"]
+    assert [kind for kind, item, number in cells[12].entries] == ["event"] * 5 + ["holiday"]
+
+    # User events are numbered through the month, the way they are selected:
+    numbers = [(item.name, number) for cell in layout.cells for kind, item, number in cell.entries if number]
+    assert numbers == [("Meeting 1", 1), ("Meeting 2", 2), ("Gym", 3), ("Meeting 3", 4), ("Meeting 4", 5)]
+
+
+def test_entries_that_do_not_fit_are_hidden():
+    layout = MonthLayout(make_config(), make_screen(y_max=27), *make_collections())
+    cell = next(cell for cell in layout.cells if cell.day == 12)
+    assert layout.y_cell == 4
+    assert names(cell) == ["Meeting 3", "Gym", "Standup"]
+    assert cell.hidden_kind == "holiday"
+
+
+def test_layout_is_outdated_when_data_or_size_change():
+    collections = make_collections()
+    screen = make_screen()
+    layout = MonthLayout(make_config(), screen, *collections)
+    assert layout.key == MonthLayout.make_key(screen, collections)
+
+    screen.x_max = 100
+    assert layout.key != MonthLayout.make_key(screen, collections)
+    layout = MonthLayout(make_config(), screen, *collections)
+
+    collections[0].toggle_item_status(0, Status.DONE)
+    assert layout.key != MonthLayout.make_key(screen, collections)
+    layout = MonthLayout(make_config(), screen, *collections)
+
+    # Saving the data is not a change of what is shown:
+    collections[0].changed = False
+    assert layout.key == MonthLayout.make_key(screen, collections)
+
+
+def test_events_between_buckets_days_across_months():
+    collections = make_collections()
+    collections[0].add_item(make_event(30, 1, "Next month", month=11))
+    days = events_between(make_config(), datetime.date(2026, 10, 19), datetime.date(2026, 11, 2), *collections)
+    assert [date for date, entries in days] == [datetime.date(2026, 10, 19) + datetime.timedelta(days=number)
+                                               for number in range(14)]
+    entries = {date.day: [item.name for kind, item, collection in entries] for date, entries in days}
+    assert entries[20] == ["Meeting 4", "Alice"]
+    assert entries[19] == entries[26] == ["Gym"]
+    assert entries[1] == ["Next month"]
+    assert entries[21] == []
+    assert events_between(make_config(), datetime.date(2026, 10, 3), datetime.date(2026, 10, 3), *collections) == []
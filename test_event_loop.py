@@ -0,0 +1,55 @@
+"""Tests of waiting for timers and background threads in the main loop"""
+
+import curses
+import os
+import select
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from cally.event_loop import EventLoop
+
+
+def test_nearest_timer_sets_the_timeout():
+    event_loop = EventLoop()
+    assert event_loop.timeout() is None
+    now = time.time()
+    event_loop.set_timer("clock", now + 60)
+    event_loop.set_timer("timers", now + 5)
+    assert 4 < event_loop.timeout() <= 5
+    event_loop.set_timer("timers", now - 1)
+    assert event_loop.timeout() == 0
+    event_loop.cancel_timer("timers")
+    event_loop.cancel_timer("reload")
+    assert 59 < event_loop.timeout() <= 60
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows waits with halfdelay")
+def test_wake_from_a_thread_ends_the_wait():
+    event_loop = EventLoop()
+    threading.Timer(0.05, event_loop.wake).start()
+    ready, _, _ = select.select([event_loop.wakeup_read], [], [], 5)
+    assert ready == [event_loop.wakeup_read]
+
+    # Many wakeups are drained at once and do not block when nobody reads them:
+    for _ in range(100000):
+        event_loop.wake()
+    event_loop.drain()
+    ready, _, _ = select.select([event_loop.wakeup_read], [], [], 0)
+    assert ready == []
+    os.close(event_loop.wakeup_read)
+    os.close(event_loop.wakeup_write)
+
+
+def test_waiting_with_halfdelay_restores_the_delay_of_dialogs():
+    event_loop = EventLoop(dialog_delay=255)
+    event_loop.uses_select = False
+    event_loop.set_timer("clock", time.time() + 0.05)
+    stdscr = mock.Mock()
+    stdscr.getkey.side_effect = curses.error
+    with mock.patch("curses.halfdelay") as halfdelay:
+        assert event_loop.wait_for_key(stdscr) is None
+    assert halfdelay.call_args_list == [mock.call(1), mock.call(255)]
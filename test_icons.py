@@ -0,0 +1,37 @@
+"""Tests of selecting icons by keywords in names"""
+
+import random
+
+from cally.icons import IconMatcher
+
+
+ICONS = {"meet": "🤝", "meeting": "⛬", "eting": "☺", "gym": "🏋", "he": "1", "she": "2", "hers": "3", "his": "4",
+         "s": "5"}
+
+
+def icon_by_loop(icons, name):
+    """Selection of icons by the loop over the table, which the matcher replaces"""
+    icon = None
+    for keyword in icons:
+        if keyword in name.lower():
+            icon = icons[keyword]
+    return icon
+
+
+def test_last_keyword_of_the_table_wins():
+    matcher = IconMatcher(ICONS)
+    assert matcher.icon_for("Team Meeting") == "☺"
+    assert matcher.icon_for("Meet Ann") == "🤝"
+    assert matcher.icon_for("GYM") == "🏋"
+    assert matcher.icon_for("ushers") == "5"
+    assert matcher.icon_for("Lunch") is None
+    assert IconMatcher({}).icon_for("Meeting") is None
+
+
+def test_matcher_agrees_with_the_loop_over_the_table():
+    matcher = IconMatcher(ICONS, max_size=50)
+    generator = random.Random(4)
+    for _ in range(2000):
+        name = "".join(generator.choice("meetinghsrgyMHS ") for _ in range(generator.randint(0, 12)))
+        assert matcher.icon_for(name) == icon_by_loop(ICONS, name), name
+    assert len(matcher.names) <= 50
@@ -0,0 +1,199 @@
+"""Tests of loading events from ICS files"""
+
+import datetime
+import types
+from unittest import mock
+
+import icalendar
+
+from benchmark_ics import generate_ics
+from cally.data import RecurrenceCache, RepeatedEvents
+from cally.loaders import EventLoaderICS, TaskLoaderICS, TimezoneCache, split_ics_text
+
+
+def make_config(files, workers=0, horizon_past=0, horizon_future=0, priority=()):
+    return types.SimpleNamespace(ICS_EVENT_FILES=files, ICS_TASK_FILES=files, USE_PERSIAN_CALENDAR=False,
+                                 ICS_PARSE_WORKERS=workers, ICS_HORIZON_PAST=horizon_past,
+                                 ICS_HORIZON_FUTURE=horizon_future, ICS_EVENT_PRIORITY=list(priority))
+
+
+def event_fields(events):
+    return [(e.item_id, e.calendar_number, e.year, e.month, e.day, e.hour, e.minute,
+             e.name, e.repetition, e.frequency, e.rrule) for e in events.items]
+
+
+def test_split_ics_text_keeps_every_event(tmp_path):
+    path = tmp_path / "big.ics"
+    generate_ics(path, 25)
+    text = path.read_text(encoding="utf-8")
+    chunks = split_ics_text(text, 10)
+    assert [first_index for _, first_index in chunks] == [0, 10, 20]
+    assert sum(chunk.count("BEGIN:VEVENT") for chunk, _ in chunks) == 25
+    assert all(chunk.startswith("BEGIN:VCALENDAR") for chunk, _ in chunks)
+    assert all(chunk.rstrip().endswith("END:VCALENDAR") for chunk, _ in chunks)
+
+
+def test_parallel_parsing_matches_serial(tmp_path):
+    files = []
+    for number, size in enumerate([30, 7, 0]):
+        path = tmp_path / f"calendar{number}.ics"
+        generate_ics(path, size, seed=number)
+        files.append(str(path))
+
+    serial = EventLoaderICS(make_config(files))
+    parallel = EventLoaderICS(make_config(files, workers=2))
+    parallel.chunk_size = 4
+
+    assert event_fields(parallel.load()) == event_fields(serial.load())
+    assert len(serial.user_ics_events.items) == 37
+
+
+def test_serial_and_parallel_parsing_skip_a_broken_file_as_a_whole(tmp_path):
+    files = []
+    for number, broken_line in enumerate(["END:VTODO\n", "DTSTART:notadate\n", None]):
+        path = tmp_path / f"calendar{number}.ics"
+        generate_ics(path, 12, seed=number)
+        if broken_line is not None:
+            lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+            last_summary = max(index for index, line in enumerate(lines) if line.startswith("SUMMARY:"))
+            lines.insert(last_summary + 1, broken_line)
+            path.write_text("".join(lines), encoding="utf-8")
+        files.append(str(path))
+
+    serial = EventLoaderICS(make_config(files))
+    parallel = EventLoaderICS(make_config(files, workers=2))
+    parallel.chunk_size = 4
+
+    messages = []
+    for loader in [serial, parallel]:
+        with mock.patch("cally.debug_logger.get_debug_logger") as get_debug_logger:
+            loader.load()
+        messages.append([call.args for call in get_debug_logger.return_value.log_event.call_args_list])
+    assert event_fields(parallel.user_ics_events) == event_fields(serial.user_ics_events)
+    assert {event.calendar_number for event in parallel.user_ics_events.items} == {2}
+    assert messages[0] == messages[1]
+    assert ("ICS_SOURCE_COMPLETE", f"Source 1 ({files[0]}): Added 0 events") in messages[1]
+
+
+def test_timezone_cache_matches_astimezone(tmp_path):
+    path = tmp_path / "zones.ics"
+    generate_ics(path, 5)
+    cal = icalendar.Calendar.from_ical(path.read_text(encoding="utf-8"))
+    custom_zone = cal.walk("VEVENT")[2].get("dtstart").dt.tzinfo
+    assert not isinstance(custom_zone, TimezoneCache.fast_timezones)
+    local_timezone = datetime.timezone(datetime.timedelta(hours=-5))
+    cache = TimezoneCache(local_timezone)
+
+    # Hours around both DST transitions of 2026, with a repeated hour in the second pass:
+    start = datetime.datetime(2026, 3, 28, 0, 0)
+    for hours in list(range(72)) + list(range(72)):
+        for month_shift in [0, 7]:
+            wall_time = start + datetime.timedelta(days=30 * month_shift, hours=hours)
+            dt = wall_time.replace(tzinfo=custom_zone)
+            assert cache.to_local(dt) == dt.astimezone(local_timezone)
+            assert cache.to_local(dt).tzinfo is local_timezone
+    assert cache.to_local(datetime.date(2026, 1, 1)) == datetime.date(2026, 1, 1)
+
+
+def write_calendar(path, components):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//cally//test//EN"]
+    for component in components:
+        lines.extend(component)
+    lines.append("END:VCALENDAR")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def day_string(days_from_today):
+    return (datetime.date.today() + datetime.timedelta(days=days_from_today)).strftime("%Y%m%d")
+
+
+def test_horizon_skips_events_outside_and_loads_on_demand(tmp_path):
+    path = tmp_path / "team.ics"
+    write_calendar(path, [
+        ["BEGIN:VEVENT", "SUMMARY:Old", f"DTSTART;VALUE=DATE:{day_string(-800)}", "END:VEVENT"],
+        ["BEGIN:VEVENT", "SUMMARY:Recent", f"DTSTART;VALUE=DATE:{day_string(-10)}", "END:VEVENT"],
+        ["BEGIN:VEVENT", "SUMMARY:Far future", f"DTSTART;VALUE=DATE:{day_string(800)}", "END:VEVENT"],
+        ["BEGIN:VEVENT", "SUMMARY:Weekly forever", f"DTSTART;VALUE=DATE:{day_string(-900)}",
+         "RRULE:FREQ=WEEKLY", "END:VEVENT"],
+        ["BEGIN:VEVENT", "SUMMARY:Weekly ended", f"DTSTART;VALUE=DATE:{day_string(-900)}",
+         f"RRULE:FREQ=WEEKLY;UNTIL={day_string(-700)}", "END:VEVENT"],
+        ["BEGIN:VTODO", "SUMMARY:Old done", "STATUS:COMPLETED", f"DUE;VALUE=DATE:{day_string(-800)}", "END:VTODO"],
+        ["BEGIN:VTODO", "SUMMARY:Old open", f"DUE;VALUE=DATE:{day_string(-800)}", "END:VTODO"],
+    ])
+    loader = EventLoaderICS(make_config([str(path)], horizon_past=365, horizon_future=365))
+    names = [event.name for event in loader.load().items]
+    assert names == ["Recent", "Weekly forever"]
+    assert [event.item_id for event in loader.user_ics_events.items] == [2, 4]
+
+    task_loader = TaskLoaderICS(make_config([str(path)], horizon_past=365, horizon_future=365))
+    assert [task.name for task in task_loader.load().items] == ["Old open"]
+
+    old_day = datetime.date.today() - datetime.timedelta(days=800)
+    assert not loader.covers(old_day, old_day)
+    loader.extend_horizon(old_day, old_day)
+    assert loader.covers(old_day, old_day)
+    assert [event.name for event in loader.load().items] == ["Old", "Recent", "Weekly forever", "Weekly ended"]
+
+
+def test_extending_horizon_parses_the_last_download_again(tmp_path):
+    path = tmp_path / "team.ics"
+    write_calendar(path, [
+        ["BEGIN:VEVENT", "SUMMARY:Old", f"DTSTART;VALUE=DATE:{day_string(-800)}", "END:VEVENT"],
+        ["BEGIN:VEVENT", "SUMMARY:Recent", f"DTSTART;VALUE=DATE:{day_string(-10)}", "END:VEVENT"],
+    ])
+    url = "https://example.com/team.ics"
+    loader = EventLoaderICS(make_config([url], horizon_past=365, horizon_future=365))
+    downloads = []
+    loader.read_url = lambda source: downloads.append(source) or loader.read_file(str(path))
+    assert [event.name for event in loader.load().items] == ["Recent"]
+
+    old_day = datetime.date.today() - datetime.timedelta(days=800)
+    loader.extend_horizon(old_day, old_day)
+    assert [event.name for event in loader.load(reread_remote=False).items] == ["Old", "Recent"]
+    assert downloads == [url]
+    loader.load()
+    assert downloads == [url, url]
+
+
+def test_recurring_events_are_expanded_once(tmp_path):
+    path = tmp_path / "weekly.ics"
+    write_calendar(path, [
+        ["BEGIN:VEVENT", "UID:weekly@test", "SUMMARY:Weekly", "DTSTART;VALUE=DATE:20260105", "DTEND;VALUE=DATE:20260106",
+         "RRULE:FREQ=WEEKLY", "EXDATE;VALUE=DATE:20260112", "END:VEVENT"],
+    ])
+    events = EventLoaderICS(make_config([str(path)])).load()
+    cache = RecurrenceCache()
+    with mock.patch("cally.data.recurrence_cache", cache):
+        first = RepeatedEvents(events, False, 2026)
+        with mock.patch("cally.data.rrulestr", side_effect=AssertionError("rule parsed twice")):
+            second = RepeatedEvents(EventLoaderICS(make_config([str(path)])).load(), False, 2026)
+
+    dates = [(e.year, e.month, e.day) for e in first.items]
+    assert dates == [(e.year, e.month, e.day) for e in second.items]
+    assert dates[:2] == [(2026, 1, 19), (2026, 1, 26)]
+    assert dates[-1] == (2027, 11, 29)
+    assert events.items[0].rrule == "FREQ=WEEKLY"
+    assert len(cache.entries) == 1
+
+
+def test_copies_of_events_from_several_sources_are_merged(tmp_path):
+    meeting = ["UID:standup@team", "SUMMARY:Standup", "DTSTART:20260105T090000Z", "DTEND:20260105T093000Z"]
+    moved = ["UID:standup@team", "RECURRENCE-ID:20260112T090000Z", "SUMMARY:Standup moved",
+             "DTSTART:20260112T100000Z", "DTEND:20260112T103000Z"]
+    moved_in_zone = ["UID:standup@team", "RECURRENCE-ID;TZID=Europe/Paris:20260112T100000",
+                     "SUMMARY:Standup moved", "DTSTART:20260112T100000Z", "DTEND:20260112T103000Z"]
+    lunch = ["SUMMARY:Lunch", "DTSTART:20260106T120000Z", "DTEND:20260106T130000Z"]
+    files = []
+    for number, components in enumerate([[meeting, lunch], [meeting, moved], [meeting, lunch, moved_in_zone]]):
+        path = tmp_path / f"source{number}.ics"
+        write_calendar(path, [["BEGIN:VEVENT"] + component + ["END:VEVENT"] for component in components])
+        files.append(str(path))
+
+    loader = EventLoaderICS(make_config(files))
+    events = loader.load().items
+    assert [(e.name, e.calendar_number) for e in events] == [("Standup", 0), ("Lunch", 0), ("Standup moved", 1)]
+    assert loader.duplicate_count == 4
+
+    loader = EventLoaderICS(make_config(files, workers=2, priority=[3, 2]))
+    events = loader.load().items
+    assert [(e.name, e.calendar_number) for e in events] == [("Standup", 2), ("Lunch", 2), ("Standup moved", 2)]
@@ -0,0 +1,63 @@
+"""Tests of the lines of the journal"""
+
+from cally.data import Status, Task, Tasks, Timer
+from cally.journal import JournalRows
+
+
+def make_task(item_id, name, project_name=None, notion_id=None, is_header=False, source=None):
+    return Task(item_id, name, Status.NORMAL, Timer([]), False, notion_id=notion_id, project_name=project_name,
+                is_header=is_header, source=source)
+
+
+def test_tasks_are_numbered_through_local_and_notion_sections():
+    user_tasks = Tasks()
+    user_tasks.add_item(make_task(1, "Local"))
+    user_tasks.add_item(make_task(2, "Alpha", is_header=True, project_name="Alpha"))
+    user_tasks.add_item(make_task(3, "Design", "Alpha", "page-3"))
+    user_tasks.add_item(make_task(4, "Review", "Beta", "page-4"))
+    user_ics_tasks = Tasks()
+    user_ics_tasks.add_item(make_task(5, "From ICS"))
+    rows = JournalRows(user_tasks, user_ics_tasks).rows
+    assert [(kind, content if isinstance(content, str) else content.name, number) for kind, content, number in rows] == [
+        ("title", "━━━ Local Tasks ━━━", None), ("task", "Local", 1), ("blank", "", None),
+        ("title", "━━━ Notion Tasks ━━━", None), ("project", "  ━━ Alpha ━━", None), ("task", "Design", 2),
+        ("project", "  ━━ Beta ━━", None), ("task", "Review", 3), ("blank", "", None), ("ics_task", "From ICS", None)]
+
+
+def test_each_live_source_has_its_own_section():
+    user_tasks = Tasks()
+    user_tasks.add_item(make_task(1, "Groceries", is_header=True, project_name="Groceries", source="mstodo"))
+    user_tasks.add_item(make_task(2, "Milk", "Groceries", source="mstodo"))
+    user_tasks.add_item(make_task(3, "Design", "Alpha", "page-3", source="notion"))
+    user_tasks.add_item(make_task(4, "Bread", "Groceries", source="mstodo"))
+    user_tasks.add_item(make_task(5, "Local"))
+    user_tasks.sort_by_type()
+    assert [task.name for task in user_tasks.items] == ["Local", "Groceries", "Milk", "Bread", "Design"]
+    rows = JournalRows(user_tasks, Tasks()).rows
+    assert [(kind, content if isinstance(content, str) else content.name, number) for kind, content, number in rows] == [
+        ("title", "━━━ Local Tasks ━━━", None), ("task", "Local", 1), ("blank", "", None),
+        ("title", "━━━ Microsoft To Do Tasks ━━━", None), ("project", "  ━━ Groceries ━━", None),
+        ("task", "Milk", 2), ("task", "Bread", 3), ("blank", "", None),
+        ("title", "━━━ Notion Tasks ━━━", None), ("project", "  ━━ Alpha ━━", None), ("task", "Design", 4),
+        ("blank", "", None)]
+
+
+def test_only_rows_that_fit_are_visible():
+    user_tasks, user_ics_tasks = Tasks(), Tasks()
+    for number in range(3000):
+        user_tasks.add_item(make_task(number, f"Task {number}"))
+    journal_rows = JournalRows(user_tasks, user_ics_tasks)
+    offset, rows = journal_rows.visible(1000, 30)
+    assert offset == 1000 and len(rows) == 30
+    assert rows[0][2] == 1000
+
+    # Scrolling stops at the ends of the list:
+    offset, rows = journal_rows.visible(5000, 30)
+    assert offset == len(journal_rows.rows) - 30
+    assert rows[-2:] == [("message", "  (no Notion tasks)", None), ("blank", "", None)]
+    assert journal_rows.visible(-5, 30)[0] == 0
+    assert journal_rows.visible(7, 5000) == (0, journal_rows.rows)
+
+    assert journal_rows.key == JournalRows.make_key(user_tasks, user_ics_tasks)
+    user_tasks.toggle_item_status(7, Status.DONE)
+    assert journal_rows.key != JournalRows.make_key(user_tasks, user_ics_tasks)
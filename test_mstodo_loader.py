@@ -0,0 +1,177 @@
+"""Tests of the Microsoft To Do connector against a server replaying recorded Graph responses"""
+
+import http.server
+import json
+import threading
+import time
+import types
+
+import pytest
+
+from cally import http_client
+from cally.data import Status
+from cally.loaders_live import MSTodoLoader, MSTodoTaskSaver
+
+
+# Responses recorded from Graph, with {url} standing for the address of the service:
+LISTS = [
+    {"value": [{"id": "list-work", "displayName": "Work", "wellknownListName": "none"}],
+     "@odata.nextLink": "{url}/me/todo/lists?$skiptoken=page2"},
+    {"value": [{"id": "list-home", "displayName": "Home", "wellknownListName": "defaultList"}]},
+]
+WORK_FULL = [
+    {"value": [{"id": "task-1", "title": "Write report", "status": "notStarted", "importance": "high"},
+               {"id": "task-2", "title": "Book flights", "status": "inProgress", "importance": "normal"}],
+     "@odata.nextLink": "{url}/me/todo/lists/list-work/tasks/delta?$skiptoken=work2"},
+    {"value": [{"id": "task-3", "title": "Old task", "status": "completed", "importance": "normal"}],
+     "@odata.deltaLink": "{url}/me/todo/lists/list-work/tasks/delta?$deltatoken=work1"},
+]
+HOME_FULL = [
+    {"value": [{"id": "task-4", "title": "Buy milk", "status": "notStarted", "importance": "normal"}],
+     "@odata.deltaLink": "{url}/me/todo/lists/list-home/tasks/delta?$deltatoken=home1"},
+]
+WORK_CHANGES = [
+    {"value": [{"id": "task-1", "@removed": {"reason": "deleted"}},
+               {"id": "task-2", "title": "Book flights to Oslo", "status": "inProgress", "importance": "normal"}],
+     "@odata.deltaLink": "{url}/me/todo/lists/list-work/tasks/delta?$deltatoken=work2"},
+]
+EXPIRED = {"error": {"code": "syncStateNotFound", "message": "The sync state generation is not found."}}
+
+
+class ReplayGraph(http.server.ThreadingHTTPServer):
+    """Answer each path with its recorded responses in order, repeating the last one"""
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ReplayGraphHandler)
+        self.responses = {}
+        self.requests = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/v1.0"
+
+    def record(self, path, *responses):
+        """Add responses for a path with its query, as (status, body) or just a body"""
+        replies = self.responses.setdefault(f"/v1.0{path}", [])
+        for response in responses:
+            status, body = response if isinstance(response, tuple) else (200, response)
+            replies.append((status, json.loads(json.dumps(body).replace("{url}", self.url))))
+
+    def record_pages(self, first_path, pages):
+        """Add a paged response, each page under the link given by the page before"""
+        path = first_path
+        for page in pages:
+            self.record(path, page)
+            path = page.get("@odata.nextLink", "").replace("{url}", "")
+
+
+class ReplayGraphHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length)) if length else None
+        self.server.requests.append((self.command, self.path, payload, dict(self.headers)))
+        replies = self.server.responses.get(self.path)
+        status, body = (replies.pop(0) if len(replies) > 1 else replies[0]) if replies else (404, {})
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = reply
+    do_PATCH = reply
+
+
+def make_config(folder):
+    return types.SimpleNamespace(config_folder=folder, MSTODO_REFRESH_MINUTES=5, MSTODO_REQUESTS_PER_SECOND=1000,
+                                 HTTP_POOL_SIZE=10, HTTP_CONNECT_TIMEOUT=5, HTTP_READ_TIMEOUT=30)
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    server = ReplayGraph()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("MSTODO_TOKEN", "secret")
+    monkeypatch.setenv("MSTODO_API_URL", server.url)
+    yield server
+    server.shutdown()
+    server.server_close()
+    http_client.reset()
+
+
+def task_lines(tasks):
+    return [("# " if task.is_header else "") + task.name for task in tasks]
+
+
+def test_first_sync_pulls_everything_and_later_syncs_only_changes(graph, tmp_path):
+    graph.record_pages("/me/todo/lists", LISTS)
+    graph.record_pages("/me/todo/lists/list-work/tasks/delta", WORK_FULL)
+    graph.record_pages("/me/todo/lists/list-home/tasks/delta", HOME_FULL)
+
+    loader = MSTodoLoader(make_config(tmp_path))
+    pages = list(loader.load_pages())
+    assert [task_lines(tasks) for tasks in pages] == [["# Work", "Write report", "Book flights"],
+                                                      ["# Home", "Buy milk"]]
+    assert pages[0][1].status == Status.IMPORTANT
+    assert pages[0][1].remote_id == "lists/list-work/tasks/task-1"
+    assert all(request[3]["Prefer"] == "odata.maxpagesize=100" for request in graph.requests)
+    assert len(loader.store.records("mstodo")) == 3 and not list(tmp_path.glob("*.json"))
+
+    # The home list forgot its delta link, so only it is pulled again:
+    graph.requests.clear()
+    graph.record("/me/todo/lists/list-work/tasks/delta?$deltatoken=work1", (429, {}), WORK_CHANGES[0])
+    graph.record("/me/todo/lists/list-home/tasks/delta?$deltatoken=home1", (410, EXPIRED))
+    pages = list(MSTodoLoader(make_config(tmp_path)).load_pages())
+    assert task_lines(pages[0]) == ["# Work", "Write report", "Book flights", "# Home", "Buy milk"]
+    assert task_lines(pages[-1]) == ["# Work", "Book flights to Oslo", "# Home", "Buy milk"]
+    assert [path for method, path, _, _ in graph.requests] == [
+        "/v1.0/me/todo/lists",
+        "/v1.0/me/todo/lists?$skiptoken=page2",
+        "/v1.0/me/todo/lists/list-work/tasks/delta?$deltatoken=work1",
+        "/v1.0/me/todo/lists/list-work/tasks/delta?$deltatoken=work1",
+        "/v1.0/me/todo/lists/list-home/tasks/delta?$deltatoken=home1",
+        "/v1.0/me/todo/lists/list-home/tasks/delta",
+    ]
+
+    # Nothing changed since then:
+    graph.record("/me/todo/lists/list-work/tasks/delta?$deltatoken=work2", {"value": [], "@odata.deltaLink": "x"})
+    assert len(list(MSTodoLoader(make_config(tmp_path)).load_pages())) == 1
+
+
+def test_failed_sync_keeps_the_last_tasks(graph, tmp_path):
+    graph.record_pages("/me/todo/lists", LISTS)
+    graph.record_pages("/me/todo/lists/list-work/tasks/delta", WORK_FULL)
+    graph.record_pages("/me/todo/lists/list-home/tasks/delta", HOME_FULL)
+    MSTodoLoader(make_config(tmp_path)).load()
+
+    graph.record("/me/todo/lists/list-work/tasks/delta?$deltatoken=work1", (503, {}))
+    loader = MSTodoLoader(make_config(tmp_path))
+    assert task_lines(loader.load()) == ["# Work", "Write report", "Book flights", "# Home", "Buy milk"]
+    assert loader.mirror["lists"]["list-work"]["delta_link"].endswith("deltatoken=work1")
+
+
+def test_status_changes_are_sent_in_the_background(graph, tmp_path):
+    graph.record("/me/todo/lists/list-work/tasks/task-2", (500, {}), {"id": "task-2", "status": "completed"})
+    saver = MSTodoTaskSaver(make_config(tmp_path))
+    saver.retry_delay = 0.05
+    saver.update_status("lists/list-work/tasks/task-2", "completed")
+
+    end = time.time() + 5
+    while saver.outbox:
+        assert time.time() < end, "timed out"
+        time.sleep(0.01)
+    saver.stop()
+    patches = [(path, payload) for method, path, payload, _ in graph.requests if method == "PATCH"]
+    assert patches == [("/v1.0/me/todo/lists/list-work/tasks/task-2", {"status": "completed"})] * 2
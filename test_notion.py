@@ -1,62 +1,82 @@
+"""Manual check of the Notion connector, run it as a script: python test_notion.py
+
+With NOTION_TOKEN and NOTION_DATABASE_ID in .env, it checks the real database with the config of the user.
+Otherwise it checks the connector against the local mock of Notion, with a config in a temporary folder"""
+
 import os
 import json
+import tempfile
+from pathlib import Path
+
 import requests
 from dotenv import load_dotenv
+from cally.configuration import Config
 from cally.loaders_live import NotionTaskLoader
+from mock_notion import MockNotion
+
+
+def main():
+    # 1. Load Environment Variables
+    load_dotenv()
+
+    TOKEN = os.environ.get("NOTION_TOKEN")
+    DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
+
+    print(f"DEBUG: Token loaded: {'Yes' if TOKEN else 'No'}")
+    print(f"DEBUG: Database ID loaded: {'Yes' if DATABASE_ID else 'No'}")
+
+    # Without credentials, check the connector against the local stand-in of the API,
+    # keeping its config and sync state away from the ones of the user:
+    if not TOKEN or not DATABASE_ID:
+        print("\nNo NOTION_TOKEN and NOTION_DATABASE_ID in .env, using the local mock of Notion.")
+        mock_server = MockNotion(number_of_tasks=300).start()
+        os.environ.update(mock_server.environment())
+        home = tempfile.mkdtemp(prefix="cally-notion-check-")
+        (Path(home) / ".config").mkdir()
+        os.environ["HOME"] = home
+        TOKEN = os.environ["NOTION_TOKEN"]
+        DATABASE_ID = os.environ["NOTION_DATABASE_ID"]
+
+    # 2. Test Raw API Connection (Verbose Debugging)
+    print("\n--- Testing Raw Notion API ---")
+    headers = {
+        "Authorization": f"Bearer {TOKEN}",
+        "Content-Type": "application/json",
+        "Notion-Version": "2022-06-28"
+    }
+    api_url = os.environ.get("NOTION_API_URL", "https://api.notion.com/v1")
+    url = f"{api_url}/databases/{DATABASE_ID}/query"
+
+    try:
+        response = requests.post(url, headers=headers)
+        print(f"Status Code: {response.status_code}")
+
+        data = response.json()
+        # Print first result structure to help with property mapping
+        if "results" in data and data["results"]:
+            print("\nSuccessfully connected! Found", len(data["results"]), "items.")
+            print("\nStructure of first item (use this to debug property names in loaders_live.py):")
+            print(json.dumps(data["results"][0]["properties"], indent=2))
+        elif "results" in data:
+            print("\nConnected, but database is empty.")
+        else:
+            print("\nAPI Error Response:")
+            print(json.dumps(data, indent=2))
+
+    except Exception as e:
+        print(f"Connection failed: {e}")
+
+    # 3. Test Loader Class Integration
+    print("\n--- Testing NotionTaskLoader Integration ---")
+    try:
+        loader = NotionTaskLoader(Config())
+        tasks = loader.load()
+        print(f"Loader returned {len(tasks)} tasks.")
+        for t in tasks:
+            print(f"- [ID: {t.item_id}] {t.name} (Status: {t.status})")
+    except Exception as e:
+        print(f"Loader failed: {e}")
 
-# 1. Load Environment Variables
-load_dotenv()
-
-TOKEN = os.environ.get("NOTION_TOKEN")
-DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
-
-print(f"DEBUG: Token loaded: {'Yes' if TOKEN else 'No'}")
-print(f"DEBUG: Database ID loaded: {'Yes' if DATABASE_ID else 'No'}")
-
-if not TOKEN or not DATABASE_ID:
-    print("\nERROR: Missing environment variables.")
-    print("Please ensure .env file exists and contains NOTION_TOKEN and NOTION_DATABASE_ID")
-    exit(1)
-
-# 2. Test Raw API Connection (Verbose Debugging)
-print("\n--- Testing Raw Notion API ---")
-headers = {
-    "Authorization": f"Bearer {TOKEN}",
-    "Content-Type": "application/json",
-    "Notion-Version": "2022-06-28"
-}
-url = f"https://api.notion.com/v1/databases/{DATABASE_ID}/query"
-
-try:
-    response = requests.post(url, headers=headers)
-    print(f"Status Code: {response.status_code}")
-    
-    data = response.json()
-    # Print first result structure to help with property mapping
-    if "results" in data and data["results"]:
-        print("\nSuccessfully connected! Found", len(data["results"]), "items.")
-        print("\nStructure of first item (use this to debug property names in loaders_live.py):")
-        print(json.dumps(data["results"][0]["properties"], indent=2))
-    elif "results" in data:
-        print("\nConnected, but database is empty.")
-    else:
-        print("\nAPI Error Response:")
-        print(json.dumps(data, indent=2))
-
-except Exception as e:
-    print(f"Connection failed: {e}")
-
-# 3. Test Loader Class Integration
-print("\n--- Testing NotionTaskLoader Integration ---")
-class MockConfig:
-    pass
-
-try:
-    loader = NotionTaskLoader(MockConfig())
-    tasks = loader.load()
-    print(f"Loader returned {len(tasks)} tasks.")
-    for t in tasks:
-        print(f"- [ID: {t.item_id}] {t.name} (Status: {t.status})")
-except Exception as e:
-    print(f"Loader failed: {e}")
 
+if __name__ == "__main__":
+    main()
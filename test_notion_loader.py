@@ -0,0 +1,388 @@
+"""Tests of loading tasks from a local stand-in of the Notion API"""
+
+import threading
+import time
+import types
+import urllib.parse
+from unittest import mock
+
+import pytest
+
+from cally.data import Status, Task, Timer
+from cally import http_client
+from cally.http_client import RateLimiter, get_rate_limiter
+from cally.loaders_live import LiveLoader, LiveScheduler, NotionTaskLoader, NotionTaskSaver, REPLACE_TASKS
+from cally.loaders_live import create_live_connectors, notion_timestamp
+from mock_notion import DATABASE_ID, STATUSES, MockNotion, make_page, timestamp
+
+
+def make_config(folder, workers=8, cache_hours=24, full_sync_hours=6):
+    return types.SimpleNamespace(config_folder=folder, LIVE_CONNECTORS=["notion"], NOTION_REFRESH_MINUTES=10,
+                                 NOTION_LOOKUP_WORKERS=workers,
+                                 NOTION_CACHE_HOURS=cache_hours, NOTION_FULL_SYNC_HOURS=full_sync_hours,
+                                 NOTION_REQUESTS_PER_SECOND=1000, HTTP_POOL_SIZE=10,
+                                 HTTP_CONNECT_TIMEOUT=5, HTTP_READ_TIMEOUT=30)
+
+
+@pytest.fixture(autouse=True)
+def fresh_http_client():
+    """Connectors of each test get their own session and rate limiters"""
+    yield
+    http_client.reset()
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    def start(pages):
+        server = MockNotion(pages=pages).start()
+        for name, value in server.environment().items():
+            monkeypatch.setenv(name, value)
+        servers.append(server)
+        return server
+
+    servers = []
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_all_pages_of_a_large_database_are_loaded(notion, tmp_path):
+    pages = [make_page(number, number // 100, number % 3 != 0) for number in range(2500)]
+    server = notion(pages)
+
+    tasks = NotionTaskLoader(make_config(tmp_path)).load()
+
+    queries = [payload for method, _, payload in server.requests if method == "POST"]
+    assert len(queries) == 17
+    # Two projects of the first page are looked up at the same time, everything else reuses connections:
+    assert len(server.connections) <= 2
+    assert [query.get("start_cursor") for query in queries[:3]] == [None, "100", "200"]
+    names = [task.name for task in tasks if not task.is_header]
+    assert names == [f"Task {number}" for number in range(2500) if number % 3]
+    headers = [task.name for task in tasks if task.is_header]
+    assert headers == [f"Project {number}" for number in range(25)]
+
+
+def test_tasks_are_streamed_page_by_page(notion, tmp_path):
+    notion([make_page(number, 0) for number in range(250)])
+
+    scheduler = LiveScheduler(create_live_connectors(make_config(tmp_path)))
+    scheduler.start()
+    wait_for(lambda: scheduler.pages_queue.qsize() == 5)
+    pages = [tasks for _, tasks in scheduler.receive()]
+    assert not scheduler.is_loading
+    assert pages[0] is REPLACE_TASKS and pages[-1] is None
+    pages = pages[1:-1]
+
+    assert [len(tasks) for tasks in pages] == [101, 100, 50]
+    assert pages[0][0].is_header and not any(task.is_header for task in pages[1] + pages[2])
+    assert pages[0][1].notion_status_options[2]["name"] == "Urgent"
+
+
+def test_schema_is_cached_on_disk_and_shared_by_tasks(notion, tmp_path):
+    server = notion([make_page(number, 0) for number in range(5)])
+    schema_requests = lambda: [path for method, path, _ in server.requests if path == f"/v1/databases/{DATABASE_ID}"]
+
+    tasks = NotionTaskLoader(make_config(tmp_path)).load()
+    assert len({id(task.notion_status_options) for task in tasks if not task.is_header}) == 1
+    assert [option["name"] for option in tasks[1].notion_status_options] == STATUSES
+    with pytest.raises(TypeError):
+        tasks[1].notion_status_options[0]["name"] = "Changed"
+
+    NotionTaskLoader(make_config(tmp_path, full_sync_hours=0)).load()
+    assert len(schema_requests()) == 1
+
+    # A failed query may come from a changed database, so the schema is fetched again:
+    server.failing_queries = 1
+    NotionTaskLoader(make_config(tmp_path, full_sync_hours=0)).load()
+    NotionTaskLoader(make_config(tmp_path, full_sync_hours=0)).load()
+    assert len(schema_requests()) == 2
+
+
+def test_project_names_are_fetched_concurrently_and_cached_on_disk(notion, tmp_path):
+    server = notion([make_page(number, number) for number in range(40)])
+    server.delays["page"] = 0.2
+
+    start = time.perf_counter()
+    tasks = NotionTaskLoader(make_config(tmp_path)).load()
+    assert time.perf_counter() - start < 2
+    assert [task.name for task in tasks if task.is_header] == [f"Project {number}" for number in range(40)]
+    assert len([path for method, path, _ in server.requests if path.startswith("/v1/pages/")]) == 40
+    assert len(server.connections) <= 10
+
+    server.requests.clear()
+    tasks = NotionTaskLoader(make_config(tmp_path)).load()
+    assert [task.name for task in tasks if task.is_header] == [f"Project {number}" for number in range(40)]
+    assert not [path for method, path, _ in server.requests if path.startswith("/v1/pages/")]
+
+    server.requests.clear()
+    NotionTaskLoader(make_config(tmp_path, cache_hours=0)).load()
+    assert len([path for method, path, _ in server.requests if path.startswith("/v1/pages/")]) == 40
+
+
+def test_only_tasks_of_the_user_are_requested(notion, tmp_path):
+    pages = [make_page(number, number // 100, number % 10 == 0) for number in range(1000)]
+    server = notion(pages)
+
+    tasks = NotionTaskLoader(make_config(tmp_path)).load()
+
+    assert [task.name for task in tasks if not task.is_header] == [f"Task {number}" for number in range(0, 1000, 10)]
+    (method, path, payload), = [request for request in server.requests if request[0] == "POST"]
+    assert {"property": "Responsible", "people": {"contains": "user-me"}} in payload["filter"]["and"]
+    assert sorted(urllib.parse.parse_qs(urllib.parse.urlparse(path).query)["filter_properties"]) == \
+        ["proj", "resp", "stat", "title"]
+    assert server.sent_bytes < 100 * 1000
+
+    # The user is found once and remembered:
+    server.requests.clear()
+    NotionTaskLoader(make_config(tmp_path)).load()
+    assert not [path for method, path, _ in server.requests if path.startswith("/v1/users")]
+
+
+def task_names(tasks):
+    return [task.name for task in tasks if not task.is_header]
+
+
+def test_later_loads_start_from_the_mirror_and_fetch_only_changes(notion, tmp_path):
+    server = notion([make_page(number, number // 5) for number in range(20)])
+    assert len(task_names(NotionTaskLoader(make_config(tmp_path)).load())) == 20
+
+    edited = "2026-01-02T08:30:00.000Z"
+    server.pages[3]["properties"]["Task name"]["title"][0]["plain_text"] = "Task 3 renamed"
+    server.pages[5]["properties"]["Status"]["status"]["name"] = "Done"
+    server.pages[6] = make_page(6, 1, is_of_user=False)
+    server.pages.append(make_page(20, 0))
+    for page in [server.pages[3], server.pages[5], server.pages[6], server.pages[20]]:
+        page["last_edited_time"] = edited
+    server.requests.clear()
+
+    pages = list(NotionTaskLoader(make_config(tmp_path)).load_pages())
+
+    # The mirror is shown before anything is requested, then replaced by the merged changes:
+    assert len(task_names(pages[0])) == 20
+    assert pages[1] is REPLACE_TASKS
+    expected = [f"Task {number}" for number in range(20) if number not in [5, 6]]
+    expected[3] = "Task 3 renamed"
+    expected.insert(5, "Task 20")
+    assert task_names(pages[2]) == expected
+    (_, _, payload), = [request for request in server.requests if request[0] == "POST"]
+    assert payload["filter"] == {"timestamp": "last_edited_time",
+                                 "last_edited_time": {"on_or_after": "2026-01-01T10:00:00.000Z"}}
+
+    # Nothing changed since then, so the mirror stays on screen:
+    server.requests.clear()
+    pages = list(NotionTaskLoader(make_config(tmp_path)).load_pages())
+    assert len(pages) == 1 and task_names(pages[0]) == expected
+    (_, _, payload), = [request for request in server.requests if request[0] == "POST"]
+    assert payload["filter"]["last_edited_time"]["on_or_after"] == edited
+
+    # A full resync notices pages that were deleted:
+    del server.pages[0]
+    pages = list(NotionTaskLoader(make_config(tmp_path, full_sync_hours=0)).load_pages())
+    assert pages[1] is REPLACE_TASKS and task_names(pages[2]) == expected[1:]
+
+
+def test_changes_after_a_full_sync_without_tasks_are_asked_for_since_it(notion, tmp_path):
+    server = notion([make_page(number, 0, is_of_user=False) for number in range(3)])
+    start = time.time()
+    assert NotionTaskLoader(make_config(tmp_path)).load() == []
+    end = time.time()
+
+    server.pages.append(make_page(3, 0, edited=timestamp(time.time() + 60)))
+    server.requests.clear()
+    loader = NotionTaskLoader(make_config(tmp_path))
+    assert task_names(loader.load()) == ["Task 3"]
+    assert not loader.query_failed
+    (_, _, payload), = [request for request in server.requests if request[0] == "POST"]
+    assert notion_timestamp(start) <= payload["filter"]["last_edited_time"]["on_or_after"] <= notion_timestamp(end)
+
+
+def wait_for(condition, timeout=5):
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, "timed out"
+        time.sleep(0.01)
+
+
+def sent_statuses(server):
+    return [(path, payload["properties"]["Status"]["status"]["name"])
+            for method, path, payload in server.requests if method == "PATCH"]
+
+
+def test_status_changes_are_sent_in_background_and_coalesced(notion, tmp_path):
+    server = notion([make_page(number, 0) for number in range(3)])
+    server.patch_gate.clear()
+    saver = NotionTaskSaver(make_config(tmp_path))
+
+    start = time.perf_counter()
+    saver.update_status("task-1", "In progress")
+    wait_for(lambda: server.counts.get("update") == 1)
+    for status_name in ["Urgent", "Not started", "Done"]:
+        saver.update_status("task-1", status_name)
+    saver.update_status("task-2", "Done")
+    assert time.perf_counter() - start < 0.5
+
+    server.patch_gate.set()
+    wait_for(lambda: not saver.outbox)
+    saver.stop()
+    assert sent_statuses(server) == [("/v1/pages/task-1", "In progress"), ("/v1/pages/task-1", "Done"),
+                                     ("/v1/pages/task-2", "Done")]
+    assert saver.store.outbox("notion") == {}
+
+
+def test_failed_status_changes_are_retried_and_kept_on_disk(notion, tmp_path, monkeypatch):
+    server = notion([make_page(number, 0) for number in range(3)])
+    server.failing_patches = 2
+    saver = NotionTaskSaver(make_config(tmp_path))
+    saver.retry_delay = 0.05
+    saver.update_status("task-1", "Done")
+    wait_for(lambda: not saver.outbox)
+    saver.stop()
+    assert sent_statuses(server) == [("/v1/pages/task-1", "Done")] * 3
+
+    # Changes made offline are delivered on the next launch:
+    monkeypatch.setenv("NOTION_API_URL", "http://127.0.0.1:9/v1")
+    saver = NotionTaskSaver(make_config(tmp_path))
+    saver.update_status("task-2", "Urgent")
+    wait_for(lambda: saver.outbox["task-2"]["attempts"] > 0)
+    saver.stop()
+    assert "task-2" in saver.store.outbox("notion")
+
+    monkeypatch.setenv("NOTION_API_URL", server.url)
+    saver = NotionTaskSaver(make_config(tmp_path))
+    wait_for(lambda: not saver.outbox)
+    saver.stop()
+    assert sent_statuses(server)[-1] == ("/v1/pages/task-2", "Urgent")
+
+
+def test_rate_limiter_spaces_requests_and_lets_writes_go_first():
+    limiter = RateLimiter(20, burst=1)
+    start = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    assert 0.45 < time.monotonic() - start < 0.8
+
+    order = []
+    def request(name, priority):
+        limiter.acquire(priority)
+        order.append(name)
+
+    limiter.pause(0.2)
+    readers = [threading.Thread(target=request, args=(f"read {number}", RateLimiter.READ)) for number in range(3)]
+    for thread in readers:
+        thread.start()
+    time.sleep(0.05)
+    writer = threading.Thread(target=request, args=("write", RateLimiter.WRITE))
+    writer.start()
+    for thread in readers + [writer]:
+        thread.join()
+    assert order[0] == "write"
+    assert "writes: 1 waited" in limiter.summary() and "reads: 14 waited" in limiter.summary()
+
+
+def test_rate_limiter_follows_the_rate_asked_for_last():
+    limiter = get_rate_limiter("notion", 3)
+    assert get_rate_limiter("notion", 3) is limiter and limiter.rate == 3
+    assert get_rate_limiter("notion", 1000) is limiter and limiter.rate == 1000
+    start = time.monotonic()
+    for _ in range(10):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.5
+
+    http_client.reset()
+    assert get_rate_limiter("notion", 3) is not limiter
+
+
+def test_rate_limiter_below_one_request_per_second_lets_requests_through():
+    limiter = RateLimiter(0.5)
+    assert limiter.capacity == 1
+    limiter.acquire()
+    limiter.set_rate(0.2)
+    assert limiter.capacity == 1
+    assert get_rate_limiter("notion", 0).rate == 1
+    assert get_rate_limiter("mstodo", -2).rate == 1
+
+
+def test_throttled_queries_wait_for_retry_after(notion, tmp_path):
+    server = notion([make_page(number, 0) for number in range(10)])
+    server.throttled_queries = 1
+    loader = NotionTaskLoader(make_config(tmp_path))
+    loader.limiter = RateLimiter(1000)
+
+    start = time.monotonic()
+    assert len(task_names(loader.load())) == 10
+    assert time.monotonic() - start >= 0.3
+    assert len([request for request in server.requests if request[0] == "POST"]) == 2
+
+
+class CountingConnector(LiveLoader):
+    """Connector that returns one task named after the number of its runs"""
+    def __init__(self, name, refresh_interval, delay=0):
+        self.name = name
+        self.refresh_interval = refresh_interval
+        self.delay = delay
+        self.runs = 0
+
+    def load(self):
+        time.sleep(self.delay)
+        self.runs += 1
+        return [Task(0, f"{self.name} {self.runs}", Status.NORMAL, Timer([]), False, source=self.name)]
+
+
+def test_connectors_run_on_their_own_schedule(tmp_path):
+    fast = CountingConnector("fast", 0.1)
+    slow = CountingConnector("slow", 0, delay=1)
+    scheduler = LiveScheduler([fast, slow])
+    scheduler.start()
+    received = []
+    wait_for(lambda: received.extend(scheduler.receive()) or fast.runs >= 3)
+    assert slow.runs == 0 and scheduler.is_loading
+    assert [tasks[0].name for name, tasks in received if name == "fast" and isinstance(tasks, list)][:3] == \
+        ["fast 1", "fast 2", "fast 3"]
+
+    # The slow connector refreshes only on demand:
+    wait_for(lambda: received.extend(scheduler.receive()) or slow.runs == 1)
+    scheduler.reload()
+    wait_for(lambda: received.extend(scheduler.receive()) or slow.runs == 2)
+    scheduler.stop()
+    assert [tasks for name, tasks in received if name == "slow"][:3] == [REPLACE_TASKS, mock.ANY, None]
+
+    config = make_config(tmp_path)
+    config.LIVE_CONNECTORS = ["unknown"]
+    assert create_live_connectors(config) == []
+
+
+def test_sync_state_is_kept_in_one_store_and_pruned(notion, tmp_path):
+    (tmp_path / "deleted_notion_tasks.txt").write_text("task-3\ntask-gone\n")
+    server = notion([make_page(number, number // 5) for number in range(10)])
+    loader = NotionTaskLoader(make_config(tmp_path, full_sync_hours=0))
+    loader.load()
+    store = loader.store
+    assert not (tmp_path / "deleted_notion_tasks.txt").exists()
+
+    # Pages that are no longer tasks of the user are forgotten with their projects:
+    assert store.deleted_ids("notion") == {"task-3"}
+    del server.pages[5:]
+    store.add_deleted_ids("notion", ["task-7"])
+    loader.load()
+    assert store.deleted_ids("notion") == {"task-3"}
+    assert sorted(store.records("notion")) == [f"task-{number}" for number in range(5)]
+    assert list(store.cached("notion_projects", 3600)) == ["project-0"]
+
+    # A sync without changes does not rewrite records:
+    changes_before = store.connection.total_changes
+    loader.load()
+    assert store.connection.total_changes - changes_before < 5
+
+
+def test_tasks_load_from_the_mock_server_despite_throttling(tmp_path, monkeypatch):
+    server = MockNotion(number_of_tasks=450, throttle_every=5).start()
+    for name, value in server.environment().items():
+        monkeypatch.setenv(name, value)
+    try:
+        tasks = NotionTaskLoader(make_config(tmp_path)).load()
+    finally:
+        server.stop()
+    # Every third task is assigned to the user and every fourth one is done:
+    assert sum(not task.is_header for task in tasks) == len([n for n in range(450) if n % 3 == 0 and n % 4 != 3])
+    assert server.throttled > 0
@@ -0,0 +1,35 @@
+"""Tests of measuring render times for the overlay"""
+
+import time
+
+from cally.render_stats import RenderStats
+
+
+def test_percentiles_by_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert RenderStats.percentile(values, 0.5) == 0.051
+    assert RenderStats.percentile(values, 0.95) == 0.096
+    assert RenderStats.percentile(values, 1) == 0.1
+    assert RenderStats.percentile([0.2], 0.95) == 0.2
+
+
+def test_only_last_frames_are_kept():
+    stats = RenderStats(frames=10)
+    for index in range(25):
+        stats.add("MonthlyScreenView", index)
+        stats.count("month layout", index % 5 != 0)
+    assert list(stats.times["MonthlyScreenView"]) == list(range(15, 25))
+    assert sum(stats.caches["month layout"]) == 8
+    assert stats.lines()[-1].split()[-2:] == ["80%", "hits"]
+
+
+def test_latency_is_measured_until_the_frame_after_the_key():
+    stats = RenderStats()
+    stats.frame_done(time.perf_counter())
+    assert "input" not in stats.times
+    stats.key_pressed()
+    stats.frame_done(time.perf_counter())
+    stats.frame_done(time.perf_counter())
+    assert len(stats.times["input"]) == 1
+    assert len(stats.times["frame"]) == 3
+    assert "frame p50" in stats.summary()